@@ -0,0 +1,99 @@
+from collections import Counter
+
+import pandas as pd
+
+from keyword_matcher import get_matcher
+
+# Technologies charted in the insights panel
+INSIGHT_TECH_KEYWORDS = ['ERP', 'AI', 'Cloud', 'RPA', 'Analytics', 'DMS', 'Automation']
+
+
+def _field(name, default=None):
+    def keys(record):
+        value = record.get(name, default)
+        return () if value is None else (str(value),)
+    return keys
+
+
+def _technologies(record):
+    return get_matcher(INSIGHT_TECH_KEYWORDS).hits(str(record.get('Transformation Details') or ''))
+
+
+# dimension: record -> keys it counts under (each key at most once per record)
+COMPANY_DIMENSIONS = {
+    'Company Size': _field('Company Size'),
+    'Technology': _technologies,
+    'Confidence': _field('Confidence'),
+    'Industry': _field('Industry'),
+}
+JOB_DIMENSIONS = {
+    'Platform': _field('Platform'),
+    'Industry': _field('Industry', 'Various'),
+    'Role Type': _field('Role Type', 'General'),
+    'Company': _field('Company'),
+    'Technology': _field('Technology'),
+}
+
+
+class Aggregates:
+    """Per-dimension counts kept in step with a dataset as records come and go
+
+    Owners call add/remove (or replace) for each changed record, so reading
+    a count or a chart series never scans the dataset. Series are cached
+    until the next change bumps `version`.
+    """
+
+    def __init__(self, dimensions):
+        self.dimensions = dimensions
+        self.counts = {name: Counter() for name in dimensions}
+        self.total = 0
+        self.version = 0
+        self._series = {}
+
+    @classmethod
+    def from_records(cls, records, dimensions):
+        aggregates = cls(dimensions)
+        for record in records:
+            aggregates.add(record)
+        return aggregates
+
+    def _apply(self, record, sign):
+        for name, keys in self.dimensions.items():
+            counts = self.counts[name]
+            for key in set(keys(record)):
+                counts[key] += sign
+                if not counts[key]:
+                    del counts[key]
+        self.total += sign
+        self.version += 1
+        self._series = {}
+
+    def add(self, record):
+        self._apply(record, 1)
+
+    def remove(self, record):
+        self._apply(record, -1)
+
+    def replace(self, old, new):
+        self.remove(old)
+        self.add(new)
+
+    def clear(self):
+        self.__init__(self.dimensions)
+
+    def count(self, name, key):
+        return self.counts[name].get(key, 0)
+
+    def distinct(self, name):
+        """Number of different keys seen in a dimension"""
+        return len(self.counts[name])
+
+    def count_matching(self, name, matcher):
+        """Records whose key in `name` mentions one of the matcher's terms"""
+        return sum(count for key, count in self.counts[name].items() if matcher.contains(key))
+
+    def series(self, name):
+        """Counts of one dimension as a Series, largest first (cached per version)"""
+        if name not in self._series:
+            self._series[name] = pd.Series(dict(self.counts[name].most_common()), dtype='int64', name=name)
+        return self._series[name]
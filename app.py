@@ -1,15 +1,23 @@
 import streamlit as st
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
-import re
-import json
-from datetime import datetime, timedelta
-import time
-from groq import Groq
-import io
-import urllib.parse
-import random
+from datetime import datetime
+import uuid
+
+from aggregates import JOB_DIMENSIONS, Aggregates
+from background_jobs import FAILED, get_job_runner
+from company_store import CompanyStore
+from exports import COMPANY_EXPORT_COLUMNS, EXPORT_FORMATS, JOB_EXPORT_COLUMNS, available_formats, export_file
+from keyword_matcher import get_matcher
+from model_cascade import HEURISTIC_TIER, TRIAGE_MODEL, CascadePolicy
+from progress import StreamlitProgressReporter
+from scoring import COMPONENT_COLUMNS, DEFAULT_WEIGHTS, GROWING_SIZE_TERMS, SMALL_SIZE_TERMS
+from scout import SMEDigitalTransformationScout, SMEJobPlatformScout
+
+# Columns the results grid can be sorted by
+GRID_SORT_COLUMNS = ['Relevance Score', 'Company Name', 'Industry', 'Company Size', 'Confidence']
+
+# Rows shown in the copy-ready TSV blocks; downloads always contain everything
+EXPORT_PREVIEW_ROWS = 100
 
 # Page configuration
 st.set_page_config(
@@ -18,1013 +26,166 @@ st.set_page_config(
     layout="wide"
 )
 
-class SMEDigitalTransformationScout:
-    def __init__(self):
-        self.groq_client = Groq(api_key=st.secrets.get("GROQ_API_KEY"))
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
-        
-        # Target industries for SMEs
-        self.INDUSTRIES = [
-            "Manufacturing", "BFSI", "Healthcare", "Hospitals", 
-            "Pharmaceutical", "Insurance", "Banking", "Financial Services",
-            "Logistics", "Retail", "Education", "Real Estate", "Construction"
-        ]
-        
-        # Digital transformation technologies for SMEs
-        self.DIGITAL_TECHNOLOGIES = [
-            "DMS", "Document Management System", "DCM", "Digital Contract Management",
-            "ERP", "Enterprise Resource Planning", "RPA", "Robotic Process Automation",
-            "Managed IT Services", "AI", "Artificial Intelligence", "Data Analytics",
-            "digital transformation", "cloud migration", "automation", "business intelligence",
-            "SAP Business One", "Zoho", "Tally", "QuickBooks", "Microsoft 365"
-        ]
-        
-        # SME indicators and revenue ranges
-        self.SME_INDICATORS = [
-            "SME", "small and medium", "startup", "MSME", "small business",
-            "growing company", "emerging company", "mid-sized", "family business",
-            "entrepreneur", "revenue under", "turnover under", "crore company"
-        ]
-        
-        # SME revenue ranges (in INR Crores)
-        self.SME_REVENUE_RANGES = [
-            "1-10 crore", "10-50 crore", "50-100 crore", "100-250 crore",
-            "Under 1 crore", "1-5 crore", "5-25 crore", "25-100 crore"
-        ]
-        
-        # Indian states to exclude (Kerala)
-        self.EXCLUDE_STATES = ["Kerala", "kerala"]
+@st.cache_resource(show_spinner=False)
+def get_sme_scout():
+    """The scout shared by every session in this process
 
-    def get_direct_article_link(self, article):
-        """Get direct article link instead of Google News redirect"""
-        try:
-            if article['source'] == 'Google News':
-                # Try to extract actual article URL from Google News
-                if 'news.google.com' in article['link']:
-                    # Follow the redirect to get actual article URL
-                    response = self.session.get(article['link'], timeout=10, allow_redirects=True)
-                    return response.url
-            return article['link']
-        except:
-            return article['link']
+    It holds the connection pools, the Groq client and the SQLite stores,
+    and keeps no per-session state, so reruns reuse warm connections.
+    """
+    return SMEDigitalTransformationScout(api_key=st.secrets.get("GROQ_API_KEY"))
 
-    def search_google_news_rss(self, query, max_results=20):
-        """Free Google News RSS search for SME digital transformation news"""
-        try:
-            base_url = "https://news.google.com/rss"
-            
-            # Enhanced query with SME focus
-            enhanced_query = f"{query} India -Kerala (SME OR startup OR 'small business') after:2024-01-01"
-            
-            search_url = f"{base_url}/search?q={enhanced_query.replace(' ', '%20')}&hl=en-IN&gl=IN&ceid=IN:en"
-            
-            response = self.session.get(search_url, timeout=15)
-            if response.status_code == 200:
-                import xml.etree.ElementTree as ET
-                root = ET.fromstring(response.content)
-                
-                articles = []
-                for item in root.findall('.//item')[:max_results]:
-                    title = item.find('title').text if item.find('title') is not None else ''
-                    link = item.find('link').text if item.find('link') is not None else ''
-                    pub_date = item.find('pubDate').text if item.find('pubDate') is not None else ''
-                    description = item.find('description').text if item.find('description') is not None else ''
-                    
-                    # Clean HTML tags from description
-                    description = re.sub(r'<[^>]+>', '', description)
-                    
-                    # Skip if mentions Kerala
-                    if any(state in (title + description).lower() for state in [s.lower() for s in self.EXCLUDE_STATES]):
-                        continue
-                    
-                    articles.append({
-                        'title': title,
-                        'link': link,
-                        'description': description,
-                        'source': 'Google News',
-                        'date': pub_date,
-                        'content': f"{title}. {description}"
-                    })
-                
-                return articles
-            return []
-        except Exception as e:
-            st.error(f"Google News error: {str(e)}")
-            return []
+@st.cache_resource(show_spinner=False)
+def get_job_scout():
+    return SMEJobPlatformScout()
 
-    def build_sme_search_queries(self, selected_industries, technologies):
-        """Build targeted queries for SME digital transformation"""
-        base_queries = []
-        
-        # SME-specific digital transformation queries
-        sme_terms = ["SME", "small business", "startup", "MSME", "growing company", "mid-sized"]
-        
-        for industry in selected_industries:
-            for sme_term in sme_terms[:3]:  # Use top 3 SME terms
-                industry_queries = [
-                    f"{industry} {sme_term} digital transformation India",
-                    f"{industry} {sme_term} ERP implementation India",
-                    f"{industry} {sme_term} cloud migration India",
-                    f"{industry} {sme_term} automation India",
-                    f"{sme_term} {industry} company technology upgrade India"
-                ]
-                base_queries.extend(industry_queries)
-        
-        # Technology-specific queries for SMEs
-        for tech in technologies[:5]:
-            for sme_term in sme_terms[:2]:
-                tech_queries = [
-                    f"{sme_term} {tech} implementation India",
-                    f"{sme_term} {tech} adoption India",
-                    f"{tech} for small business India"
-                ]
-                base_queries.extend(tech_queries)
-        
-        # Funding and growth news (indicators of digital transformation)
-        funding_terms = ["funding", "investment", "series A", "series B", "growth funding"]
-        for industry in selected_industries[:2]:
-            for term in funding_terms:
-                base_queries.append(f"{industry} {term} India digital transformation")
-        
-        return list(set(base_queries))[:20]  # Limit to 20 unique queries
+def run_search_job(sme_scout, search_queries, max_per_source, reporter, new_only=False):
+    """Background job: hybrid search; it reports this run's cache statistics"""
+    return sme_scout.hybrid_search(search_queries, max_per_source, new_only=new_only, reporter=reporter)
 
-    def hybrid_search(self, search_terms, max_results_per_source=15):
-        """Hybrid search across multiple free sources with direct links"""
-        all_articles = []
-        
-        for term in search_terms:
-            st.info(f"Searching: {term}")
-            
-            # Google News search
-            google_articles = self.search_google_news_rss(term, max_results_per_source)
-            
-            # Enhance Google News articles with direct links
-            for article in google_articles:
-                article['direct_link'] = self.get_direct_article_link(article)
-            
-            all_articles.extend(google_articles)
-            time.sleep(1)
-            
-            # DuckDuckGo search with enhanced link handling
-            try:
-                base_url = "https://html.duckduckgo.com/html/"
-                params = {'q': term + " site:.in OR site:.com", 'kl': 'in-en'}
-                
-                response = self.session.post(base_url, data=params, timeout=15)
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    results = soup.find_all('div', class_='result')
-                    
-                    for result in results[:max_results_per_source]:
-                        try:
-                            title_elem = result.find('a', class_='result__a')
-                            snippet_elem = result.find('a', class_='result__snippet')
-                            
-                            if title_elem:
-                                title = title_elem.text.strip()
-                                link = title_elem.get('href')
-                                snippet = snippet_elem.text.strip() if snippet_elem else ""
-                                
-                                # Skip if mentions Kerala
-                                if any(state in (title + snippet).lower() for state in [s.lower() for s in self.EXCLUDE_STATES]):
-                                    continue
-                                
-                                # Extract actual URL from DuckDuckGo redirect
-                                direct_link = link
-                                if link and 'uddg=' in link:
-                                    match = re.search(r'uddg=([^&]+)', link)
-                                    if match:
-                                        direct_link = urllib.parse.unquote(match.group(1))
-                                
-                                # Validate it's a proper URL
-                                if direct_link and any(domain in direct_link for domain in ['.com', '.in', '.org', '.net', '.co', '.io']):
-                                    all_articles.append({
-                                        'title': title,
-                                        'link': link,  # Original link
-                                        'direct_link': direct_link,  # Direct article link
-                                        'description': snippet,
-                                        'source': 'DuckDuckGo',
-                                        'date': '2024+',
-                                        'content': f"{title}. {snippet}"
-                                    })
-                        except Exception:
-                            continue
-            except Exception as e:
-                st.warning(f"DuckDuckGo search error: {str(e)}")
-            
-            time.sleep(1)
-        
-        # Remove duplicates based on content and title
-        seen_articles = set()
-        unique_articles = []
-        for article in all_articles:
-            # Use direct link for deduplication when available
-            article_key = f"{article['title'][:100]}_{article.get('direct_link', article['link'])}"
-            if article_key not in seen_articles:
-                seen_articles.add(article_key)
-                unique_articles.append(article)
-        
-        return unique_articles
-
-    def analyze_company_size(self, company_data):
-        """Analyze and determine company size based on available data"""
-        revenue = company_data.get('Revenue', '').lower()
-        company_name = company_data.get('Company Name', '').lower()
-        content = company_data.get('Transformation Details', '').lower()
-        
-        # SME indicators
-        sme_score = 0
-        revenue_range = "Not specified"
-        
-        # Check for SME indicators in content
-        for indicator in self.SME_INDICATORS:
-            if indicator in content or indicator in company_name:
-                sme_score += 1
-        
-        # Analyze revenue mentions
-        revenue_patterns = {
-            "1-10 crore": r'(\d+\s*-\s*\d+\s*crore|₹?\s*\d+\s*crore)',
-            "10-50 crore": r'(\d+\s*-\s*\d+\s*crore|₹?\s*\d+\s*crore)',
-            "Under 1 crore": r'under\s*\d+\s*crore|less than\s*\d+\s*crore',
-        }
-        
-        for range_name, pattern in revenue_patterns.items():
-            if re.search(pattern, revenue, re.IGNORECASE):
-                revenue_range = range_name
-                sme_score += 2
-                break
-        
-        # Determine company size category
-        if sme_score >= 3:
-            company_size = "SME (Small to Medium Enterprise)"
-        elif sme_score >= 1:
-            company_size = "Likely SME"
+def run_extraction_job(sme_scout, articles, reporter, **options):
+    """Background job: extract, score and rank companies from articles"""
+    companies_data = sme_scout.extract_company_data_with_groq(articles, reporter=reporter, **options)
+    
+    # Records are scored as they are extracted; this merges and ranks them
+    ranked_companies = sme_scout.filter_and_rank_sme_companies(companies_data)
+    sme_scout.database.save_companies(ranked_companies, score=sme_scout.score_companies)
+    return ranked_companies
+
+def apply_score_weights(sme_scout, company_store, weights):
+    """Re-rank stored companies with the sidebar relevance weights"""
+    company_store.rescore(lambda frame: sme_scout.scoring.combine(frame, weights))
+
+def run_streaming_job(sme_scout, search_queries, max_per_source, reporter, **options):
+    """Background job: streaming search-to-ranking pipeline"""
+    articles, ranked_companies = sme_scout.stream_companies(search_queries, max_per_source, reporter=reporter, **options)
+    sme_scout.database.save_companies(ranked_companies, score=sme_scout.score_companies)
+    return {'articles': articles, 'companies': ranked_companies}
+
+@st.fragment(run_every=1.0)
+def render_job_progress(job_id, show_partial_results=False):
+    """Poll a background job and show its progress without rerunning the whole page"""
+    job = get_job_runner().get(job_id)
+    if job is None:
+        return
+    if job.done:
+        # Rerun the full script once so the finished result is picked up
+        st.rerun()
+    
+    snapshot = job.snapshot()
+    st.progress(snapshot['fraction'], text=snapshot['message'] or f"{snapshot['label']}...")
+    st.caption(f"{snapshot['label']} - running for {snapshot['elapsed']:.0f}s")
+    
+    events, _ = job.events_since(0)
+    for _, level, message in events[-5:]:
+        if level in ("warning", "error"):
+            st.warning(message)
         else:
-            company_size = "Size Unknown"
-        
-        return company_size, revenue_range, sme_score
-
-    def extract_company_data_with_groq(self, articles, batch_size=25, delay_between_batches=2):
-        """Use Groq to extract SME digital transformation company data with proper source links"""
-        if not articles:
-            return []
-            
-        extracted_data = []
-        total_batches = (len(articles) + batch_size - 1) // batch_size
-        
-        st.info(f"Processing {len(articles)} articles in {total_batches} batches of {batch_size}")
-        
-        for batch_num in range(total_batches):
-            start_idx = batch_num * batch_size
-            end_idx = min((batch_num + 1) * batch_size, len(articles))
-            batch_articles = articles[start_idx:end_idx]
-            
-            st.write(f"Processing batch {batch_num + 1}/{total_batches} (articles {start_idx + 1}-{end_idx})")
-            
-            batch_data = self._process_batch_with_proper_links(batch_articles, batch_num + 1, total_batches)
-            extracted_data.extend(batch_data)
-            
-            if batch_num < total_batches - 1:
-                st.info(f"Waiting {delay_between_batches} seconds before next batch...")
-                time.sleep(delay_between_batches)
-        
-        return extracted_data
-
-    def _process_batch_with_proper_links(self, batch_articles, batch_num, total_batches):
-        """Process batch with proper source link handling"""
-        batch_data = []
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        # Enhanced system prompt with source link requirement
-        system_prompt = f"""You are an expert Indian business analyst specializing in SME digital transformation. Extract company information from news articles.
-
-IMPORTANT: For each company found, include the EXACT source link from the article.
-
-Return EXACT JSON format:
-{{
-    "companies": [
-        {{
-            "company_name": "extracted company name",
-            "website": "company website if mentioned, else empty",
-            "industry": "Manufacturing/BFSI/Healthcare/Hospitals/Logistics/Retail",
-            "revenue": "revenue information if mentioned, else 'Not specified'",
-            "revenue_range": "1-10 crore/10-50 crore/50-100 crore/100-250 crore/Not specified",
-            "employee_count": "employee count if mentioned, else 'Not specified'",
-            "digital_transformation": "Yes/No",
-            "transformation_details": "specific technologies and projects mentioned",
-            "company_size_indication": "SME/Startup/Growing Business/Large Enterprise/Unknown",
-            "growth_stage": "Early-stage/ Growth-stage/ Mature SME/ Unknown",
-            "confidence_score": "high/medium/low",
-            "source_attribution": "Brief mention of how company was referenced in article"
-        }}
-    ]
-}}"""
-        
-        processed_count = 0
-        for i, article in enumerate(batch_articles):
-            try:
-                status_text.text(f"Batch {batch_num}/{total_batches} - Analyzing article {i+1}/{len(batch_articles)}...")
-                progress_bar.progress((i + 1) / len(batch_articles))
-                
-                content = article['content']
-                if len(content) > 3000:
-                    content = content[:3000]
-                
-                # Use direct link when available
-                source_link = article.get('direct_link', article['link'])
-                
-                user_prompt = f"""
-                Analyze this Indian business/technology news article for SME companies:
-
-                TITLE: {article['title']}
-                CONTENT: {content}
-                SOURCE: {source_link}
-
-                Extract ALL SME companies mentioned. Include the exact source link for verification.
-                """
-                
-                # Use chat completion
-                max_retries = 2
-                for attempt in range(max_retries):
-                    try:
-                        chat_completion = self.groq_client.chat.completions.create(
-                            messages=[
-                                {"role": "system", "content": system_prompt},
-                                {"role": "user", "content": user_prompt}
-                            ],
-                            model="llama-3.3-70b-versatile",
-                            temperature=0.1,
-                            max_tokens=2500,
-                            response_format={"type": "json_object"}
-                        )
-                        
-                        response_text = chat_completion.choices[0].message.content
-                        break
-                        
-                    except Exception as e:
-                        if attempt == max_retries - 1:
-                            raise e
-                        time.sleep(1)
-                
-                # Parse response
-                try:
-                    data = json.loads(response_text.strip())
-                    companies = data.get('companies', [])
-                    
-                    for company in companies:
-                        if (company.get('company_name') and 
-                            company.get('company_name') != 'null'):
-                            
-                            company_size, revenue_range, sme_score = self.analyze_company_size(company)
-                            source_link = article.get('direct_link', article['link'])
-                            
-                            batch_data.append({
-                                'Company Name': company['company_name'],
-                                'Website': company.get('website', 'Not specified'),
-                                'Industry': company.get('industry', 'Not specified'),
-                                'Revenue': company.get('revenue', 'Not specified'),
-                                'Revenue Range': company.get('revenue_range', 'Not specified'),
-                                'Employee Count': company.get('employee_count', 'Not specified'),
-                                'Digital Transformation': company.get('digital_transformation', 'No'),
-                                'Transformation Details': company.get('transformation_details', 'Digital initiatives mentioned'),
-                                'Company Size': company_size,
-                                'Growth Stage': company.get('growth_stage', 'Unknown'),
-                                'SME Score': sme_score,
-                                'Source Link': source_link,
-                                'Article Title': article['title'],
-                                'Source': article['source'],
-                                'Date': article.get('date', '2024+'),
-                                'Confidence': company.get('confidence_score', 'medium'),
-                                'Source Attribution': company.get('source_attribution', 'Mentioned in article')
-                            })
-                            processed_count += 1
-                            
-                except json.JSONDecodeError as e:
-                    st.warning(f"Failed to parse JSON from article {i+1}: {str(e)}")
-                    continue
-                    
-            except Exception as e:
-                st.warning(f"Error processing article {i+1}: {str(e)}")
-                continue
-        
-        progress_bar.empty()
-        status_text.empty()
-        
-        if processed_count > 0:
-            st.success(f"Batch {batch_num}: Processed {processed_count} companies with proper source links")
+            st.write(message)
+    
+    if show_partial_results and job.partial_results:
+        with job.lock:
+            partial = list(job.partial_results)
+        st.metric("Companies Found So Far", len(partial))
+        partial_columns = ['Company Name', 'Industry', 'Company Size', 'Confidence']
+        if 'Relevance Score' in partial[0]:
+            # Scored results (streaming mode) show the best so far instead of the latest
+            partial = sorted(partial, key=lambda company: company['Relevance Score'], reverse=True)[:10]
+            partial_columns.append('Relevance Score')
+        st.dataframe(
+            pd.DataFrame(partial[-10:])[partial_columns],
+            use_container_width=True,
+            hide_index=True
+        )
+
+def poll_background_job(state_key, show_partial_results=False):
+    """Show progress for the job whose ID is in st.session_state[state_key]; returns it once finished"""
+    job_runner = get_job_runner()
+    job = job_runner.get(st.session_state.get(state_key))
+    if job is None:
+        st.session_state[state_key] = None
+        return None
+    if not job.done:
+        render_job_progress(job.job_id, show_partial_results)
+        return None
+    
+    st.session_state[state_key] = None
+    job_runner.forget(job.job_id)
+    return job
+
+def show_job_messages(job):
+    """Render the warnings and summary a finished job reported"""
+    events, _ = job.events_since(0)
+    warnings = [message for _, level, message in events if level in ("warning", "error")]
+    if warnings:
+        with st.expander(f"{len(warnings)} warnings"):
+            for message in warnings:
+                st.warning(message)
+    metrics = job.snapshot()['metrics']
+    if metrics and job.kind in ("extract", "stream"):
+        columns = st.columns(len(metrics))
+        for column, (label, value) in zip(columns, metrics.items()):
+            with column:
+                st.metric(label, value)
+
+def display_sme_insights(aggregates):
+    """Display insights about SME digital transformation trends
+
+    `aggregates` holds the precomputed counts (see CompanyStore.aggregates),
+    so the panels cost the same however many companies there are.
+    """
+    if not aggregates.total:
+        return
+    
+    st.header("SME Digital Transformation Insights")
+    
+    # Create columns for different insights
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.subheader("Company Size Distribution")
+        size_counts = aggregates.series('Company Size')
+        if not size_counts.empty:
+            st.bar_chart(size_counts)
         else:
-            st.warning(f"Batch {batch_num}: No companies found in this batch")
-        
-        return batch_data
-
-    def calculate_sme_relevance_score(self, company):
-        """Calculate relevance score specifically for SME digital transformation"""
-        score = 0
-        
-        # Confidence scoring
-        if company['Confidence'] == 'high':
-            score += 3
-        elif company['Confidence'] == 'medium':
-            score += 2
+            st.info("No size data available")
+    
+    with col2:
+        st.subheader("Technology Adoption")
+        tech_counts = aggregates.series('Technology')
+        if not tech_counts.empty:
+            st.bar_chart(tech_counts.rename_axis('Technology').rename('Count'))
         else:
-            score += 1
-        
-        # SME scoring
-        sme_size = company['Company Size'].lower()
-        if 'sme' in sme_size or 'small' in sme_size or 'startup' in sme_size:
-            score += 3
-        elif 'growing' in sme_size:
-            score += 2
-        
-        # SME score from analysis
-        score += min(company.get('SME Score', 0), 3)
-        
-        # Technology depth
-        tech_keywords = ['ERP', 'AI', 'DMS', 'RPA', 'analytics', 'cloud', 'automation']
-        details = company['Transformation Details'].lower()
-        tech_count = sum(1 for tech in tech_keywords if tech.lower() in details)
-        score += min(tech_count, 3)
-        
-        # Revenue range scoring (prefer smaller SMEs)
-        revenue_range = company.get('Revenue Range', '').lower()
-        if '1-10' in revenue_range or 'under' in revenue_range:
-            score += 2
-        elif '10-50' in revenue_range:
-            score += 1
-        
-        return min(score, 10)  # Cap at 10
-
-    def filter_and_rank_sme_companies(self, companies):
-        """Filter and rank companies by SME relevance"""
-        if not companies:
-            return []
-        
-        # Add relevance scores if not present
-        for company in companies:
-            if 'Relevance Score' not in company:
-                company['Relevance Score'] = self.calculate_sme_relevance_score(company)
-        
-        # Sort by relevance score
-        companies.sort(key=lambda x: x['Relevance Score'], reverse=True)
-        
-        # Remove duplicates based on company name
-        seen_companies = set()
-        unique_companies = []
-        for company in companies:
-            company_key = company['Company Name'].lower().strip()
-            if company_key not in seen_companies:
-                seen_companies.add(company_key)
-                unique_companies.append(company)
-        
-        return unique_companies
-
-    def generate_enhanced_output(self, companies):
-        """Generate enhanced output with all SME fields and proper source links"""
-        if not companies:
-            return "No SME digital transformation companies found"
-        
-        output_lines = ["Company Name\tWebsite\tIndustry\tRevenue\tRevenue Range\tEmployee Count\tDigital Transformation\tTransformation Details\tCompany Size\tGrowth Stage\tConfidence\tRelevance Score\tSource Link\tArticle Title\tSource\tSource Attribution"]
-        
-        for company in companies:
-            company_name = str(company['Company Name']).replace('\t', ' ').replace('\n', ' ')
-            website = str(company['Website']).replace('\t', ' ')
-            industry = str(company['Industry']).replace('\t', ' ')
-            revenue = str(company['Revenue']).replace('\t', ' ')
-            revenue_range = str(company['Revenue Range']).replace('\t', ' ')
-            employee_count = str(company['Employee Count']).replace('\t', ' ')
-            digital_transformation = str(company['Digital Transformation']).replace('\t', ' ')
-            transformation_details = str(company['Transformation Details']).replace('\t', ' ').replace('\n', ' ')
-            company_size = str(company['Company Size']).replace('\t', ' ')
-            growth_stage = str(company['Growth Stage']).replace('\t', ' ')
-            confidence = str(company['Confidence']).replace('\t', ' ')
-            relevance_score = str(company['Relevance Score'])
-            source_link = str(company['Source Link']).replace('\t', ' ')
-            article_title = str(company['Article Title']).replace('\t', ' ').replace('\n', ' ')
-            source = str(company['Source']).replace('\t', ' ')
-            source_attribution = str(company.get('Source Attribution', 'Direct Mention')).replace('\t', ' ')
-            
-            output_line = f"{company_name}\t{website}\t{industry}\t{revenue}\t{revenue_range}\t{employee_count}\t{digital_transformation}\t{transformation_details}\t{company_size}\t{growth_stage}\t{confidence}\t{relevance_score}\t{source_link}\t{article_title}\t{source}\t{source_attribution}"
-            output_lines.append(output_line)
-        
-        return "\n".join(output_lines)
-
-    def display_sme_insights(self, companies):
-        """Display insights about SME digital transformation trends"""
-        if not companies:
-            return
-        
-        st.header("SME Digital Transformation Insights")
-        
-        # Create columns for different insights
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.subheader("Company Size Distribution")
-            sizes = [company['Company Size'] for company in companies]
-            size_df = pd.DataFrame({'Company Size': sizes})
-            size_counts = size_df['Company Size'].value_counts()
-            if not size_counts.empty:
-                st.bar_chart(size_counts)
-            else:
-                st.info("No size data available")
-        
-        with col2:
-            st.subheader("Technology Adoption")
-            tech_keywords = ['ERP', 'AI', 'Cloud', 'RPA', 'Analytics', 'DMS', 'Automation']
-            tech_counts = {}
-            for company in companies:
-                details = company['Transformation Details'].lower()
-                for tech in tech_keywords:
-                    if tech.lower() in details:
-                        tech_counts[tech] = tech_counts.get(tech, 0) + 1
-            
-            if tech_counts:
-                tech_df = pd.DataFrame(list(tech_counts.items()), columns=['Technology', 'Count'])
-                st.bar_chart(tech_df.set_index('Technology'))
-            else:
-                st.info("No technology data available")
-        
-        with col3:
-            st.subheader("Confidence Level")
-            confidence_counts = pd.Series([company['Confidence'] for company in companies]).value_counts()
-            if not confidence_counts.empty:
-                st.bar_chart(confidence_counts)
-            else:
-                st.info("No confidence data available")
-
-class SMEJobPlatformScout:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        })
-        
-        # Enhanced job platforms with actual search URLs
-        self.JOB_PLATFORMS = {
-            "LinkedIn": {
-                "base_url": "https://www.linkedin.com/jobs/search/",
-                "search_pattern": "?keywords={query}&location={location}",
-                "job_pattern": "https://linkedin.com/jobs/view/{id}"
-            },
-            "Naukri": {
-                "base_url": "https://www.naukri.com/",
-                "search_pattern": "{query}-jobs-in-{location}",
-                "job_pattern": "https://naukri.com/job-listings-{id}"
-            },
-            "Indeed": {
-                "base_url": "https://www.indeed.co.in/",
-                "search_pattern": "jobs?q={query}&l={location}",
-                "job_pattern": "https://indeed.com/viewjob?jk={id}"
-            },
-            "Glassdoor": {
-                "base_url": "https://www.glassdoor.co.in/",
-                "search_pattern": "Job/jobs.htm?suggestCount=0&suggestChosen=false&clickSource=searchBtn&typedKeyword={query}&sc.keyword={query}&locT=C&locId=115&jobType=",
-                "job_pattern": "https://glassdoor.co.in/job-listing/jid-{id}"
-            }
-        }
-        
-        # Indian SME companies across different sectors
-        self.SME_COMPANIES = {
-            "Manufacturing": [
-                "Aequs", "Bharat Fritz Werner", "Hikal Ltd", "Minda Corporation", 
-                "Sona BLW Precision Forgings", "Sundaram Fasteners", "Tega Industries",
-                "Ami Polymers", "Bharat Electronics", "Carborundum Universal",
-                "Garware Technical Fibres", "Hindustan Composites", "JK Paper",
-                "Kirloskar Brothers", "Lakshmi Machine Works", "NRB Bearings",
-                "Orient Bell", "Pitti Engineering", "Rane Group", "Swaraj Engines"
-            ],
-            "BFSI": [
-                "Aavas Financiers", "Bajaj Finance", "Cholamandalam Investment", 
-                "Edelweiss Financial Services", "Five-Star Business Finance",
-                "ICICI Securities", "JM Financial", "Motilal Oswal Financial Services",
-                "Shriram Transport Finance", "Sundaram Finance", "UTI Asset Management",
-                "Angel One", "IIFL Finance", "Muthoot Finance", "Paisalo Digital",
-                "SBI Cards", "Srei Equipment Finance", "Tata Asset Management"
-            ],
-            "Healthcare": [
-                "Alembic Pharmaceuticals", "Alkem Laboratories", "Aurobindo Pharma",
-                "Biocon", "Dr. Reddy's Laboratories", "Glenmark Pharmaceuticals",
-                "Lupin", "Torrent Pharmaceuticals", "Cadila Healthcare", "Divis Laboratories",
-                "Ipca Laboratories", "Jubilant Pharmova", "Natco Pharma", "Piramal Enterprises",
-                "Strides Pharma", "Sun Pharmaceutical", "Wockhardt"
-            ],
-            "IT Services": [
-                "3i Infotech", "Cyient", "Hexaware Technologies", "Infosys BPM",
-                "Mastek", "Mindtree", "Mphasis", "Persistent Systems", "Rolta India",
-                "Sonata Software", "Sasken Technologies", "Tata Elxsi", "Tech Mahindra",
-                "Wipro", "Zensar Technologies", "LTIMindtree", "HCL Technologies",
-                "TCS", "L&T Technology Services", "KPIT Technologies"
-            ],
-            "Logistics": [
-                "Allcargo Logistics", "Blue Dart Express", "Container Corporation of India",
-                "Delhivery", "Gati", "Mahindra Logistics", "Snowman Logistics",
-                "TCI Express", "VRL Logistics", "Express Logistics"
-            ],
-            "Retail": [
-                "Aditya Birla Fashion", "Avenue Supermarts", "Future Retail",
-                "Shoppers Stop", "Titan Company", "V-Mart Retail", "Reliance Retail",
-                "Arvind Fashions", "Bata India", "Metro Brands"
-            ]
-        }
-        
-        # Job roles specific to digital transformation in SMEs
-        self.SME_DIGITAL_TRANSFORMATION_ROLES = [
-            "ERP Implementation Specialist", "Digital Transformation Consultant", 
-            "IT Project Manager", "Business Systems Analyst", "Data Analytics Manager",
-            "Cloud Solutions Architect", "RPA Developer", "AI/ML Engineer", 
-            "Digital Platform Manager", "Technology Innovation Lead",
-            "DMS Specialist", "Document Management Analyst", "Process Automation Engineer",
-            "Business Intelligence Analyst", "IT Infrastructure Manager",
-            "Software Development Manager", "Digital Marketing Manager",
-            "E-commerce Manager", "CRM Implementation Specialist", "IT Security Analyst"
-        ]
-        
-        # SME-specific job titles by technology
-        self.SME_TECHNOLOGY_ROLES = {
-            "ERP": ["ERP Consultant", "SAP Business One Specialist", "Oracle NetSuite Analyst", 
-                   "ERP Implementation Manager", "Business Process Analyst"],
-            "AI": ["AI Solutions Engineer", "Machine Learning Specialist", "AI Business Analyst", 
-                  "Data Scientist", "AI Implementation Consultant"],
-            "RPA": ["RPA Developer", "Automation Analyst", "RPA Solution Architect", 
-                   "Process Automation Specialist", "UiPath Developer"],
-            "DMS": ["Document Management Specialist", "Content Management Analyst", 
-                   "DMS Administrator", "Records Management Officer", "Digital Archivist"],
-            "Data Analytics": ["Data Analyst", "Business Intelligence Analyst", 
-                             "Analytics Consultant", "Data Engineer", "Reporting Analyst"],
-            "Cloud": ["Cloud Architect", "Cloud Engineer", "DevOps Engineer", 
-                     "Cloud Security Specialist", "Azure/AWS Consultant"],
-            "Managed IT Services": ["IT Support Manager", "Network Administrator", 
-                                  "Systems Engineer", "IT Service Desk Manager", "Infrastructure Specialist"]
-        }
-
-    def _generate_realistic_job_links(self, company_name, job_title, platform, location=""):
-        """Generate more realistic job links"""
-        platform_info = self.JOB_PLATFORMS.get(platform, {})
-        
-        if platform == "LinkedIn":
-            job_id = random.randint(1000000000, 9999999999)
-            return f"https://www.linkedin.com/jobs/view/{job_id}"
-        elif platform == "Naukri":
-            job_id = random.randint(100000000, 999999999)
-            return f"https://www.naukri.com/job-listings-{job_id}"
-        elif platform == "Indeed":
-            job_id = ''.join(random.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=16))
-            return f"https://in.indeed.com/viewjob?jk={job_id}"
-        elif platform == "Glassdoor":
-            job_id = random.randint(100000000, 999999999)
-            return f"https://www.glassdoor.co.in/Job/jobs.htm?jid={job_id}"
+            st.info("No technology data available")
+    
+    with col3:
+        st.subheader("Confidence Level")
+        confidence_counts = aggregates.series('Confidence')
+        if not confidence_counts.empty:
+            st.bar_chart(confidence_counts)
         else:
-            # Fallback for other platforms
-            company_slug = re.sub(r'[^a-zA-Z0-9]', '-', company_name.lower())
-            job_slug = re.sub(r'[^a-zA-Z0-9]', '-', job_title.lower())
-            return f"https://careers.{company_slug}.com/jobs/{job_slug}-{random.randint(10000, 99999)}"
-
-    def search_sme_jobs_by_company(self, company_names, max_results_per_company=10):
-        """Search job platforms for specific SME companies"""
-        all_job_listings = []
-        
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        for i, company_name in enumerate(company_names):
-            status_text.text(f"Searching SME jobs for: {company_name}")
-            progress_bar.progress((i + 1) / len(company_names))
-            
-            company_jobs = self._search_sme_company_jobs(company_name, max_results_per_company)
-            all_job_listings.extend(company_jobs)
-            
-            # Increased delay to avoid rate limiting
-            time.sleep(2)
-        
-        progress_bar.empty()
-        status_text.empty()
-        
-        return all_job_listings
-
-    def _search_sme_company_jobs(self, company_name, max_results):
-        """Search for jobs at specific SME companies"""
-        jobs_found = []
-        
-        # Method 1: Try direct platform searches
-        platform_searches = [
-            self._search_linkedin_sme_style(company_name),
-            self._search_naukri_sme_style(company_name),
-            self._search_indeed_sme_style(company_name)
-        ]
-        
-        for search_method in platform_searches:
-            try:
-                jobs = search_method
-                if jobs:
-                    jobs_found.extend(jobs[:max_results])
-                    break
-            except Exception as e:
-                continue
-        
-        # Method 2: Generate realistic SME job data
-        if not jobs_found:
-            jobs_found = self._generate_sme_job_data(company_name, max_results)
-        
-        return jobs_found
-
-    def _search_linkedin_sme_style(self, company_name):
-        """Enhanced LinkedIn job search with better links"""
-        jobs = []
-        try:
-            industry = self._identify_company_industry(company_name)
-            job_titles = self._get_sme_job_titles(industry)
-            
-            for title in job_titles[:3]:
-                job_link = self._generate_realistic_job_links(company_name, title, "LinkedIn")
-                
-                jobs.append({
-                    'Company': company_name,
-                    'Job Title': title,
-                    'Platform': 'LinkedIn',
-                    'Link': job_link,
-                    'Description': f"Join {company_name} as {title}. Great opportunity in growing SME with digital transformation focus.",
-                    'Role Type': 'Digital Transformation',
-                    'Company Size': 'SME',
-                    'Industry': industry,
-                    'Date Found': datetime.now().strftime('%Y-%m-%d'),
-                    'Source Verified': 'Platform Search'
-                })
-        except Exception:
-            pass
-        
-        return jobs
-
-    def _search_naukri_sme_style(self, company_name):
-        """Enhanced Naukri job search with better links"""
-        jobs = []
-        try:
-            industry = self._identify_company_industry(company_name)
-            job_titles = self._get_sme_job_titles(industry)
-            
-            for title in job_titles[:2]:
-                job_link = self._generate_realistic_job_links(company_name, title, "Naukri")
-                
-                jobs.append({
-                    'Company': company_name,
-                    'Job Title': f"{title} - {company_name}",
-                    'Platform': 'Naukri',
-                    'Link': job_link,
-                    'Description': f"Exciting career opportunity with SME {company_name}. Looking for {title} with digital skills.",
-                    'Role Type': 'Digital Transformation',
-                    'Company Size': 'SME',
-                    'Industry': industry,
-                    'Date Found': datetime.now().strftime('%Y-%m-%d'),
-                    'Source Verified': 'Platform Search'
-                })
-        except Exception:
-            pass
-        
-        return jobs
-
-    def _search_indeed_sme_style(self, company_name):
-        """Enhanced Indeed job search with better links"""
-        jobs = []
-        try:
-            industry = self._identify_company_industry(company_name)
-            job_titles = self._get_sme_job_titles(industry)
-            
-            for title in job_titles[:2]:
-                job_link = self._generate_realistic_job_links(company_name, title, "Indeed")
-                
-                jobs.append({
-                    'Company': company_name,
-                    'Job Title': title,
-                    'Platform': 'Indeed',
-                    'Link': job_link,
-                    'Description': f"SME {company_name} hiring {title}. Join our digital transformation journey.",
-                    'Role Type': 'Digital Transformation',
-                    'Company Size': 'SME',
-                    'Industry': industry,
-                    'Date Found': datetime.now().strftime('%Y-%m-%d'),
-                    'Source Verified': 'Platform Search'
-                })
-        except Exception:
-            pass
-        
-        return jobs
-
-    def _identify_company_industry(self, company_name):
-        """Identify which industry the company belongs to"""
-        for industry, companies in self.SME_COMPANIES.items():
-            if company_name in companies:
-                return industry
-        return "Various"
-
-    def _get_sme_job_titles(self, industry):
-        """Get relevant job titles for SME companies in specific industry"""
-        base_titles = self.SME_DIGITAL_TRANSFORMATION_ROLES.copy()
-        
-        # Add industry-specific titles
-        industry_specific = {
-            "Manufacturing": ["Production IT Manager", "Industrial Automation Specialist", 
-                            "Smart Factory Engineer", "Manufacturing Systems Analyst"],
-            "BFSI": ["FinTech Solutions Architect", "Digital Banking Specialist", 
-                    "Risk Analytics Manager", "Compliance Technology Officer"],
-            "Healthcare": ["HealthTech Implementation Specialist", "EMR Systems Analyst", 
-                         "Healthcare Data Privacy Officer", "Medical IT Manager"],
-            "IT Services": ["Technical Project Manager", "Software Development Lead", 
-                          "IT Consulting Manager", "Digital Solutions Architect"],
-            "Logistics": ["Logistics Automation Specialist", "Supply Chain Technology Manager", 
-                         "Fleet Management Systems Analyst", "Warehouse Automation Engineer"],
-            "Retail": ["E-commerce Technology Manager", "Retail Systems Analyst", 
-                      "Digital Store Solutions Architect", "Omnichannel Technology Specialist"]
-        }
-        
-        if industry in industry_specific:
-            base_titles.extend(industry_specific[industry])
-        
-        return base_titles
-
-    def _generate_sme_job_data(self, company_name, max_results):
-        """Generate realistic SME job data with proper links"""
-        jobs = []
-        
-        industry = self._identify_company_industry(company_name)
-        job_titles = self._get_sme_job_titles(industry)
-        
-        platforms = ["LinkedIn", "Naukri", "Indeed", "Glassdoor"]
-        
-        for i in range(min(max_results, 6)):
-            job_title = random.choice(job_titles)
-            platform = random.choice(platforms)
-            
-            # Generate proper job link
-            job_link = self._generate_realistic_job_links(company_name, job_title, platform)
-            
-            descriptions = [
-                f"Join growing SME {company_name} as {job_title}. Be part of our digital transformation journey in {industry} sector.",
-                f"{company_name}, a dynamic SME in {industry}, is hiring {job_title}. Opportunity to work on cutting-edge digital projects.",
-                f"SME {company_name} seeks {job_title} to drive technology initiatives. Perfect role for professionals passionate about digital innovation.",
-            ]
-            
-            jobs.append({
-                'Company': company_name,
-                'Job Title': job_title,
-                'Platform': platform,
-                'Link': job_link,
-                'Description': random.choice(descriptions),
-                'Role Type': 'Digital Transformation',
-                'Company Size': 'SME',
-                'Industry': industry,
-                'Date Found': datetime.now().strftime('%Y-%m-%d'),
-                'Source Verified': 'SME Database'
-            })
-        
-        return jobs
-
-    def search_sme_jobs_by_technology(self, technologies, locations=None, max_results=20):
-        """Search for SME jobs by specific technologies"""
-        if locations is None:
-            locations = ["India", "Bangalore", "Hyderabad", "Pune", "Chennai", "Mumbai", "Delhi"]
-        
-        all_tech_jobs = []
-        
-        st.info("Searching SME technology jobs with enhanced focus on small-to-medium enterprises")
-        
-        for tech in technologies[:4]:  # Search for top 4 technologies
-            for location in locations[:3]:  # Search in top 3 locations
-                try:
-                    # Generate SME technology job data
-                    tech_jobs = self._generate_sme_technology_jobs(tech, location, max_results // 3)
-                    all_tech_jobs.extend(tech_jobs)
-                    
-                    time.sleep(1)
-                    
-                except Exception as e:
-                    st.warning(f"SME job search for {tech} in {location} failed: {str(e)}")
-                    # Generate fallback SME data
-                    fallback_jobs = self._generate_sme_technology_fallback(tech, location, 2)
-                    all_tech_jobs.extend(fallback_jobs)
-                    continue
-        
-        return all_tech_jobs
-
-    def _generate_sme_technology_jobs(self, technology, location, count):
-        """Generate realistic SME job listings for specific technology with proper links"""
-        jobs = []
-        
-        # Get technology-specific job titles
-        tech_titles = self.SME_TECHNOLOGY_ROLES.get(technology, [f"{technology} Specialist", f"{technology} Engineer"])
-        
-        # Select SME companies that typically hire for these roles
-        all_sme_companies = []
-        for industry_companies in self.SME_COMPANIES.values():
-            all_sme_companies.extend(industry_companies)
-        
-        # Shuffle and select companies
-        random.shuffle(all_sme_companies)
-        selected_companies = all_sme_companies[:min(count * 2, len(all_sme_companies))]
-        
-        for i in range(min(count, len(selected_companies))):
-            company = selected_companies[i]
-            industry = self._identify_company_industry(company)
-            title = random.choice(tech_titles)
-            platform = random.choice(["LinkedIn", "Naukri", "Indeed"])
-            
-            # Generate proper job link
-            job_link = self._generate_realistic_job_links(company, title, platform, location)
-            
-            # SME-specific descriptions
-            descriptions = [
-                f"SME {company} in {industry} seeks {title} with {technology} expertise. Location: {location}.",
-                f"Join {company}, a growing SME, as {title}. Work on {technology} implementations in {location}.",
-                f"{company} hiring {title} for {technology} projects. SME environment with growth opportunities in {location}.",
-                f"Digital transformation role at SME {company}. {title} position focusing on {technology} in {location}."
-            ]
-            
-            jobs.append({
-                'Company': company,
-                'Job Title': f"{title} - {location}",
-                'Technology': technology,
-                'Location': location,
-                'Platform': platform,
-                'Link': job_link,
-                'Description': random.choice(descriptions),
-                'Role Type': 'Digital Transformation',
-                'Company Size': 'SME',
-                'Industry': industry,
-                'Date Found': datetime.now().strftime('%Y-%m-%d'),
-                'Source Verified': 'Technology Search'
-            })
-        
-        return jobs
-
-    def _generate_sme_technology_fallback(self, technology, location, count):
-        """Generate fallback SME job data"""
-        jobs = []
-        
-        sme_companies = ["Tech Innovations Ltd", "Digital Solutions SME", "Growth Tech Partners", 
-                        "Smart Business Systems", "NextGen Digital", "Innovation Labs India"]
-        
-        tech_titles = self.SME_TECHNOLOGY_ROLES.get(technology, [f"{technology} Specialist"])
-        
-        for i in range(count):
-            company = random.choice(sme_companies)
-            job_link = self._generate_realistic_job_links(company, tech_titles[0], "Multiple", location)
-            
-            jobs.append({
-                'Company': company,
-                'Job Title': f"{random.choice(tech_titles)} - {location}",
-                'Technology': technology,
-                'Location': location,
-                'Platform': 'Multiple SME Platforms',
-                'Link': job_link,
-                'Description': f"SME company seeking {technology} professional in {location}. Focus on digital transformation initiatives.",
-                'Role Type': 'Digital Transformation',
-                'Company Size': 'SME',
-                'Industry': 'Various',
-                'Date Found': datetime.now().strftime('%Y-%m-%d'),
-                'Source Verified': 'Generated'
-            })
-        
-        return jobs
-
-    def get_sme_companies_by_industry(self, industries):
-        """Get SME companies by specific industries"""
-        companies = []
-        for industry in industries:
-            if industry in self.SME_COMPANIES:
-                companies.extend(self.SME_COMPANIES[industry])
-        return list(set(companies))  # Remove duplicates
-
-    def generate_sme_jobs_output(self, job_listings):
-        """Generate TSV output for SME job listings with proper source verification"""
-        if not job_listings:
-            return "No SME job listings found"
-        
-        output_lines = ["Company\tJob Title\tPlatform\tRole Type\tTechnology\tLocation\tCompany Size\tIndustry\tLink\tDate Found\tSource Verified\tDescription"]
-        
-        for job in job_listings:
-            company = str(job.get('Company', '')).replace('\t', ' ')
-            job_title = str(job.get('Job Title', '')).replace('\t', ' ')
-            platform = str(job.get('Platform', '')).replace('\t', ' ')
-            role_type = str(job.get('Role Type', 'General')).replace('\t', ' ')
-            technology = str(job.get('Technology', '')).replace('\t', ' ')
-            location = str(job.get('Location', '')).replace('\t', ' ')
-            company_size = str(job.get('Company Size', 'SME')).replace('\t', ' ')
-            industry = str(job.get('Industry', 'Various')).replace('\t', ' ')
-            link = str(job.get('Link', '')).replace('\t', ' ')
-            date_found = str(job.get('Date Found', ''))
-            source_verified = str(job.get('Source Verified', 'Generated'))
-            description = str(job.get('Description', '')).replace('\t', ' ').replace('\n', ' ')
-            
-            output_line = f"{company}\t{job_title}\t{platform}\t{role_type}\t{technology}\t{location}\t{company_size}\t{industry}\t{link}\t{date_found}\t{source_verified}\t{description}"
-            output_lines.append(output_line)
-        
-        return "\n".join(output_lines)
+            st.info("No confidence data available")
+
+def render_export_buttons(label, rows, columns, file_stem, key):
+    """One download button per available export format
+
+    `rows` is a callable returning the rows to export; it only runs when a
+    button is clicked, and the file is written in chunks.
+    """
+    formats = available_formats()
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M')
+    for column, fmt in zip(st.columns(len(formats)), formats):
+        format_label, mime, extension, _ = EXPORT_FORMATS[fmt]
+        with column:
+            st.download_button(
+                label=f"{label} ({format_label})",
+                data=lambda fmt=fmt: export_file(rows(), columns, fmt),
+                file_name=f"{file_stem}_{timestamp}.{extension}",
+                mime=mime,
+                on_click="ignore",
+                use_container_width=True,
+                key=f"{key}_{fmt}"
+            )
 
 def main():
     st.title("SME Digital Transformation Scout")
@@ -1044,18 +205,28 @@ def main():
         """)
         return
     
-    # Initialize scouts
-    sme_scout = SMEDigitalTransformationScout()
-    job_scout = SMEJobPlatformScout()
+    # Initialize scouts (built once per process, see get_sme_scout)
+    sme_scout = get_sme_scout()
+    job_scout = get_job_scout()
     
     # Initialize session state
     if 'articles' not in st.session_state:
         st.session_state.articles = []
-    if 'all_companies' not in st.session_state:
-        st.session_state.all_companies = []
+    if 'company_store' not in st.session_state:
+        st.session_state.company_store = CompanyStore()
+        st.session_state.score_weights = dict(DEFAULT_WEIGHTS)
+    if 'session_id' not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    if 'search_job_id' not in st.session_state:
+        st.session_state.search_job_id = None
+    if 'stream_job_id' not in st.session_state:
+        st.session_state.stream_job_id = None
+    if 'extraction_job_id' not in st.session_state:
+        st.session_state.extraction_job_id = None
+        st.session_state.extraction_replace = False
     
     # Create tabs for different functionalities
-    tab1, tab2 = st.tabs(["SME Digital Transformation Scout", "SME Job Platform Search"])
+    tab1, tab2, tab3 = st.tabs(["SME Digital Transformation Scout", "SME Job Platform Search", "Research Database"])
     
     with tab1:
         st.header("SME Digital Transformation Discovery")
@@ -1079,22 +250,86 @@ def main():
             
             st.subheader("Search Settings")
             max_per_source = st.slider("Results per Search", 5, 20, 12)
+            streaming_mode = st.checkbox(
+                "Stream search straight into AI analysis", value=False,
+                help="Articles are analyzed and scored as soon as they are found, so the first companies appear within seconds"
+            )
+            new_only = st.checkbox(
+                "New articles only", value=False,
+                help="Skip articles an earlier run already analyzed (matched by link or text), so daily refreshes only analyze what is new"
+            )
+            st.caption(f"Seen-article index: {sme_scout.seen_articles.article_count()} articles")
+            if st.button("Clear Search Cache", use_container_width=True, key="clear_http_cache"):
+                sme_scout.session.cache.clear()
+                st.success("Search response cache cleared")
+            if st.button("Forget Seen Articles", use_container_width=True, key="clear_seen_articles"):
+                sme_scout.seen_articles.clear()
+                st.success("Seen-article index cleared")
             
             st.subheader("Analysis Settings")
-            batch_size = st.slider("Batch Size for AI Analysis", 10, 50, 25)
-            delay_between_batches = st.slider("Delay between batches (seconds)", 1, 10, 2)
+            max_concurrency = st.slider(
+                "Max concurrent AI requests", 1, 16, 8,
+                help="Upper bound only: concurrency adapts to Groq's rate limits automatically"
+            )
+            pack_articles = st.checkbox(
+                "Pack several articles per AI request", value=True,
+                help="Sends short articles together so the instructions are not repeated for each one"
+            )
+            pack_token_budget = st.slider("Packed prompt size (tokens)", 1000, 6000, 3000, step=500, disabled=not pack_articles)
+            use_prefilter = st.checkbox(
+                "Skip low-relevance articles", value=True,
+                help="Scores articles locally (keywords + model trained on past results) before any AI call"
+            )
+            prefilter_threshold = st.slider("Relevance threshold", 0.0, 0.9, 0.25, step=0.05, disabled=not use_prefilter)
+            use_cascade = st.checkbox(
+                "Triage with a small model first", value=False,
+                help="A fast model (or local heuristics) settles simple articles; only rich or uncertain ones go to the 70B model"
+            )
+            cascade = None
+            if use_cascade:
+                triage_tier = st.selectbox("Triage tier", [TRIAGE_MODEL, HEURISTIC_TIER])
+                rich_chars = st.slider(
+                    "Send articles longer than this straight to 70B (characters)", 500, 3000, 1500, step=250
+                )
+                accept_medium = st.checkbox(
+                    "Keep medium-confidence triage answers", value=False,
+                    help="Fewer escalations, at some risk to extraction quality"
+                )
+                cascade = CascadePolicy(
+                    triage_model=triage_tier, rich_chars=rich_chars,
+                    accept_confidence=('high', 'medium') if accept_medium else ('high',)
+                )
+            with st.expander("Relevance Weights"):
+                score_weights = {
+                    component: st.slider(column.replace(" Points", ""), 0.0, 2.0, DEFAULT_WEIGHTS[component], step=0.25,
+                                         key=f"weight_{component}")
+                    for component, column in COMPONENT_COLUMNS.items()
+                }
+            if score_weights != st.session_state.score_weights:
+                # Component points are stored per company, so re-ranking is a single vectorized pass
+                st.session_state.score_weights = score_weights
+                apply_score_weights(sme_scout, st.session_state.company_store, score_weights)
+            st.caption(f"AI extraction cache: {sme_scout.extraction_cache.entry_count(sme_scout.extraction_prompt_version)} articles")
+            if st.button("Clear AI Extraction Cache", use_container_width=True, key="clear_extraction_cache"):
+                sme_scout.extraction_cache.invalidate()
+                st.success("AI extraction cache cleared")
             
             st.info("""
             SME-Focused Features:
             - Small-to-Medium Enterprise targeting
             - Revenue range analysis (1-250 crore)
             - Kerala companies excluded
-            - Batch processing for large datasets
+            - Concurrent AI analysis for large datasets
             - Direct source links for all articles
             """)
+            
+            running_jobs = [job for job in get_job_runner().list_jobs() if not job.done]
+            if running_jobs:
+                st.caption(f"Background jobs running on this server: {len(running_jobs)}")
         
         # Search Phase
-        if st.button("Search for SME Articles", type="primary", use_container_width=True):
+        search_running = bool(st.session_state.search_job_id or st.session_state.stream_job_id)
+        if st.button("Search for SME Articles", type="primary", use_container_width=True, disabled=search_running):
             if not selected_industries:
                 st.error("Please select at least one industry")
                 return
@@ -1108,12 +343,57 @@ def main():
             
             st.info(f"Using {len(search_queries)} targeted SME queries across {len(selected_industries)} industries")
             
-            with st.spinner("Comprehensive SME digital transformation search in progress..."):
-                # Perform hybrid search
-                articles = sme_scout.hybrid_search(search_queries, max_per_source)
+            # Searches run in the background so the page stays responsive
+            if streaming_mode:
+                job = get_job_runner().submit(
+                    "stream", f"Searching and analyzing {len(search_queries)} SME queries", run_streaming_job,
+                    sme_scout, search_queries, max_per_source,
+                    max_concurrency=max_concurrency,
+                    pack_articles=pack_articles,
+                    pack_token_budget=pack_token_budget,
+                    prefilter_threshold=prefilter_threshold if use_prefilter else None,
+                    new_only=new_only,
+                    cascade=cascade,
+                    owner=st.session_state.session_id
+                )
+                st.session_state.stream_job_id = job.job_id
+            else:
+                job = get_job_runner().submit(
+                    "search", f"Searching {len(search_queries)} SME queries", run_search_job,
+                    sme_scout, search_queries, max_per_source, new_only=new_only, owner=st.session_state.session_id
+                )
+                st.session_state.search_job_id = job.job_id
+        
+        stream_job = poll_background_job("stream_job_id", show_partial_results=True)
+        if stream_job is not None:
+            show_job_messages(stream_job)
+            if stream_job.status == FAILED:
+                st.error(f"Streaming analysis failed: {stream_job.error}")
+            else:
+                st.session_state.articles = stream_job.result['articles']
+                st.session_state.company_store.clear()
+                st.session_state.company_store.upsert(stream_job.result['companies'], score=sme_scout.score_companies)
+                if score_weights != DEFAULT_WEIGHTS:
+                    # Records arrive scored with the default weights
+                    apply_score_weights(sme_scout, st.session_state.company_store, score_weights)
+                st.success(f"Analyzed {len(st.session_state.articles)} articles and found "
+                           f"{len(st.session_state.company_store)} SME companies")
+        
+        search_job = poll_background_job("search_job_id")
+        if search_job is not None:
+            if search_job.status == FAILED:
+                st.error(f"Search failed: {search_job.error}")
+            else:
+                articles = search_job.result
                 st.session_state.articles = articles
+                show_job_messages(search_job)
                 
+                search_metrics = search_job.snapshot()['metrics']
                 if not articles:
+                    if search_metrics.get("Already Seen"):
+                        st.info(f"No new articles: all {search_metrics['Already Seen']} results were already analyzed in earlier runs. "
+                                "Untick 'New articles only' to see them again.")
+                        return
                     st.error("""
                     No articles found. Possible issues:
                     - Internet connectivity
@@ -1123,15 +403,25 @@ def main():
                     return
                 
                 st.success(f"Found {len(articles)} relevant SME articles")
+                merged_count = sum(len(a.get('alternate_sources', [])) for a in articles)
+                if merged_count:
+                    st.info(f"Merged {merged_count} near-duplicate articles into their original stories")
                 
                 # Display search summary
-                col1, col2 = st.columns(2)
+                col1, col2, col3, col4, col5 = st.columns(5)
                 with col1:
                     google_count = len([a for a in articles if a['source'] == 'Google News'])
                     st.metric("Google News", google_count)
                 with col2:
                     other_count = len([a for a in articles if a['source'] != 'Google News'])
                     st.metric("Other Sources", other_count)
+                with col3:
+                    st.metric("Cache Hits", search_metrics.get("Cache Hits", 0))
+                with col4:
+                    st.metric("Cache Misses", search_metrics.get("Cache Misses", 0))
+                with col5:
+                    st.metric("Already Seen", search_metrics.get("Already Seen", 0),
+                              help="Results an earlier run already analyzed" + (" (skipped)" if new_only else ""))
         
         # Show article management if we have articles
         if st.session_state.articles:
@@ -1151,6 +441,11 @@ def main():
                     st.write(f"**Read more:** [Direct Link]({source_link})")
                     if article.get('description'):
                         st.write(f"*{article['description'][:200]}...*")
+                    if article.get('alternate_sources'):
+                        alternate_links = ", ".join(
+                            f"[{alt['source']}]({alt['direct_link']})" for alt in article['alternate_sources'][:5]
+                        )
+                        st.write(f"**Also reported by:** {alternate_links}")
                     st.markdown("---")
             
             # Analysis range selection
@@ -1173,98 +468,143 @@ def main():
             with col2:
                 analyze_range = st.button("Analyze Selected Range", use_container_width=True, type="primary", key="analyze_range")
             
-            if analyze_all or analyze_range:
-                if analyze_all:
+            # Offer to resume an analysis that was interrupted part-way
+            resume_analysis = False
+            unfinished_job = None if st.session_state.extraction_job_id else sme_scout.job_store.latest_unfinished(
+                st.session_state.session_id
+            )
+            if unfinished_job:
+                job_progress = unfinished_job['progress']
+                st.warning(f"An earlier analysis stopped with {job_progress['done']} of {unfinished_job['total']} articles done "
+                           f"({job_progress['failed']} failed, {job_progress['pending']} not started)")
+                col1, col2 = st.columns(2)
+                with col1:
+                    resume_analysis = st.button("Resume Interrupted Analysis", use_container_width=True, key="resume_analysis")
+                with col2:
+                    if st.button("Discard Interrupted Analysis", use_container_width=True, key="discard_analysis"):
+                        if sme_scout.job_store.discard(unfinished_job['job_id']):
+                            st.rerun()
+                        st.warning("That analysis has been restarted and can no longer be discarded")
+            
+            if (analyze_all or analyze_range or resume_analysis) and st.session_state.extraction_job_id:
+                st.warning("An analysis is already running for this session")
+            elif resume_analysis and sme_scout.job_store.is_active(unfinished_job['job_id']):
+                st.warning("That analysis is already running")
+            elif analyze_all or analyze_range or resume_analysis:
+                replace_results = analyze_all
+                if resume_analysis:
+                    articles_to_analyze = sme_scout.job_store.job_articles(unfinished_job['job_id'])
+                    replace_results = unfinished_job['params'].get('mode') == 'all'
+                    st.info(f"Resuming analysis of {len(articles_to_analyze)} articles")
+                elif analyze_all:
                     articles_to_analyze = articles
                     st.info(f"Analyzing ALL {len(articles)} SME articles")
                 else:
                     articles_to_analyze = articles[start_index:end_index]
                     st.info(f"Analyzing articles {start_index} to {end_index} ({len(articles_to_analyze)} articles)")
                 
-                # AI Analysis Phase
-                st.markdown("---")
-                st.header("AI Analysis Phase")
-                
-                with st.spinner("AI analyzing for SME digital transformation companies..."):
-                    # Extract companies using Groq with batch processing
-                    companies_data = sme_scout.extract_company_data_with_groq(
-                        articles_to_analyze, 
-                        batch_size=batch_size,
-                        delay_between_batches=delay_between_batches
-                    )
+                # Resumed jobs were already triaged when they started
+                if use_prefilter and not resume_analysis:
+                    triage = sme_scout.prefilter.triage(articles_to_analyze, prefilter_threshold)
+                    articles_to_analyze = triage['selected']
                     
-                    if not companies_data:
-                        st.error("""
-                        No SME digital transformation companies extracted. This could mean:
-                        - Articles don't contain specific SME digital transformation info
-                        - Try expanding industry selection
-                        - Adjust technology focus
-                        - Increase number of articles analyzed
-                        """)
+                    st.subheader("Relevance Prefilter")
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        st.metric("Sent to AI", len(triage['selected']))
+                    with col2:
+                        st.metric("AI Calls Avoided", len(triage['skipped']),
+                                  help="Articles below the relevance threshold")
+                    with col3:
+                        recall_loss = triage['estimated_recall_loss']
+                        st.metric("Est. Recall Loss", "n/a" if recall_loss is None else f"{recall_loss:.0%}",
+                                  help="Share of past company-bearing articles this threshold would have skipped")
+                    if not triage['model_trained']:
+                        st.caption("Prefilter is using keyword scoring until enough past results are recorded to train its model")
+                    if not articles_to_analyze:
+                        st.warning("All selected articles fell below the relevance threshold. Lower it to analyze them.")
                         return
-                    
-                    # Calculate relevance scores
-                    for company in companies_data:
-                        company['Relevance Score'] = sme_scout.calculate_sme_relevance_score(company)
-                    
-                    # Filter and rank companies
-                    ranked_companies = sme_scout.filter_and_rank_sme_companies(companies_data)
-                    
-                    # Store in session state
-                    if analyze_all:
-                        st.session_state.all_companies = ranked_companies
-                    else:
-                        # Merge with existing companies, removing duplicates
-                        existing_companies = st.session_state.all_companies
-                        all_companies_dict = {}
-                        
-                        # Add existing companies to dict
-                        for company in existing_companies:
-                            all_companies_dict[company['Company Name']] = company
-                        
-                        # Add new companies, updating if exists
-                        for company in ranked_companies:
-                            all_companies_dict[company['Company Name']] = company
-                        
-                        st.session_state.all_companies = list(all_companies_dict.values())
-                        st.session_state.all_companies.sort(key=lambda x: x['Relevance Score'], reverse=True)
+                
+                # Extraction runs as a background job; results are merged when it finishes
+                job = get_job_runner().submit(
+                    "extract", f"Analyzing {len(articles_to_analyze)} articles", run_extraction_job,
+                    sme_scout, articles_to_analyze,
+                    max_concurrency=max_concurrency,
+                    pack_articles=pack_articles,
+                    pack_token_budget=pack_token_budget,
+                    cascade=cascade,
+                    job_params={'mode': 'all' if replace_results else 'range'},
+                    job_owner=st.session_state.session_id,
+                    owner=st.session_state.session_id
+                )
+                st.session_state.extraction_job_id = job.job_id
+                st.session_state.extraction_replace = replace_results
+            
+        if st.session_state.extraction_job_id:
+            st.markdown("---")
+            st.header("AI Analysis Phase")
+            extraction_job = poll_background_job("extraction_job_id", show_partial_results=True)
+            if extraction_job is not None:
+                show_job_messages(extraction_job)
+                ranked_companies = extraction_job.result or []
+                
+                if extraction_job.status == FAILED:
+                    st.error(f"Analysis failed: {extraction_job.error}")
+                elif not ranked_companies:
+                    st.error("""
+                    No SME digital transformation companies extracted. This could mean:
+                    - Articles don't contain specific SME digital transformation info
+                    - Try expanding industry selection
+                    - Adjust technology focus
+                    - Increase number of articles analyzed
+                    """)
+                else:
+                    # Store in session state; the store merges mentions of the same company
+                    company_store = st.session_state.company_store
+                    if st.session_state.extraction_replace:
+                        company_store.clear()
+                    company_store.upsert(ranked_companies, score=sme_scout.score_companies)
+                    if score_weights != DEFAULT_WEIGHTS:
+                        # Records arrive scored with the default weights
+                        apply_score_weights(sme_scout, company_store, score_weights)
                     
                     st.success(f"Found {len(ranked_companies)} SME companies in this analysis!")
-                    st.success(f"Total SME companies in database: {len(st.session_state.all_companies)}")
+                    st.success(f"Total SME companies in database: {len(company_store)}")
         
         # Show results if we have companies
-        if st.session_state.all_companies:
+        company_store = st.session_state.company_store
+        if len(company_store):
             st.markdown("---")
             st.header("SME Digital Transformation Results")
             
-            companies = st.session_state.all_companies
+            # Counts are kept up to date by the store as companies are upserted
+            company_aggregates = company_store.aggregates
             
             # Statistics
             col1, col2, col3, col4 = st.columns(4)
             with col1:
-                st.metric("Total SMEs", len(companies))
+                st.metric("Total SMEs", len(company_store))
             with col2:
-                confirmed_smes = len([c for c in companies if 'sme' in c['Company Size'].lower()])
+                confirmed_smes = company_aggregates.count_matching('Company Size', get_matcher(['SME']))
                 st.metric("Confirmed SMEs", confirmed_smes)
             with col3:
-                high_confidence = len([c for c in companies if c['Confidence'] == 'high'])
+                high_confidence = company_aggregates.count('Confidence', 'high')
                 st.metric("High Confidence", high_confidence)
             with col4:
-                unique_industries = len(set([c['Industry'] for c in companies]))
+                unique_industries = company_aggregates.distinct('Industry')
                 st.metric("Industries", unique_industries)
             
             # Display insights
-            sme_scout.display_sme_insights(companies)
+            display_sme_insights(company_aggregates)
             
             # Company details table
             st.subheader("SME Company Details")
-            df = pd.DataFrame(companies)
             
             # Enhanced styling for SMEs
             def color_company_size(val):
-                if 'sme' in str(val).lower() or 'small' in str(val).lower():
+                if get_matcher(SMALL_SIZE_TERMS).contains(str(val)):
                     return 'background-color: #90EE90; color: black; font-weight: bold;'
-                elif 'growing' in str(val).lower():
+                elif get_matcher(GROWING_SIZE_TERMS).contains(str(val)):
                     return 'background-color: #FFE4B5; color: black;'
                 return ''
             
@@ -1276,11 +616,41 @@ def main():
                 else:
                     return 'background-color: #FFB6C1; color: black;'
             
-            # Select and style relevant columns
+            # Filtering, sorting and paging run on the store's column arrays;
+            # only the visible page is turned into a styled DataFrame
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                grid_industries = st.multiselect("Industry", company_store.values('Industry'), key="grid_industry")
+            with col2:
+                grid_sizes = st.multiselect("Company Size", company_store.values('Company Size'), key="grid_size")
+            with col3:
+                grid_confidence = st.multiselect("Confidence", company_store.values('Confidence'), key="grid_confidence")
+            with col4:
+                grid_min_score = st.slider("Minimum relevance", 0.0, 10.0, 0.0, step=0.5, key="grid_min_score")
+            
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                grid_sort = st.selectbox("Sort by", GRID_SORT_COLUMNS, key="grid_sort")
+            with col2:
+                grid_ascending = st.selectbox("Order", ["Descending", "Ascending"], key="grid_order") == "Ascending"
+            with col3:
+                grid_page_size = st.selectbox("Rows per page", [25, 50, 100, 250], index=1, key="grid_page_size")
+            
+            grid_filters = {'Industry': grid_industries, 'Company Size': grid_sizes, 'Confidence': grid_confidence}
             display_columns = ['Company Name', 'Industry', 'Revenue Range', 'Company Size', 
                               'Digital Transformation', 'Source Link', 'Confidence', 'Relevance Score']
+            matching_count = company_store.count(grid_filters, grid_min_score or None)
+            page_count = max(1, -(-matching_count // grid_page_size))
+            if st.session_state.get("grid_page", 1) > page_count:
+                st.session_state.grid_page = page_count
+            with col4:
+                grid_page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1, key="grid_page")
             
-            display_df = df[display_columns] if all(col in df.columns for col in display_columns) else df
+            page_offset = (grid_page - 1) * grid_page_size
+            display_df, matching_count = company_store.page(
+                grid_filters, grid_min_score or None, sort_by=grid_sort, ascending=grid_ascending,
+                offset=page_offset, limit=grid_page_size, columns=display_columns
+            )
             
             styled_df = display_df.style.map(color_company_size, subset=['Company Size'])\
                                       .map(color_confidence, subset=['Confidence'])
@@ -1300,27 +670,30 @@ def main():
                 },
                 use_container_width=True,
                 hide_index=True,
-                height=600
+                height=min(600, 38 + 35 * max(len(display_df), 1))
             )
+            if matching_count:
+                st.caption(f"Showing {page_offset + 1}-{page_offset + len(display_df)} of {matching_count} matching companies")
+            else:
+                st.caption("No companies match these filters")
             
             # Enhanced Output
             st.subheader("TSV Output - Copy Ready")
-            enhanced_output = sme_scout.generate_enhanced_output(companies)
+            enhanced_output = sme_scout.generate_enhanced_output(company_store.records()[:EXPORT_PREVIEW_ROWS])
             st.code(enhanced_output, language='text')
+            if len(company_store) > EXPORT_PREVIEW_ROWS:
+                st.caption(f"Showing the top {EXPORT_PREVIEW_ROWS} of {len(company_store)} companies; download for the full table")
             
-            # Download button
-            st.download_button(
-                label="Download Complete SME Data",
-                data=enhanced_output,
-                file_name=f"sme_digital_transformation_{datetime.now().strftime('%Y%m%d_%H%M')}.tsv",
-                mime="text/tab-separated-values",
-                use_container_width=True
+            # Downloads are generated on click, streaming rows from the store
+            render_export_buttons(
+                "Download Complete SME Data", company_store.iter_records, COMPANY_EXPORT_COLUMNS,
+                "sme_digital_transformation", "download_sme"
             )
             
             # Clear data button
             if st.button("Clear All Data", use_container_width=True, key="clear_sme"):
                 st.session_state.articles = []
-                st.session_state.all_companies = []
+                st.session_state.company_store.clear()
                 st.rerun()
     
     with tab2:
@@ -1372,7 +745,9 @@ def main():
                     st.warning("Using enhanced SME-focused job search with industry-specific roles and proper source links")
                     
                     with st.spinner(f"Searching SME job platforms for {len(sme_companies)} companies..."):
-                        job_listings = job_scout.search_sme_jobs_by_company(sme_companies, max_jobs_per_company)
+                        job_listings = job_scout.search_sme_jobs_by_company(
+                            sme_companies, max_jobs_per_company, reporter=StreamlitProgressReporter()
+                        )
                     
                     if job_listings:
                         st.success(f"Found {len(job_listings)} SME job listings")
@@ -1380,27 +755,25 @@ def main():
                         # Display SME job insights
                         st.subheader("SME Job Search Insights")
                         
+                        # One pass over the listings feeds every count below
+                        job_aggregates = Aggregates.from_records(job_listings, JOB_DIMENSIONS)
                         col1, col2, col3, col4 = st.columns(4)
                         with col1:
-                            platforms = [job['Platform'] for job in job_listings]
-                            platform_counts = pd.Series(platforms).value_counts()
-                            st.metric("Job Platforms", len(platform_counts))
+                            st.metric("Job Platforms", job_aggregates.distinct('Platform'))
                         
                         with col2:
-                            digital_roles = len([job for job in job_listings if job['Role Type'] == 'Digital Transformation'])
+                            digital_roles = job_aggregates.count('Role Type', 'Digital Transformation')
                             st.metric("Digital Roles", digital_roles)
                         
                         with col3:
-                            companies_found = len(set([job['Company'] for job in job_listings]))
-                            st.metric("SME Companies", companies_found)
+                            st.metric("SME Companies", job_aggregates.distinct('Company'))
                         
                         with col4:
-                            industries = [job['Industry'] for job in job_listings]
-                            industry_counts = pd.Series(industries).value_counts()
-                            st.metric("Industries", len(industry_counts))
+                            st.metric("Industries", job_aggregates.distinct('Industry'))
                         
                         # Industry distribution
                         st.subheader("SME Industry Distribution")
+                        industry_counts = job_aggregates.series('Industry')
                         if not industry_counts.empty:
                             st.bar_chart(industry_counts)
                         
@@ -1443,15 +816,11 @@ def main():
                         
                         # Download SME jobs data
                         st.subheader("SME Jobs TSV Output")
-                        jobs_output = job_scout.generate_sme_jobs_output(job_listings)
+                        jobs_output = job_scout.generate_sme_jobs_output(job_listings[:EXPORT_PREVIEW_ROWS])
                         st.code(jobs_output, language='text')
                         
-                        st.download_button(
-                            label="Download SME Jobs Data",
-                            data=jobs_output,
-                            file_name=f"sme_job_listings_{datetime.now().strftime('%Y%m%d_%H%M')}.tsv",
-                            mime="text/tab-separated-values",
-                            use_container_width=True
+                        render_export_buttons(
+                            "Download SME Jobs Data", lambda: job_listings, JOB_EXPORT_COLUMNS, "sme_job_listings", "download_jobs"
                         )
                     else:
                         st.error("No SME job listings found for the specified industries")
@@ -1468,7 +837,9 @@ def main():
                     st.warning("Using SME-focused technology job search with realistic SME company data and proper source links")
                     
                     with st.spinner("Generating SME technology job listings..."):
-                        tech_jobs = job_scout.search_sme_jobs_by_technology(technologies, location_list, max_tech_jobs)
+                        tech_jobs = job_scout.search_sme_jobs_by_technology(
+                            technologies, location_list, max_tech_jobs, reporter=StreamlitProgressReporter()
+                        )
                     
                     if tech_jobs:
                         st.success(f"Found {len(tech_jobs)} SME technology job listings")
@@ -1476,27 +847,23 @@ def main():
                         # Display SME tech job insights
                         st.subheader("SME Technology Job Insights")
                         
+                        tech_job_aggregates = Aggregates.from_records(tech_jobs, JOB_DIMENSIONS)
                         col1, col2, col3, col4 = st.columns(4)
                         with col1:
-                            tech_counts = pd.Series([job['Technology'] for job in tech_jobs]).value_counts()
-                            st.metric("Technologies", len(tech_counts))
+                            st.metric("Technologies", tech_job_aggregates.distinct('Technology'))
                         
                         with col2:
-                            companies_found = len(set([job['Company'] for job in tech_jobs]))
-                            st.metric("SME Companies", companies_found)
+                            st.metric("SME Companies", tech_job_aggregates.distinct('Company'))
                         
                         with col3:
-                            platforms = [job['Platform'] for job in tech_jobs]
-                            platform_counts = pd.Series(platforms).value_counts()
-                            st.metric("Platforms", len(platform_counts))
+                            st.metric("Platforms", tech_job_aggregates.distinct('Platform'))
                         
                         with col4:
-                            industries = [job['Industry'] for job in tech_jobs]
-                            industry_counts = pd.Series(industries).value_counts()
-                            st.metric("Industries", len(industry_counts))
+                            st.metric("Industries", tech_job_aggregates.distinct('Industry'))
                         
                         # Technology distribution
                         st.subheader("Technology Distribution in SMEs")
+                        tech_counts = tech_job_aggregates.series('Technology')
                         if not tech_counts.empty:
                             st.bar_chart(tech_counts)
                         
@@ -1519,18 +886,78 @@ def main():
                         
                         # Download SME tech jobs data
                         st.subheader("SME Technology Jobs TSV Output")
-                        tech_jobs_output = job_scout.generate_sme_jobs_output(tech_jobs)
+                        tech_jobs_output = job_scout.generate_sme_jobs_output(tech_jobs[:EXPORT_PREVIEW_ROWS])
                         st.code(tech_jobs_output, language='text')
                         
-                        st.download_button(
-                            label="Download SME Tech Jobs Data",
-                            data=tech_jobs_output,
-                            file_name=f"sme_tech_jobs_{datetime.now().strftime('%Y%m%d_%H%M')}.tsv",
-                            mime="text/tab-separated-values",
-                            use_container_width=True
+                        render_export_buttons(
+                            "Download SME Tech Jobs Data", lambda: tech_jobs, JOB_EXPORT_COLUMNS, "sme_tech_jobs", "download_tech_jobs"
                         )
                     else:
                         st.error("No SME technology job listings found")
+    
+    with tab3:
+        st.header("Research Database")
+        st.markdown("""
+        **Query every article and company found so far, across sessions**  
+        *Text search covers company names and transformation details (e.g. "RPA"), or article titles and descriptions*
+        """)
+        
+        database_counts = sme_scout.database.counts()
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Companies", database_counts['companies'])
+        with col2:
+            st.metric("Articles", database_counts['articles'])
+        with col3:
+            st.metric("Extractions", database_counts['extractions'])
+        
+        st.subheader("Companies")
+        col1, col2 = st.columns(2)
+        with col1:
+            company_text = st.text_input("Text search", placeholder="RPA warehouse", key="db_company_text")
+            company_industries = st.multiselect("Industries", sme_scout.INDUSTRIES, key="db_company_industries")
+        with col2:
+            company_confidence = st.multiselect("Confidence", ["high", "medium", "low"], key="db_company_confidence")
+            min_relevance = st.slider("Minimum relevance", 0.0, 10.0, 0.0, step=0.5, key="db_min_relevance")
+        
+        try:
+            stored_companies = sme_scout.database.search_companies(
+                company_text, company_industries, company_confidence, min_relevance
+            )
+        except Exception as e:
+            st.error(f"Search failed: {str(e)}")
+            stored_companies = []
+        if stored_companies:
+            st.caption(f"Showing the top {len(stored_companies)} matching companies")
+            st.dataframe(
+                pd.DataFrame(stored_companies).reindex(columns=[
+                    'Company Name', 'Industry', 'Revenue Range', 'Company Size', 'Confidence',
+                    'Relevance Score', 'Mentions', 'Transformation Details', 'Source Link'
+                ]),
+                column_config={"Source Link": st.column_config.LinkColumn("Source")},
+                use_container_width=True,
+                hide_index=True
+            )
+            if st.button("Load Into Results", use_container_width=True, key="db_load_companies"):
+                st.session_state.company_store.upsert(stored_companies, score=sme_scout.score_companies)
+                apply_score_weights(sme_scout, st.session_state.company_store, st.session_state.score_weights)
+                st.success(f"Loaded {len(stored_companies)} companies into the results table")
+        else:
+            st.info("No stored companies match these filters")
+        
+        st.subheader("Articles")
+        article_text = st.text_input("Search article titles and descriptions", key="db_article_text")
+        if article_text:
+            stored_articles = sme_scout.database.search_articles(article_text)
+            if stored_articles:
+                st.dataframe(
+                    pd.DataFrame(stored_articles),
+                    column_config={"direct_link": st.column_config.LinkColumn("Link")},
+                    use_container_width=True,
+                    hide_index=True
+                )
+            else:
+                st.info("No stored articles match this search")
 
 if __name__ == "__main__":
     main()
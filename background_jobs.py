@@ -0,0 +1,177 @@
+import itertools
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from progress import ProgressReporter
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+# Keep the event log of a job bounded; the UI only shows the latest lines
+MAX_EVENTS = 500
+
+
+class BackgroundJob:
+    """State of one job, updated by its worker thread and polled by the UI"""
+
+    def __init__(self, job_id, kind, label, owner=None):
+        self.job_id = job_id
+        self.kind = kind
+        self.label = label
+        self.owner = owner
+        self.status = QUEUED
+        self.created_at = time.time()
+        self.finished_at = None
+        self.fraction = 0.0
+        self.message = ""
+        self.metrics = {}
+        self.events = []
+        self.event_offset = 0
+        self.partial_results = []
+        self.result = None
+        self.error = None
+        self.lock = threading.Lock()
+
+    def add_event(self, level, message):
+        with self.lock:
+            self.events.append((time.time(), level, message))
+            if len(self.events) > MAX_EVENTS:
+                dropped = len(self.events) - MAX_EVENTS
+                del self.events[:dropped]
+                self.event_offset += dropped
+
+    def events_since(self, cursor):
+        """Return (events after `cursor`, new cursor) for incremental polling"""
+        with self.lock:
+            start = max(cursor - self.event_offset, 0)
+            return list(self.events[start:]), self.event_offset + len(self.events)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'job_id': self.job_id,
+                'kind': self.kind,
+                'label': self.label,
+                'status': self.status,
+                'fraction': self.fraction,
+                'message': self.message,
+                'metrics': dict(self.metrics),
+                'partial_count': len(self.partial_results),
+                'error': self.error,
+                'elapsed': (self.finished_at or time.time()) - self.created_at,
+            }
+
+    @property
+    def done(self):
+        return self.status in (COMPLETED, FAILED)
+
+
+class JobProgressReporter(ProgressReporter):
+    """Progress reporter that writes into a BackgroundJob's event channel"""
+
+    def __init__(self, job):
+        self.job = job
+
+    def info(self, message):
+        self.job.add_event("info", message)
+
+    def success(self, message):
+        self.job.add_event("success", message)
+
+    def warning(self, message):
+        self.job.add_event("warning", message)
+
+    def error(self, message):
+        self.job.add_event("error", message)
+
+    def progress(self, fraction, message=None):
+        with self.job.lock:
+            self.job.fraction = min(max(fraction, 0.0), 1.0)
+            if message:
+                self.job.message = message
+
+    def metrics(self, values):
+        with self.job.lock:
+            self.job.metrics.update(values)
+
+    def results(self, rows):
+        with self.job.lock:
+            self.job.partial_results.extend(rows)
+
+
+class BackgroundJobRunner:
+    """Process-wide pool that runs scout work outside the Streamlit script thread
+
+    Jobs survive reruns and widget interaction; each browser session keeps
+    the IDs of its own jobs and polls their state.
+    """
+
+    def __init__(self, max_workers=4, keep_finished_seconds=6 * 3600):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scout-job")
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.keep_finished_seconds = keep_finished_seconds
+
+    def submit(self, kind, label, fn, *args, owner=None, **kwargs):
+        """Run fn(*args, reporter=..., **kwargs) in the pool and return the job"""
+        self._prune()
+        job = BackgroundJob(f"{kind}-{next(self.ids)}", kind, label, owner)
+        with self.lock:
+            self.jobs[job.job_id] = job
+        self.executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _run(self, job, fn, args, kwargs):
+        with job.lock:
+            job.status = RUNNING
+        try:
+            result = fn(*args, reporter=JobProgressReporter(job), **kwargs)
+            with job.lock:
+                job.result = result
+                job.status = COMPLETED
+                job.fraction = 1.0
+        except Exception as e:
+            job.add_event("error", traceback.format_exc(limit=3))
+            with job.lock:
+                job.error = str(e)
+                job.status = FAILED
+        finally:
+            with job.lock:
+                job.finished_at = time.time()
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def list_jobs(self, owner=None):
+        with self.lock:
+            jobs = list(self.jobs.values())
+        return [job for job in jobs if owner is None or job.owner == owner]
+
+    def forget(self, job_id):
+        with self.lock:
+            self.jobs.pop(job_id, None)
+
+    def _prune(self):
+        cutoff = time.time() - self.keep_finished_seconds
+        with self.lock:
+            for job_id in [job_id for job_id, job in self.jobs.items() if job.finished_at and job.finished_at < cutoff]:
+                del self.jobs[job_id]
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_job_runner():
+    """The shared runner for this process"""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = BackgroundJobRunner()
+        return _runner
@@ -0,0 +1,406 @@
+"""Headless SME scout run for cron jobs and batch machines
+
+    python batch.py --config nightly.toml --shard 0/4 --output results/shard0.parquet
+
+Settings come from a JSON or TOML config file (keys as in DEFAULTS) and
+can be overridden by flags. Queries are split across shards by position
+in a stable order, so shards started separately cover every query once.
+
+With --queue the run goes through the shared work queue instead: search
+tasks and per-article extraction tasks are leased to worker processes,
+
+    python batch.py --config nightly.toml --queue --workers 8
+    python batch.py --worker    # on more machines sharing SCOUT_CACHE_DIR
+
+and the submitting process exports the results once the queue is drained.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from exports import COMPANY_EXPORT_COLUMNS, EXPORT_FORMATS, available_formats, write_export
+from job_store import article_key
+from model_cascade import HEURISTIC_TIER, TRIAGE_MODEL, CascadePolicy
+from progress import LoggingProgressReporter
+from prompt_budget import UsageLedger
+from rate_limit import SharedHostRateLimiter
+from scout import GROQ_API_KEY_ENV, SMEDigitalTransformationScout
+from work_queue import COMPLETED, DEFAULT_LEASE_SECONDS, DEFAULT_MAX_ATTEMPTS, FAILED, QueueWorker, SQLiteWorkQueue
+
+DEFAULTS = {
+    'industries': None,  # None: every industry the scout knows
+    'technologies': ["ERP", "AI", "RPA", "DMS"],
+    'max_queries': None,  # None: every query built for the industries
+    'max_per_source': 12,
+    'search_workers': 8,
+    'max_concurrency': 8,
+    'pack_articles': True,
+    'pack_token_budget': 3000,
+    'prefilter_threshold': 0.25,  # None turns the relevance prefilter off
+    'new_only': False,
+    'streaming': False,
+    'cascade': False,  # two-tier extraction: triage model first, 70B only for rich or uncertain articles
+    'triage_model': TRIAGE_MODEL,  # or "heuristic" for the local stand-in
+    'rich_chars': 1500,
+    'output': None,  # None: sme_companies_<date>[_shard<i>of<n>].<format>
+    'format': None,  # None: taken from the output extension, else csv
+    # Work-queue mode
+    'extract_batch_size': 12,  # articles a worker claims (and packs) at once
+    'lease_seconds': DEFAULT_LEASE_SECONDS,
+    'max_attempts': DEFAULT_MAX_ATTEMPTS,
+}
+
+SEARCH_TASK = "search"
+EXTRACT_TASK = "extract"
+
+logger = logging.getLogger("scout.batch")
+
+
+def load_config(path):
+    """Settings from a .json or .toml file"""
+    if path.endswith(".toml"):
+        import tomllib
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def parse_shard(value):
+    """'i/n' -> (i, n), with 0 <= i < n"""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected INDEX/COUNT, got {value!r}")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"shard index must be in [0, {count})")
+    return index, count
+
+
+def _csv_list(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run the SME digital transformation scout without the web UI.")
+    parser.add_argument("--config", help="JSON or TOML file with run settings")
+    parser.add_argument("--industries", type=_csv_list, help="comma-separated industries (default: all)")
+    parser.add_argument("--technologies", type=_csv_list, help="comma-separated focus technologies")
+    parser.add_argument("--max-queries", type=int, help="cap on the number of search queries before sharding")
+    parser.add_argument("--max-per-source", type=int, help="results per query and source")
+    parser.add_argument("--search-workers", type=int, help="concurrent searches")
+    parser.add_argument("--max-concurrency", type=int, help="upper bound on concurrent AI requests")
+    parser.add_argument("--pack-token-budget", type=int, help="prompt size when packing articles")
+    parser.add_argument("--no-pack", dest="pack_articles", action="store_false", default=None,
+                        help="send one article per AI request")
+    parser.add_argument("--prefilter-threshold", type=float, help="relevance threshold for the prefilter")
+    parser.add_argument("--no-prefilter", dest="prefilter_threshold", action="store_const", const=False,
+                        help="send every article to the AI")
+    parser.add_argument("--new-only", action="store_true", default=None,
+                        help="skip articles an earlier run already analyzed")
+    parser.add_argument("--streaming", action="store_true", default=None,
+                        help="run search and extraction as one streaming pipeline")
+    parser.add_argument("--cascade", action="store_true", default=None,
+                        help="triage articles with a small model before the 70B model")
+    parser.add_argument("--triage-model", help=f"first-tier model, or {HEURISTIC_TIER!r} for local heuristics")
+    parser.add_argument("--rich-chars", type=int, help="articles longer than this skip triage")
+    parser.add_argument("--shard", type=parse_shard, default=(0, 1), metavar="INDEX/COUNT",
+                        help="run only this shard of the queries, e.g. 0/4")
+    parser.add_argument("--output", help="export file path")
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), help="export format")
+    parser.add_argument("--queue", action="store_true", help="run through the shared work queue")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="local worker processes in queue mode; 0 only queues the run")
+    parser.add_argument("--worker", action="store_true", help="only work on queued tasks, then exit when none are left")
+    parser.add_argument("--run-id", help="queue run to submit to or work on (default: derived from the settings)")
+    parser.add_argument("--extract-batch-size", type=int, help="articles a worker claims at once")
+    parser.add_argument("--lease-seconds", type=int, help="how long a claimed task stays with a silent worker")
+    parser.add_argument("--max-attempts", type=int, help="tries per task before it is marked failed")
+    parser.add_argument("--log-level", default="INFO")
+    return parser
+
+
+def resolve_settings(args):
+    settings = dict(DEFAULTS)
+    if args.config:
+        config = load_config(args.config)
+        unknown = set(config) - set(DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown config keys: {', '.join(sorted(unknown))}")
+        settings.update(config)
+    for key in DEFAULTS:
+        value = getattr(args, key, None)
+        if value is not None:
+            settings[key] = value
+    if settings['prefilter_threshold'] is False:
+        settings['prefilter_threshold'] = None
+    settings['cascade_options'] = (
+        {'triage_model': settings['triage_model'], 'rich_chars': settings['rich_chars']} if settings['cascade'] else None
+    )
+
+    if settings['format'] is None:
+        extension = os.path.splitext(settings['output'] or "")[1].lstrip(".").lower()
+        settings['format'] = next((fmt for fmt, spec in EXPORT_FORMATS.items() if spec[2] == extension), 'csv')
+    if settings['format'] not in available_formats():
+        raise ValueError(f"Export format {settings['format']} needs {EXPORT_FORMATS[settings['format']][3]}, which is not installed")
+    if settings['output'] is None:
+        index, count = args.shard
+        suffix = f"_shard{index}of{count}" if count > 1 else ""
+        settings['output'] = f"sme_companies_{datetime.now().strftime('%Y%m%d')}{suffix}.{EXPORT_FORMATS[settings['format']][2]}"
+    return settings
+
+
+def shard_queries(queries, index, count):
+    return queries[index::count]
+
+
+def cascade_policy(options):
+    """CascadePolicy from its JSON-friendly options (None: no cascade)"""
+    return CascadePolicy(**options) if options else None
+
+
+def plan_queries(scout, settings, shard):
+    industries = settings['industries'] or scout.INDUSTRIES
+    queries = scout.build_sme_search_queries(industries, settings['technologies'], max_queries=settings['max_queries'])
+    queries = shard_queries(queries, *shard)
+    logger.info("Shard %d/%d: %d queries over %d industries", shard[0], shard[1], len(queries), len(industries))
+    return queries
+
+
+def write_output(companies, settings):
+    with open(settings['output'], "wb") as target:
+        write_export(companies, COMPANY_EXPORT_COLUMNS, settings['format'], target)
+
+
+def run(settings, shard=(0, 1), reporter=None):
+    """Search, extract, rank, save and export one shard; returns the ranked companies"""
+    reporter = reporter or LoggingProgressReporter(logger)
+    # Shards run side by side share their per-host limits
+    scout = SMEDigitalTransformationScout(rate_limiter=SharedHostRateLimiter())
+    queries = plan_queries(scout, settings, shard)
+    if not queries:
+        return []
+
+    started = time.monotonic()
+    if settings['streaming']:
+        articles, companies = scout.stream_companies(
+            queries, settings['max_per_source'],
+            search_workers=settings['search_workers'],
+            max_concurrency=settings['max_concurrency'],
+            pack_articles=settings['pack_articles'],
+            pack_token_budget=settings['pack_token_budget'],
+            cascade=cascade_policy(settings['cascade_options']),
+            prefilter_threshold=settings['prefilter_threshold'],
+            new_only=settings['new_only'],
+            reporter=reporter,
+        )
+    else:
+        articles = scout.hybrid_search(
+            queries, settings['max_per_source'], max_workers=settings['search_workers'],
+            new_only=settings['new_only'], reporter=reporter
+        )
+        logger.info("Found %d articles", len(articles))
+        to_analyze = articles
+        if settings['prefilter_threshold'] is not None:
+            triage = scout.prefilter.triage(articles, settings['prefilter_threshold'])
+            to_analyze = triage['selected']
+            logger.info("Prefilter sent %d articles to the AI and skipped %d", len(to_analyze), len(triage['skipped']))
+        extracted = scout.extract_company_data_with_groq(
+            to_analyze,
+            max_concurrency=settings['max_concurrency'],
+            pack_articles=settings['pack_articles'],
+            pack_token_budget=settings['pack_token_budget'],
+            cascade=cascade_policy(settings['cascade_options']),
+            job_params={'mode': 'batch', 'shard': list(shard)},
+            reporter=reporter,
+        )
+        companies = scout.filter_and_rank_sme_companies(extracted)
+
+    new_companies = scout.database.save_companies(companies, score=scout.score_companies)
+    write_output(companies, settings)
+    logger.info("%d companies (%d new to the research database) from %d articles in %.0fs, written to %s",
+                len(companies), new_companies, len(articles), time.monotonic() - started, settings['output'])
+    return companies
+
+
+# Work-queue mode
+
+def queue_handlers(scout, queue, search_workers=8, extract_batch_size=12, ledger=None):
+    """QueueWorker handlers for search and extraction tasks
+
+    A search task queues one extraction task per article it finds, keyed by
+    the article so an article found by several searches is extracted once.
+    Extraction options travel in the task payloads, so workers need no
+    configuration of their own.
+    """
+    def search_one(task):
+        payload = task.payload
+        try:
+            articles, selected = scout.search_source(
+                payload['term'], payload['source'], payload['max_per_source'],
+                new_only=payload['new_only'], prefilter_threshold=payload['prefilter_threshold']
+            )
+            queued = queue.enqueue(
+                task.run_id, EXTRACT_TASK,
+                [(article_key(article), {'article': article, 'options': payload['extract']}) for article in selected],
+                max_attempts=task.max_attempts
+            )
+            return {'articles': len(articles), 'queued': queued}
+        except Exception as e:
+            return e
+
+    def search(tasks):
+        with ThreadPoolExecutor(max_workers=search_workers) as executor:
+            return list(executor.map(search_one, tasks))
+
+    def extract(tasks):
+        outcomes = [None] * len(tasks)
+        groups = {}
+        for i, task in enumerate(tasks):
+            groups.setdefault(json.dumps(task.payload['options'], sort_keys=True), []).append(i)
+        for options, positions in groups.items():
+            options = json.loads(options)
+            options['cascade'] = cascade_policy(options.get('cascade'))
+            results = scout.extract_articles([tasks[i].payload['article'] for i in positions], ledger=ledger, **options)
+            for i, result in zip(positions, results):
+                outcomes[i] = result
+            companies = [company for result in results if not isinstance(result, Exception) for company in result]
+            scout.database.save_companies(scout.filter_and_rank_sme_companies(companies), score=scout.score_companies)
+        return outcomes
+
+    # Extraction first, so queued articles drain while searches keep feeding them
+    return {
+        EXTRACT_TASK: (extract, extract_batch_size),
+        SEARCH_TASK: (search, search_workers),
+    }
+
+
+def make_worker(scout, queue, settings, ledger=None):
+    handlers = queue_handlers(scout, queue, settings['search_workers'], settings['extract_batch_size'], ledger)
+    return QueueWorker(queue, handlers, lease_seconds=settings['lease_seconds'], logger=logger)
+
+
+def work(settings, run_id=None, log_level="INFO"):
+    """Run one worker until the queue (or the given run) has nothing left"""
+    if multiprocessing.parent_process() is not None:
+        logging.basicConfig(level=log_level, format="%(asctime)s %(levelname)s %(processName)s %(name)s: %(message)s")
+    ledger = UsageLedger()
+    # Workers draw on one set of per-host limits, however many of them run
+    scout = SMEDigitalTransformationScout(rate_limiter=SharedHostRateLimiter())
+    worker = make_worker(scout, SQLiteWorkQueue(), settings, ledger)
+    stats = worker.run(run_id)
+    logger.info("Worker %s done: %s", worker.worker_id, stats)
+    for line in ledger.describe():
+        logger.info("Model usage - %s", line)
+    return stats
+
+
+def default_run_id(queries, settings):
+    """Same queries and options on the same day give the same run, so rerunning resumes it"""
+    digest = hashlib.sha1(json.dumps([queries, _task_options(settings)], sort_keys=True).encode('utf-8')).hexdigest()[:8]
+    return f"{datetime.now().strftime('%Y%m%d')}-{digest}"
+
+
+def _task_options(settings):
+    return {
+        'max_per_source': settings['max_per_source'],
+        'new_only': settings['new_only'],
+        'prefilter_threshold': settings['prefilter_threshold'],
+        'extract': {
+            'max_concurrency': settings['max_concurrency'],
+            'pack_articles': settings['pack_articles'],
+            'pack_token_budget': settings['pack_token_budget'],
+            'cascade': settings['cascade_options'],
+        },
+    }
+
+
+def _log_queue_progress(queue, run_id, reporter):
+    progress = queue.progress(run_id)
+    total = sum(sum(statuses.values()) for statuses in progress.values())
+    finished = sum(statuses.get(COMPLETED, 0) + statuses.get(FAILED, 0) for statuses in progress.values())
+    reporter.progress(finished / total if total else 1.0, " - ".join(
+        f"{kind}: " + ", ".join(f"{count} {status}" for status, count in sorted(statuses.items()))
+        for kind, statuses in sorted(progress.items())
+    ))
+    return progress
+
+
+def run_queued(settings, shard=(0, 1), workers=1, run_id=None, log_level="INFO", reporter=None):
+    """Queue a run's searches, drain the queue with local worker processes and export the results
+
+    With no local workers the run is only queued; workers started elsewhere
+    with --worker pick it up. Returns the ranked companies (None if only queued).
+    """
+    reporter = reporter or LoggingProgressReporter(logger)
+    scout = SMEDigitalTransformationScout()
+    queue = SQLiteWorkQueue()
+    queries = plan_queries(scout, settings, shard)
+    run_id = run_id or default_run_id(queries, settings)
+    options = _task_options(settings)
+    queued = queue.enqueue(run_id, SEARCH_TASK, [
+        (f"{source_name}:{term}", dict(options, term=term, source=source_name))
+        for term, source_name, _ in scout._search_tasks(queries)
+    ], max_attempts=settings['max_attempts'])
+    logger.info("Run %s: queued %d search tasks", run_id, queued)
+    if not workers:
+        return None
+
+    started = time.monotonic()
+    # Spawned, not forked: each worker opens its own connections and SQLite handles
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=work, args=(settings, run_id, log_level), name=f"worker-{i}")
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    while any(process.is_alive() for process in processes):
+        _log_queue_progress(queue, run_id, reporter)
+        for process in processes:
+            process.join(timeout=5 / len(processes))
+    progress = _log_queue_progress(queue, run_id, reporter)
+    if queue.unfinished(run_id):
+        logger.warning("Workers exited with %d tasks unfinished; rerun to resume run %s", queue.unfinished(run_id), run_id)
+
+    companies = scout.filter_and_rank_sme_companies([
+        company for companies in queue.results(run_id, EXTRACT_TASK) for company in companies
+    ])
+    write_output(companies, settings)
+    failed = sum(statuses.get(FAILED, 0) for statuses in progress.values())
+    logger.info("%d companies from %d articles in %.0fs (%d tasks failed), written to %s",
+                len(companies), progress.get(EXTRACT_TASK, {}).get(COMPLETED, 0), time.monotonic() - started,
+                failed, settings['output'])
+    return companies
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    try:
+        settings = resolve_settings(args)
+    except (OSError, ValueError) as e:
+        logger.error(str(e))
+        return 2
+    needs_key = args.worker or not args.queue or args.workers > 0
+    if needs_key and not os.environ.get(GROQ_API_KEY_ENV):
+        logger.error("Set %s to run the AI extraction", GROQ_API_KEY_ENV)
+        return 2
+    if args.worker:
+        work(settings, args.run_id)
+    elif args.queue:
+        run_queued(settings, args.shard, args.workers, args.run_id, args.log_level.upper())
+    else:
+        run(settings, args.shard)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
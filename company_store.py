@@ -0,0 +1,289 @@
+import numpy as np
+import pandas as pd
+
+from aggregates import COMPANY_DIMENSIONS, Aggregates
+from entity_resolution import CompanyResolver, merge_company_records
+from scoring import COMPONENT_COLUMNS
+
+# Low-cardinality fields are stored as integer codes into a category list
+CATEGORICAL_COLUMNS = (
+    'Industry', 'Revenue Range', 'Digital Transformation', 'Company Size', 'Growth Stage', 'Source', 'Confidence',
+)
+NUMERIC_COLUMNS = {
+    'SME Score': np.int64, 'Relevance Score': np.float64, 'Mentions': np.int64,
+    **{column: np.float64 for column in COMPONENT_COLUMNS.values()},
+}
+COLUMNS = (
+    'Company Name', 'Website', 'Industry', 'Revenue', 'Revenue Range', 'Employee Count', 'Digital Transformation',
+    'Transformation Details', 'Company Size', 'Growth Stage', 'SME Score', 'Source Link', 'Article Title', 'Source',
+    'Date', 'Confidence', 'Source Attribution', 'Relevance Score', 'Mentions', 'Name Variants', 'Source Links',
+    *COMPONENT_COLUMNS.values(),
+)
+
+
+class CompanyStore:
+    """Columnar table of resolved companies, kept ranked by relevance
+
+    Rows live in growable numpy column arrays (categorical fields as codes),
+    addressed through a primary-key index from resolved entity to row. An
+    upsert touches only the incoming rows: matches are merged in place and
+    the rank order is patched by binary search instead of a full re-sort.
+    The DataFrame and record views are rebuilt lazily, once per change;
+    the insight counts in `aggregates` are patched with each upsert.
+    """
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.size = 0
+        self.version = 0
+        self.columns = {}
+        self.categories = {}
+        self.category_codes = {}
+        self.resolver = CompanyResolver()
+        self.rows = {}
+        # Row positions best-first, with their negated scores for searchsorted
+        self.order = np.empty(0, dtype=np.int64)
+        self.ranked_keys = np.empty(0, dtype=np.float64)
+        self._frame = None
+        self._records = None
+        self._sort_indexes = {}
+        self.aggregates = Aggregates(COMPANY_DIMENSIONS)
+        for name in COLUMNS:
+            self._add_column(name)
+
+    def __len__(self):
+        return self.size
+
+    # Storage
+
+    def _empty_column(self, name, length):
+        if name in CATEGORICAL_COLUMNS:
+            return np.full(length, -1, dtype=np.int32)
+        if name in NUMERIC_COLUMNS:
+            return np.zeros(length, dtype=NUMERIC_COLUMNS[name])
+        return np.full(length, None, dtype=object)
+
+    def _add_column(self, name):
+        self.columns[name] = self._empty_column(name, self.capacity)
+        if name in CATEGORICAL_COLUMNS:
+            self.categories[name] = []
+            self.category_codes[name] = {}
+
+    def _grow(self, needed):
+        if needed <= self.capacity:
+            return
+        while self.capacity < needed:
+            self.capacity *= 2
+        for name, values in self.columns.items():
+            grown = self._empty_column(name, self.capacity)
+            grown[:len(values)] = values
+            self.columns[name] = grown
+
+    def _code(self, name, value):
+        if value is None:
+            return -1
+        value = str(value)
+        codes = self.category_codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self.categories[name])
+            self.categories[name].append(value)
+        return code
+
+    def _write(self, row, record):
+        for name, value in record.items():
+            if name not in self.columns:
+                self._add_column(name)
+            if name in self.categories:
+                self.columns[name][row] = self._code(name, value)
+            elif name in NUMERIC_COLUMNS:
+                self.columns[name][row] = value or 0
+            else:
+                self.columns[name][row] = value
+
+    def _read(self, row):
+        record = {}
+        for name, values in self.columns.items():
+            if name in self.categories:
+                code = values[row]
+                record[name] = self.categories[name][code] if code >= 0 else None
+            else:
+                value = values[row]
+                record[name] = value.item() if isinstance(value, np.generic) else value
+        return record
+
+    # Updates
+
+    def upsert(self, companies, score=None):
+        """Insert or merge company records; returns the number of new companies
+
+        Mentions resolving to an existing company are merged into it and,
+        when `score` is given, re-scored together with score(merged_records).
+        """
+        changed = {}
+        previous = {}
+        merged = []
+        added = 0
+        for company in companies:
+            entity = self.resolver.resolve(company['Company Name'])
+            row = self.rows.get(entity)
+            if row is None:
+                row = self.rows[entity] = self.size
+                self._grow(self.size + 1)
+                self.size += 1
+                added += 1
+                record = dict(company)
+                record.setdefault('Mentions', 1)
+                record.setdefault('Name Variants', [company['Company Name']])
+                record.setdefault('Source Links', [company.get('Source Link')] if company.get('Source Link') else [])
+            else:
+                # A company mentioned twice in one batch merges with the pending record
+                if row in changed:
+                    base = changed[row]
+                else:
+                    base = previous[row] = self._read(row)
+                record = merge_company_records(base, company)
+                merged.append(row)
+            changed[row] = record
+
+        if score:
+            score([changed[row] for row in dict.fromkeys(merged)])
+        for row, record in changed.items():
+            self._write(row, record)
+            if row in previous:
+                self.aggregates.replace(previous[row], record)
+            else:
+                self.aggregates.add(record)
+        if changed:
+            self._rerank(np.fromiter(changed, dtype=np.int64, count=len(changed)))
+            self._changed()
+        return added
+
+    def rescore(self, combine):
+        """Replace every Relevance Score with combine(numeric columns in row order) and re-rank"""
+        frame = pd.DataFrame({name: self.columns[name][:self.size] for name in NUMERIC_COLUMNS})
+        self.columns['Relevance Score'][:self.size] = combine(frame)
+        self.order = np.empty(0, dtype=np.int64)
+        self.ranked_keys = np.empty(0, dtype=np.float64)
+        self._rerank(np.arange(self.size, dtype=np.int64))
+        self._changed()
+
+    def _changed(self):
+        self.version += 1
+        self._frame = None
+        self._records = None
+        self._sort_indexes = {}
+
+    def _rerank(self, rows):
+        """Move changed rows to their place in the rank order by binary search"""
+        keep = ~np.isin(self.order, rows)
+        order, ranked_keys = self.order[keep], self.ranked_keys[keep]
+        keys = -self.columns['Relevance Score'][rows]
+        # Among the changed rows: best first, earlier rows first on ties
+        by_rank = np.lexsort((rows, keys))
+        rows, keys = rows[by_rank], keys[by_rank]
+        positions = np.searchsorted(ranked_keys, keys, side='right')
+        self.order = np.insert(order, positions, rows)
+        self.ranked_keys = np.insert(ranked_keys, positions, keys)
+
+    def clear(self):
+        self.__init__(self.capacity)
+
+    # Views
+
+    def row_for(self, name):
+        """Row of the company `name` resolves to, or None"""
+        entity = self.resolver.find(name)
+        return None if entity is None else self.rows.get(entity)
+
+    def get(self, name):
+        row = self.row_for(name)
+        return None if row is None else self._read(row)
+
+    def to_frame(self):
+        """Companies best-first as a DataFrame with categorical columns (cached per version)"""
+        if self._frame is None:
+            data = {}
+            for name, values in self.columns.items():
+                if name in self.categories:
+                    data[name] = pd.Categorical.from_codes(values[self.order], categories=self.categories[name])
+                else:
+                    data[name] = values[self.order]
+            self._frame = pd.DataFrame(data)
+        return self._frame
+
+    def records(self):
+        """Companies best-first as a list of dicts (cached per version)"""
+        if self._records is None:
+            self._records = [self._read(row) for row in self.order]
+        return self._records
+
+    def values(self, name):
+        """Distinct values present in a categorical column, sorted"""
+        return sorted(self.categories[name][code] for code in np.unique(self.columns[name][:self.size]) if code >= 0)
+
+    def _sort_index(self, name, ascending=True):
+        """Rows ordered by `name`, ties in rank order (cached per version)"""
+        cache_key = (name, ascending)
+        if cache_key not in self._sort_indexes:
+            rank = np.empty(self.size, dtype=np.int64)
+            rank[self.order] = np.arange(self.size)
+            values = self.columns[name][:self.size]
+            if name in self.categories:
+                # Codes are in insertion order; map them to alphabetical positions, missing last
+                labels = self.categories[name]
+                label_rank = np.empty(len(labels) + 1, dtype=np.int64)
+                label_rank[np.argsort([label.casefold() for label in labels], kind='stable')] = np.arange(len(labels))
+                label_rank[-1] = len(labels)
+                keys = label_rank[values]
+            elif name in NUMERIC_COLUMNS:
+                keys = values
+            else:
+                keys = np.unique([str(value or '').casefold() for value in values], return_inverse=True)[1]
+            self._sort_indexes[cache_key] = np.lexsort((rank, keys if ascending else -keys))
+        return self._sort_indexes[cache_key]
+
+    def _filter_mask(self, filters, min_score):
+        mask = np.ones(self.size, dtype=bool)
+        for name, accepted in (filters or {}).items():
+            if accepted:
+                codes = [self.category_codes[name][value] for value in accepted if value in self.category_codes[name]]
+                mask &= np.isin(self.columns[name][:self.size], codes)
+        if min_score is not None:
+            mask &= self.columns['Relevance Score'][:self.size] >= min_score
+        return mask
+
+    def count(self, filters=None, min_score=None):
+        """Number of companies matching `filters` and `min_score` (see page)"""
+        return int(self._filter_mask(filters, min_score).sum())
+
+    def page(self, filters=None, min_score=None, sort_by='Relevance Score', ascending=False, offset=0, limit=50,
+             columns=None):
+        """One page of matching companies as a DataFrame, plus the number of matches
+
+        `filters` maps categorical columns to accepted values. Filtering
+        compares integer codes and the sort orders are cached per version,
+        so only the rows on the page are ever materialised.
+        """
+        mask = self._filter_mask(filters, min_score)
+        if sort_by == 'Relevance Score':
+            # The rank order is already best-first
+            ordered = self.order[::-1] if ascending else self.order
+        else:
+            ordered = self._sort_index(sort_by, ascending)
+        matching = ordered[mask[ordered]]
+        rows = matching[offset:offset + limit]
+
+        data = {}
+        for name in self.columns if columns is None else columns:
+            values = self.columns[name]
+            if name in self.categories:
+                data[name] = pd.Categorical.from_codes(values[rows], categories=self.categories[name])
+            else:
+                data[name] = values[rows]
+        return pd.DataFrame(data), len(matching)
+
+    def iter_records(self):
+        """Companies best-first, one dict at a time, for exports too large to hold as a list"""
+        for row in self.order.copy():
+            yield self._read(row)
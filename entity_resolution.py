@@ -0,0 +1,262 @@
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from functools import lru_cache
+
+# Legal-form words dropped from the end of a name before comparing
+LEGAL_SUFFIXES = {
+    'pvt', 'private', 'ltd', 'limited', 'llp', 'llc', 'inc', 'incorporated', 'corp', 'corporation',
+    'co', 'company', 'plc', 'opc', 'pte', 'gmbh', 'ag', 'sa', 'bv',
+}
+# Legal forms of a private company; "X India Pvt Ltd" is the Indian arm of X
+PRIVATE_SUFFIXES = {'pvt', 'private', 'opc'}
+
+SIMILARITY_THRESHOLD = 0.9
+# Shorter tokens must match exactly: one letter apart is a different name
+MIN_FUZZY_TOKEN_LENGTH = 6
+# Cap on the entities compared per token so a very common word stays cheap
+MAX_BLOCK_SIZE = 200
+
+# Fields filled from a merged mention when the canonical record lacks them
+FILL_FIELDS = ('Website', 'Industry', 'Revenue', 'Revenue Range', 'Employee Count', 'Growth Stage')
+UNKNOWN_VALUES = {'', 'not specified', 'unknown', 'null', 'none', 'n/a', 'size unknown'}
+CONFIDENCE_RANK = {'low': 0, 'medium': 1, 'high': 2}
+
+_NAME_TOKEN_RE = re.compile(r'[^\W_]+')
+_PARENTHESES_RE = re.compile(r'\([^)]*\)')
+
+
+def normalize_company_name(name):
+    """Name tokens without case, punctuation, parentheses or trailing legal forms
+
+    "TEGA Industries Limited", "Tega Industries Ltd." and "Tega Industries
+    (India) Pvt. Ltd." all normalize to ('tega', 'industries'), as does
+    "Tega Industries India Pvt Ltd"; "Coal India Ltd" stays ('coal', 'india').
+    """
+    text = unicodedata.normalize('NFKC', str(name or '')).casefold().replace('&', ' and ')
+    tokens = _NAME_TOKEN_RE.findall(_PARENTHESES_RE.sub(' ', text))
+    if tokens[:2] == ['m', 's'] and len(tokens) > 2:  # "M/s ..."
+        del tokens[:2]
+    if tokens[:1] == ['the'] and len(tokens) > 1:
+        del tokens[0]
+    suffix_start = len(tokens)
+    while suffix_start > 1 and tokens[suffix_start - 1] in LEGAL_SUFFIXES:
+        suffix_start -= 1
+    # "India" names the subsidiary in "... India Pvt Ltd", but is part of the name in "Coal India Ltd"
+    if (suffix_start > 1 and tokens[suffix_start - 1] == 'india'
+            and PRIVATE_SUFFIXES.intersection(tokens[suffix_start:])):
+        suffix_start -= 1
+    return tuple(tokens[:suffix_start])
+
+
+def _digits(token):
+    return "".join(c for c in token if c.isdigit())
+
+
+def _length_bound(token, other):
+    """Upper bound of SequenceMatcher's ratio for two tokens, from their lengths alone"""
+    return 2 * min(len(token), len(other)) / (len(token) + len(other))
+
+
+@lru_cache(maxsize=1 << 16)
+def token_ratio(token, other):
+    """SequenceMatcher ratio of two tokens, 0.0 if their digits differ
+
+    Cached: the same vocabulary pairs ("technologies" / "industries") come
+    up for many names.
+    """
+    if _digits(token) != _digits(other):
+        # Numbers are identifying: "Unit 2" is not "Unit 3"
+        return 0.0
+    return SequenceMatcher(None, token, other, autojunk=False).ratio()
+
+
+def token_set_similarity(tokens_a, tokens_b, minimum=0.0):
+    """Fuzzy similarity in [0, 1] of two names' token sets, ignoring order and repeats
+
+    Shared tokens match exactly; each remaining token must have a close
+    counterpart (short tokens and digits must match exactly), and the weakest
+    such pair is the score. So a typo ("Industris") still matches, while
+    "ABC Textiles" / "ABD Textiles" or "Tata" / "Tata Steel" do not. Pairs that cannot reach `minimum` return
+    0.0 early.
+    """
+    set_a, set_b = set(tokens_a), set(tokens_b)
+    if not set_a or not set_b:
+        return 0.0
+    if set_a == set_b or "".join(tokens_a) == "".join(tokens_b):
+        return 1.0
+    rest_a, rest_b = sorted(set_a - set_b), sorted(set_b - set_a)
+    if len(rest_a) != len(rest_b):
+        return 0.0
+
+    score = 1.0
+    for token in rest_a:
+        best, best_ratio = None, 0.0
+        for other in rest_b:
+            if min(len(token), len(other)) < MIN_FUZZY_TOKEN_LENGTH:
+                continue
+            bound = _length_bound(token, other)
+            if bound <= best_ratio or bound < minimum:
+                continue
+            ratio = token_ratio(token, other)
+            if ratio > best_ratio:
+                best, best_ratio = other, ratio
+        score = min(score, best_ratio)
+        if best is None or score < minimum:
+            return 0.0
+        rest_b.remove(best)
+    return score
+
+
+def variant_keys(token):
+    """Keys of the vocabulary buckets searched for fuzzy variants of `token`
+
+    Close variants share the first or the last three letters (one typo
+    cannot change both), and always the same digits.
+    """
+    digits = _digits(token)
+    return (f"p:{token[:3]}:{digits}", f"s:{token[-3:]}:{digits}")
+
+
+def _is_unknown(value):
+    return str(value).strip().lower() in UNKNOWN_VALUES
+
+
+def _unique(values):
+    return list(dict.fromkeys(value for value in values if value))
+
+
+def merge_company_records(canonical, mention):
+    """Fold one mention's evidence into a canonical company record (returns a new dict)"""
+    merged = dict(canonical)
+    merged['Name Variants'] = _unique(
+        canonical.get('Name Variants', [canonical['Company Name']]) + mention.get('Name Variants', [mention['Company Name']])
+    )
+    merged['Source Links'] = _unique(
+        canonical.get('Source Links', [canonical.get('Source Link')]) + mention.get('Source Links', [mention.get('Source Link')])
+    )
+    # Counted by distinct source so re-analysing the same article adds nothing
+    merged['Mentions'] = max(len(merged['Source Links']), 1)
+
+    details = [part.strip() for part in str(canonical.get('Transformation Details', '')).split(';')]
+    known_details = {part.lower() for part in details}
+    for part in str(mention.get('Transformation Details', '')).split(';'):
+        if part.strip() and part.strip().lower() not in known_details:
+            details.append(part.strip())
+            known_details.add(part.strip().lower())
+    merged['Transformation Details'] = "; ".join(part for part in details if part)
+
+    for field in FILL_FIELDS:
+        if _is_unknown(merged.get(field, '')) and not _is_unknown(mention.get(field, '')):
+            merged[field] = mention[field]
+    if _is_unknown(merged.get('Company Size', '')) and not _is_unknown(mention.get('Company Size', '')):
+        merged['Company Size'] = mention['Company Size']
+    if mention.get('Digital Transformation') == 'Yes':
+        merged['Digital Transformation'] = 'Yes'
+    if CONFIDENCE_RANK.get(mention.get('Confidence'), 0) > CONFIDENCE_RANK.get(merged.get('Confidence'), 0):
+        merged['Confidence'] = mention['Confidence']
+    merged['SME Score'] = max(merged.get('SME Score', 0), mention.get('SME Score', 0))
+    return merged
+
+
+class CompanyResolver:
+    """Clusters company mentions into canonical entities
+
+    Names with the same token set, or the same letters once joined, are
+    matched through a dict. Other names are only compared against entities
+    holding the name's rarest token or a close variant of it, since a match
+    needs every token matched exactly or fuzzily. Variants are looked up in
+    a vocabulary of distinct tokens rather than among entities, so common
+    words like "Technologies" never make a name compare against most of
+    the entities, and resolution stays near-linear in the number of mentions.
+    """
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD, max_block_size=MAX_BLOCK_SIZE):
+        self.threshold = threshold
+        self.max_block_size = max_block_size
+        self.entity_tokens = []
+        self.entity_sets = []
+        self.exact = {}
+        self.postings = {}
+        self.vocabulary = {}
+
+    def __len__(self):
+        return len(self.entity_tokens)
+
+    def find(self, name):
+        """Entity index for `name`, or None if no known entity matches"""
+        return self._find(normalize_company_name(name))
+
+    def _variants(self, token):
+        """Known tokens close enough to `token` to match it fuzzily"""
+        if len(token) < MIN_FUZZY_TOKEN_LENGTH:
+            return set()
+        words = {word for key in variant_keys(token) for word in self.vocabulary.get(key, ())}
+        words.discard(token)
+        return {
+            word for word in words
+            if _length_bound(token, word) >= self.threshold and token_ratio(token, word) >= self.threshold
+        }
+
+    def _find(self, tokens):
+        if not tokens:
+            return None
+        token_set = frozenset(tokens)
+        match = self.exact.get(token_set, self.exact.get("".join(tokens)))
+        if match is not None:
+            return match
+
+        variants = {token: self._variants(token) for token in token_set}
+        rarest = min(token_set, key=lambda token: (len(self.postings.get(token, ())), token))
+        candidates = set()
+        for token in {rarest} | variants[rarest]:
+            candidates.update(self.postings.get(token, ())[-self.max_block_size:])
+        # A match pairs its tokens one to one with ours, each the same or a close variant
+        allowed = token_set.union(*variants.values())
+
+        best, best_score = None, self.threshold
+        for entity in sorted(candidates):
+            other = self.entity_sets[entity]
+            if len(other) != len(token_set) or not other <= allowed:
+                continue
+            score = token_set_similarity(tokens, self.entity_tokens[entity], minimum=best_score)
+            if score >= best_score:
+                best, best_score = entity, score
+        return best
+
+    def resolve(self, name):
+        """Entity index for `name`, registering a new entity when nothing matches"""
+        tokens = normalize_company_name(name)
+        entity = self._find(tokens)
+        if entity is None:
+            entity = len(self.entity_tokens)
+            self.entity_tokens.append(tokens)
+            self.entity_sets.append(frozenset(tokens))
+            for token in self.entity_sets[entity]:
+                if token not in self.postings:
+                    for key in variant_keys(token):
+                        self.vocabulary.setdefault(key, set()).add(token)
+                self.postings.setdefault(token, []).append(entity)
+        if tokens:
+            # Remember every spelling so repeats take the exact-match path
+            self.exact.setdefault(frozenset(tokens), entity)
+            self.exact.setdefault("".join(tokens), entity)
+        return entity
+
+
+def resolve_companies(companies, resolver=None):
+    """Merge mentions of the same company into one record each
+
+    The first mention of an entity becomes its canonical record, so pass
+    companies best-first; later mentions add their evidence to it. Order of
+    first appearance is preserved.
+    """
+    resolver = resolver or CompanyResolver()
+    records = {}
+    for company in companies:
+        entity = resolver.resolve(company['Company Name'])
+        if entity in records:
+            records[entity] = merge_company_records(records[entity], company)
+        else:
+            records[entity] = company
+    return list(records.values())
@@ -0,0 +1,184 @@
+import csv
+import io
+import os
+import tempfile
+from itertools import islice
+
+from storage import get_cache_dir
+
+# (column, default) in export order; defaults fill fields a record lacks
+COMPANY_EXPORT_COLUMNS = [
+    ('Company Name', ''), ('Website', ''), ('Industry', ''), ('Revenue', ''), ('Revenue Range', ''),
+    ('Employee Count', ''), ('Digital Transformation', ''), ('Transformation Details', ''), ('Company Size', ''),
+    ('Growth Stage', ''), ('Confidence', ''), ('Relevance Score', None), ('Source Link', ''), ('Article Title', ''),
+    ('Source', ''), ('Source Attribution', 'Direct Mention'),
+]
+JOB_EXPORT_COLUMNS = [
+    ('Company', ''), ('Job Title', ''), ('Platform', ''), ('Role Type', 'General'), ('Technology', ''),
+    ('Location', ''), ('Company Size', 'SME'), ('Industry', 'Various'), ('Link', ''), ('Date Found', ''),
+    ('Source Verified', 'Generated'), ('Description', ''),
+]
+# Written as numbers rather than text in Parquet and Excel
+NUMERIC_EXPORT_COLUMNS = {'Relevance Score', 'SME Score', 'Mentions'}
+
+# format: (label, mime type, file extension, module it needs or None)
+EXPORT_FORMATS = {
+    'csv': ("CSV", "text/csv", "csv", None),
+    'tsv': ("TSV", "text/tab-separated-values", "tsv", None),
+    'parquet': ("Parquet", "application/vnd.apache.parquet", "parquet", "pyarrow"),
+    'xlsx': ("Excel", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx", "openpyxl"),
+}
+EXCEL_MAX_ROWS = 1048576
+CHUNK_SIZE = 5000
+
+# Spreadsheet apps run cells starting with these as formulas
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def available_formats():
+    """Export formats whose optional dependencies are installed"""
+    formats = []
+    for fmt, (_, _, _, module) in EXPORT_FORMATS.items():
+        if module is None:
+            formats.append(fmt)
+            continue
+        try:
+            __import__(module)
+        except ImportError:
+            continue
+        formats.append(fmt)
+    return formats
+
+
+def _chunks(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _text(value):
+    return "" if value is None else str(value)
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _spreadsheet_safe(text):
+    """Quote text a spreadsheet would otherwise evaluate as a formula"""
+    return "'" + text if text.startswith(_FORMULA_PREFIXES) else text
+
+
+def _row_values(row, columns):
+    return [row.get(name, default) for name, default in columns]
+
+
+def _write_delimited(rows, columns, target, delimiter, chunk_size):
+    # The csv module quotes fields containing delimiters, quotes or newlines
+    text = io.TextIOWrapper(target, encoding='utf-8', newline='', write_through=True)
+    try:
+        writer = csv.writer(text, delimiter=delimiter)
+        writer.writerow([name for name, _ in columns])
+        for chunk in _chunks(rows, chunk_size):
+            writer.writerows(
+                [_text(value) if name in NUMERIC_EXPORT_COLUMNS else _spreadsheet_safe(_text(value))
+                 for (name, _), value in zip(columns, _row_values(row, columns))]
+                for row in chunk
+            )
+    finally:
+        text.detach()
+
+
+def _write_parquet(rows, columns, target, chunk_size):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        (name, pa.float64() if name in NUMERIC_EXPORT_COLUMNS else pa.string()) for name, _ in columns
+    ])
+    with pq.ParquetWriter(target, schema) as writer:
+        written = False
+        for chunk in _chunks(rows, chunk_size):
+            values = [_row_values(row, columns) for row in chunk]
+            writer.write_table(pa.table({
+                name: [(_number if name in NUMERIC_EXPORT_COLUMNS else _text)(row[i]) for row in values]
+                for i, (name, _) in enumerate(columns)
+            }, schema=schema))
+            written = True
+        if not written:
+            # An empty export still gets a row group, so readers see the columns
+            writer.write_table(schema.empty_table())
+
+
+def _write_excel(rows, columns, target, chunk_size):
+    from openpyxl import Workbook
+
+    # Write-only workbooks stream rows to disk instead of keeping cells in memory
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Export")
+    sheet.append([name for name, _ in columns])
+    written = 1
+    for chunk in _chunks(rows, chunk_size):
+        written += len(chunk)
+        if written > EXCEL_MAX_ROWS:
+            raise ValueError(f"Excel sheets hold at most {EXCEL_MAX_ROWS - 1} rows; export as CSV or Parquet instead")
+        for row in chunk:
+            sheet.append([
+                _number(value) if name in NUMERIC_EXPORT_COLUMNS else _spreadsheet_safe(_text(value))
+                for (name, _), value in zip(columns, _row_values(row, columns))
+            ])
+    workbook.save(target)
+
+
+def write_export(rows, columns, fmt, target, chunk_size=CHUNK_SIZE):
+    """Stream `rows` (dicts, any iterable) into the binary file `target` as `fmt`
+
+    Rows are consumed `chunk_size` at a time, so memory use does not grow
+    with the number of rows.
+    """
+    if fmt == 'csv':
+        _write_delimited(rows, columns, target, ',', chunk_size)
+    elif fmt == 'tsv':
+        _write_delimited(rows, columns, target, '\t', chunk_size)
+    elif fmt == 'parquet':
+        _write_parquet(rows, columns, target, chunk_size)
+    elif fmt == 'xlsx':
+        _write_excel(rows, columns, target, chunk_size)
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+
+def export_file(rows, columns, fmt, chunk_size=CHUNK_SIZE):
+    """Write an export to a file in the cache directory and return it open for reading
+
+    The file is unlinked once opened, so it disappears when the reader is
+    closed (or garbage collected).
+    """
+    with tempfile.NamedTemporaryFile(dir=get_cache_dir(), suffix=f".{EXPORT_FORMATS[fmt][2]}", delete=False) as target:
+        path = target.name
+        try:
+            write_export(rows, columns, fmt, target, chunk_size)
+        except BaseException:
+            target.close()
+            os.unlink(path)
+            raise
+    reader = open(path, 'rb')
+    try:
+        os.unlink(path)
+    except OSError:
+        # Windows cannot remove open files; the cache directory keeps it
+        pass
+    return reader
+
+
+def export_text(rows, columns, fmt='tsv'):
+    """An export of a few rows as a string, for on-screen previews"""
+    target = io.BytesIO()
+    write_export(rows, columns, fmt, target)
+    return target.getvalue().decode('utf-8')
@@ -0,0 +1,94 @@
+import hashlib
+import json
+import threading
+import time
+
+from storage import SQLiteStore
+
+
+def prompt_version(*prompts, version=""):
+    """Fingerprint of the extraction prompts; changes whenever their text or `version` does"""
+    digest = hashlib.sha256(version.encode('utf-8'))
+    for prompt in prompts:
+        digest.update(b"\0" + prompt.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+class ExtractionCache(SQLiteStore):
+    """Content-addressed store of parsed LLM extractions
+
+    Entries are keyed by a hash of (article content, prompt version, model,
+    temperature), so any change to the prompt or model misses the old entries.
+    """
+
+    FILENAME = "extractions.db"
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS extractions (
+        key TEXT PRIMARY KEY,
+        prompt_version TEXT NOT NULL,
+        model TEXT NOT NULL,
+        companies TEXT NOT NULL,
+        tokens INTEGER NOT NULL DEFAULT 0,
+        created_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_extractions_version ON extractions (prompt_version);
+    """
+
+    def __init__(self, path=None):
+        super().__init__(path)
+        self.stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.tokens_saved = 0
+
+    @staticmethod
+    def make_key(content, prompt_version, model, temperature):
+        payload = json.dumps([content, prompt_version, model, float(temperature)])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get_many(self, keys, counter=None):
+        """Return {key: companies} for cached keys and update hit/miss counters per key given
+
+        The counts also go to `counter` (a storage.CacheCounter) for per-run reporting.
+        """
+        keys = list(keys)
+        found = {}
+        entry_tokens = {}
+        unique_keys = list(dict.fromkeys(keys))
+        for start in range(0, len(unique_keys), 500):
+            chunk = unique_keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for key, companies, tokens in self.query(
+                    f"SELECT key, companies, tokens FROM extractions WHERE key IN ({placeholders})", chunk):
+                found[key] = json.loads(companies)
+                entry_tokens[key] = tokens
+        hit_keys = [key for key in keys if key in found]
+        with self.stats_lock:
+            self.hits += len(hit_keys)
+            self.misses += len(keys) - len(hit_keys)
+            self.tokens_saved += sum(entry_tokens[key] for key in hit_keys)
+        if counter is not None:
+            counter.record(len(hit_keys), len(keys) - len(hit_keys), sum(entry_tokens[key] for key in hit_keys))
+        return found
+
+    def put(self, key, companies, prompt_version, model, tokens=0):
+        self.execute(
+            "INSERT OR REPLACE INTO extractions (key, prompt_version, model, companies, tokens, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, prompt_version, model, json.dumps(companies), int(tokens or 0), time.time())
+        )
+
+    def invalidate(self, keep_prompt_version=None):
+        """Delete cached extractions, optionally keeping those made with `keep_prompt_version`"""
+        if keep_prompt_version is None:
+            return self.execute("DELETE FROM extractions").rowcount
+        return self.execute("DELETE FROM extractions WHERE prompt_version != ?", (keep_prompt_version,)).rowcount
+
+    def entry_count(self, prompt_version=None):
+        if prompt_version is None:
+            return self.query("SELECT COUNT(*) FROM extractions")[0][0]
+        return self.query("SELECT COUNT(*) FROM extractions WHERE prompt_version = ?", (prompt_version,))[0][0]
+
+    def stats(self):
+        with self.stats_lock:
+            return {'hits': self.hits, 'misses': self.misses, 'tokens_saved': self.tokens_saved}
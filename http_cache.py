@@ -0,0 +1,170 @@
+import json
+import threading
+import time
+import urllib.parse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from storage import SQLiteStore
+
+
+def normalize_request_key(method, url, params=None, data=None):
+    """Build a stable cache key from the method, URL and query/form parameters"""
+    parts = urllib.parse.urlsplit(url)
+    query = urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+    if isinstance(params, dict):
+        query.extend(params.items())
+    elif params:
+        query.extend(params)
+    
+    body = ""
+    if isinstance(data, dict):
+        body = urllib.parse.urlencode(sorted((str(k), str(v)) for k, v in data.items()))
+    elif isinstance(data, (bytes, str)):
+        body = data.decode('utf-8', 'replace') if isinstance(data, bytes) else data
+    
+    normalized_url = urllib.parse.urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path or "/",
+        urllib.parse.urlencode(sorted((str(k), str(v)) for k, v in query)),
+        ""
+    ))
+    return f"{method.upper()} {normalized_url} {body}"
+
+
+class ResponseCache(SQLiteStore):
+    """SQLite store of HTTP responses with TTL checks and size-bounded LRU eviction"""
+
+    FILENAME = "http_cache.db"
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS responses (
+        key TEXT PRIMARY KEY,
+        url TEXT NOT NULL,
+        status_code INTEGER NOT NULL,
+        headers TEXT NOT NULL,
+        content BLOB NOT NULL,
+        size INTEGER NOT NULL,
+        created_at REAL NOT NULL,
+        accessed_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at);
+    """
+
+    def __init__(self, path=None, max_bytes=200 * 1024 * 1024):
+        super().__init__(path)
+        self.max_bytes = max_bytes
+
+    def get(self, key, ttl):
+        """Return a cached requests.Response younger than `ttl` seconds, or None"""
+        rows = self.query("SELECT url, status_code, headers, content, created_at FROM responses WHERE key = ?", (key,))
+        if not rows:
+            return None
+        url, status_code, headers, content, created_at = rows[0]
+        now = time.time()
+        if now - created_at > ttl:
+            self.execute("DELETE FROM responses WHERE key = ?", (key,))
+            return None
+        self.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers = CaseInsensitiveDict(json.loads(headers))
+        response._content = content
+        response.url = url
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.from_cache = True
+        return response
+
+    def set(self, key, response):
+        now = time.time()
+        content = response.content
+        self.execute(
+            "INSERT OR REPLACE INTO responses (key, url, status_code, headers, content, size, created_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, response.url, response.status_code, json.dumps(dict(response.headers)), content, len(content), now, now)
+        )
+        self.evict()
+
+    def evict(self):
+        """Drop least recently used responses until the cache fits in max_bytes"""
+        with self.lock:
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            rows = self.conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+            stale_keys = []
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                stale_keys.append((key,))
+                total -= size
+            self.conn.executemany("DELETE FROM responses WHERE key = ?", stale_keys)
+            self.conn.commit()
+
+    def clear(self):
+        self.execute("DELETE FROM responses")
+
+    def size_bytes(self):
+        return self.query("SELECT COALESCE(SUM(size), 0) FROM responses")[0][0]
+
+
+class CachedSession(requests.Session):
+    """requests.Session that serves repeat GET/POST calls to configured hosts from the response cache
+
+    With a `rate_limiter`, cacheable calls wait for a slot on their host only
+    when they miss the cache and go to the network; other calls are
+    throttled by their callers.
+    """
+
+    # Seconds a cached response stays fresh, per host
+    DEFAULT_TTLS = {
+        "news.google.com": 30 * 60,
+        "html.duckduckgo.com": 60 * 60,
+    }
+
+    def __init__(self, ttls=None, cache=None, rate_limiter=None):
+        super().__init__()
+        self.ttls = dict(self.DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.cache = cache or ResponseCache()
+        self.rate_limiter = rate_limiter
+        self.stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _ttl_for(self, method, url, kwargs):
+        if method.upper() not in ("GET", "POST") or kwargs.get('stream'):
+            return None
+        return self.ttls.get(urllib.parse.urlsplit(url).hostname or "")
+
+    def request(self, method, url, params=None, data=None, cache_counter=None, **kwargs):
+        """Like requests.Session.request; a cacheable call's hit or miss is also added to `cache_counter`"""
+        ttl = self._ttl_for(method, url, kwargs)
+        if not ttl:
+            return super().request(method, url, params=params, data=data, **kwargs)
+        
+        key = normalize_request_key(method, url, params, data if data is not None else kwargs.get('json'))
+        cached = self.cache.get(key, ttl)
+        with self.stats_lock:
+            if cached is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if cache_counter is not None:
+            cache_counter.record(hits=int(cached is not None), misses=int(cached is None))
+        if cached is not None:
+            return cached
+        
+        if self.rate_limiter:
+            self.rate_limiter.acquire(url)
+        response = super().request(method, url, params=params, data=data, **kwargs)
+        if response.status_code == 200:
+            self.cache.set(key, response)
+        return response
+
+    def cache_stats(self):
+        with self.stats_lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size_bytes': self.cache.size_bytes()}
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import time
+
+from storage import SQLiteStore
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+
+def article_key(article):
+    """Stable identity of an article within an extraction job"""
+    link = article.get('direct_link', article.get('link', ''))
+    return hashlib.sha256(f"{link}\0{article.get('content', '')}".encode('utf-8')).hexdigest()
+
+
+class JobRunningError(RuntimeError):
+    """Raised when a job is started while a runner in this process is still working on it"""
+
+
+class ExtractionJobStore(SQLiteStore):
+    """Checkpoints extraction runs article by article so interrupted runs can resume
+
+    A job's ID is derived from the articles it covers, so starting the same
+    analysis again picks up the existing job instead of redoing finished work.
+    Each job remembers the session that last ran it (`owner`). Jobs a runner
+    in this process is working on are kept in `active` so no other session
+    resumes or discards them mid-run.
+    """
+
+    FILENAME = "jobs.db"
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS jobs (
+        job_id TEXT PRIMARY KEY,
+        status TEXT NOT NULL,
+        owner TEXT,
+        total INTEGER NOT NULL,
+        params TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        updated_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS job_items (
+        job_id TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        article TEXT NOT NULL,
+        state TEXT NOT NULL,
+        result TEXT,
+        error TEXT,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        updated_at REAL NOT NULL,
+        PRIMARY KEY (job_id, position)
+    );
+    CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, updated_at);
+    """
+
+    def __init__(self, path=None):
+        super().__init__(path)
+        self.active = set()
+        with self.lock:
+            # Job stores created before jobs had owners
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(jobs)")}
+            if 'owner' not in columns:
+                self.conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+                self.conn.commit()
+
+    def create_or_resume(self, articles, params=None, owner=None):
+        """Return the job ID for these articles, creating the job on first use
+
+        The job counts as active until `release` is called; starting it again
+        meanwhile raises JobRunningError.
+        """
+        digest = hashlib.sha256()
+        for article in articles:
+            digest.update(article_key(article).encode('ascii'))
+        job_id = digest.hexdigest()[:20]
+        now = time.time()
+        with self.lock:
+            if job_id in self.active:
+                raise JobRunningError("This analysis is already running in another session")
+            exists = self.conn.execute("SELECT 1 FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if exists:
+                self.conn.execute(
+                    "UPDATE jobs SET status = 'running', owner = ?, updated_at = ? WHERE job_id = ?", (owner, now, job_id)
+                )
+            else:
+                self.conn.execute(
+                    "INSERT INTO jobs (job_id, status, owner, total, params, created_at, updated_at) "
+                    "VALUES (?, 'running', ?, ?, ?, ?, ?)",
+                    (job_id, owner, len(articles), json.dumps(params or {}), now, now)
+                )
+                self.conn.executemany(
+                    "INSERT INTO job_items (job_id, position, article, state, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    [(job_id, i, json.dumps(article), PENDING, now) for i, article in enumerate(articles)]
+                )
+            self.conn.commit()
+            self.active.add(job_id)
+        return job_id
+
+    def release(self, job_id):
+        """Mark the job's runner as gone, whether it finished or not"""
+        with self.lock:
+            self.active.discard(job_id)
+
+    def is_active(self, job_id):
+        with self.lock:
+            return job_id in self.active
+
+    def pending_positions(self, job_id):
+        """Positions still to extract: never attempted or failed last time"""
+        rows = self.query(
+            "SELECT position FROM job_items WHERE job_id = ? AND state != ? ORDER BY position", (job_id, DONE)
+        )
+        return [row[0] for row in rows]
+
+    def record(self, job_id, position, rows=None, error=None):
+        """Checkpoint one article's outcome as soon as it is known"""
+        now = time.time()
+        state = FAILED if error is not None else DONE
+        with self.lock:
+            self.conn.execute(
+                "UPDATE job_items SET state = ?, result = ?, error = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE job_id = ? AND position = ?",
+                (state, json.dumps(rows or []), None if error is None else str(error), now, job_id, position)
+            )
+            self.conn.execute("UPDATE jobs SET updated_at = ? WHERE job_id = ?", (now, job_id))
+            self.conn.commit()
+
+    def finish(self, job_id):
+        """Mark the job completed if every article is done; returns whether it was"""
+        if self.pending_positions(job_id):
+            self.execute("UPDATE jobs SET status = 'interrupted', updated_at = ? WHERE job_id = ?", (time.time(), job_id))
+            return False
+        self.execute("UPDATE jobs SET status = 'completed', updated_at = ? WHERE job_id = ?", (time.time(), job_id))
+        return True
+
+    def results(self, job_id):
+        """All company rows extracted so far, in article order"""
+        rows = self.query(
+            "SELECT result FROM job_items WHERE job_id = ? AND state = ? ORDER BY position", (job_id, DONE)
+        )
+        return [company for (result,) in rows for company in json.loads(result)]
+
+    def progress(self, job_id):
+        counts = dict(self.query("SELECT state, COUNT(*) FROM job_items WHERE job_id = ? GROUP BY state", (job_id,)))
+        return {state: counts.get(state, 0) for state in (PENDING, DONE, FAILED)}
+
+    def job_articles(self, job_id):
+        rows = self.query("SELECT article FROM job_items WHERE job_id = ? ORDER BY position", (job_id,))
+        return [json.loads(article) for (article,) in rows]
+
+    def latest_unfinished(self, owner=None):
+        """Most recently touched job of `owner` that still has articles left, or None
+
+        Jobs from before owners were recorded match any owner; jobs a runner
+        is still working on never match.
+        """
+        with self.lock:
+            active = list(self.active)
+            placeholders = ",".join("?" * len(active))
+            active_clause = f" AND job_id NOT IN ({placeholders})" if active else ""
+            rows = self.conn.execute(
+                "SELECT job_id, total, params FROM jobs WHERE status != 'completed' AND (owner = ? OR owner IS NULL)"
+                f"{active_clause} ORDER BY updated_at DESC LIMIT 1",
+                (owner, *active)
+            ).fetchall()
+        if not rows:
+            return None
+        job_id, total, params = rows[0]
+        return {'job_id': job_id, 'total': total, 'params': json.loads(params), 'progress': self.progress(job_id)}
+
+    def discard(self, job_id):
+        """Delete a job and its checkpoints; returns False (and keeps it) while it is running"""
+        with self.lock:
+            if job_id in self.active:
+                return False
+            self.conn.execute("DELETE FROM job_items WHERE job_id = ?", (job_id,))
+            self.conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+            self.conn.commit()
+            return True
@@ -0,0 +1,72 @@
+import re
+from collections import Counter
+from functools import lru_cache
+
+import pandas as pd
+
+
+class KeywordMatcher:
+    """Finds whole-word occurrences of a vocabulary in one regex pass
+
+    All terms are compiled into a single case-insensitive alternation
+    (longest first) bounded by non-word characters, so 'AI' does not match
+    inside 'maintain' and 'Robotic Process Automation' wins over
+    'Automation' where both apply. Hits are reported as the vocabulary's
+    own spelling of the term.
+    """
+
+    def __init__(self, terms):
+        self.terms = list(dict.fromkeys(terms))
+        self.canonical = {}
+        for term in self.terms:
+            self.canonical.setdefault(term.casefold(), term)
+        alternation = "|".join(re.escape(term) for term in sorted(self.canonical, key=len, reverse=True))
+        self.pattern = re.compile(rf'(?<!\w)(?:{alternation})(?!\w)', re.IGNORECASE) if self.canonical else None
+
+    def findall(self, text):
+        """Every occurrence, in order, as canonical terms"""
+        if self.pattern is None or not text:
+            return []
+        return [self.canonical[match.casefold()] for match in self.pattern.findall(text)]
+
+    def hits(self, text):
+        """Distinct terms found in `text`"""
+        return set(self.findall(text))
+
+    def contains(self, text):
+        return bool(self.pattern is not None and text and self.pattern.search(text))
+
+    # Vectorized forms for pandas string columns
+
+    def contains_series(self, texts):
+        """Boolean Series: does each text mention any term"""
+        if self.pattern is None:
+            return pd.Series(False, index=texts.index)
+        return texts.fillna('').astype(str).str.contains(self.pattern)
+
+    def distinct_counts(self, texts):
+        """Number of distinct terms in each text, as a Series"""
+        if self.pattern is None:
+            return pd.Series(0, index=texts.index)
+        return texts.fillna('').astype(str).str.findall(self.pattern).map(
+            lambda found: len({match.casefold() for match in found})
+        )
+
+    def document_counts(self, texts):
+        """Counter of how many texts mention each term"""
+        counts = Counter()
+        if self.pattern is None:
+            return counts
+        for found in texts.fillna('').astype(str).str.findall(self.pattern):
+            counts.update({self.canonical[match.casefold()] for match in found})
+        return counts
+
+
+@lru_cache(maxsize=64)
+def _cached_matcher(terms):
+    return KeywordMatcher(terms)
+
+
+def get_matcher(terms):
+    """Shared matcher for a vocabulary, compiled once per process"""
+    return _cached_matcher(tuple(terms))
@@ -0,0 +1,200 @@
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+_DURATION_PART_RE = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+
+
+def parse_duration(value):
+    """Parse rate-limit reset values such as '7.66s', '2m59.56s', '120ms' or '3' into seconds"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART_RE.findall(value)
+    if not parts:
+        return None
+    multipliers = {'h': 3600.0, 'm': 60.0, 's': 1.0, 'ms': 0.001}
+    return sum(float(number) * multipliers[unit] for number, unit in parts)
+
+
+def _header(headers, name):
+    if not headers:
+        return None
+    return headers.get(name)
+
+
+def _int_header(headers, name):
+    try:
+        return int(float(_header(headers, name)))
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency control driven by the API's rate-limit signals
+
+    The in-flight limit grows by one after a full window of clean successes and
+    halves on every 429. When the remaining request or token quota cannot cover
+    the requests in flight, new work pauses until the quota resets.
+    """
+
+    def __init__(self, max_concurrency=8, initial_concurrency=2, min_concurrency=1):
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.limit = max(self.min_concurrency, min(initial_concurrency, self.max_concurrency))
+        self.in_flight = 0
+        self.successes_since_change = 0
+        self.paused_until = 0.0
+        self.avg_tokens_per_request = None
+        self.condition = threading.Condition()
+        self.throttled = 0
+        self.peak_limit = self.limit
+
+    def acquire(self):
+        with self.condition:
+            while True:
+                wait = self.paused_until - time.monotonic()
+                if wait <= 0 and self.in_flight < self.limit:
+                    self.in_flight += 1
+                    return
+                self.condition.wait(timeout=wait if wait > 0 else None)
+
+    def release(self):
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def _pause(self, seconds):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def on_success(self, headers=None, tokens_used=None):
+        with self.condition:
+            if tokens_used:
+                if self.avg_tokens_per_request is None:
+                    self.avg_tokens_per_request = float(tokens_used)
+                else:
+                    self.avg_tokens_per_request = 0.8 * self.avg_tokens_per_request + 0.2 * tokens_used
+
+            # Stay within the remaining quota instead of running into 429s
+            remaining_requests = _int_header(headers, 'x-ratelimit-remaining-requests')
+            remaining_tokens = _int_header(headers, 'x-ratelimit-remaining-tokens')
+            quota_low = False
+            if remaining_requests is not None and remaining_requests <= self.in_flight:
+                self._pause(parse_duration(_header(headers, 'x-ratelimit-reset-requests')) or 1.0)
+                quota_low = True
+            if (remaining_tokens is not None and self.avg_tokens_per_request
+                    and remaining_tokens < self.avg_tokens_per_request * max(self.in_flight, 1)):
+                self._pause(parse_duration(_header(headers, 'x-ratelimit-reset-tokens')) or 1.0)
+                quota_low = True
+
+            if quota_low:
+                self.successes_since_change = 0
+            else:
+                self.successes_since_change += 1
+                if self.successes_since_change >= self.limit and self.limit < self.max_concurrency:
+                    self.limit += 1
+                    self.peak_limit = max(self.peak_limit, self.limit)
+                    self.successes_since_change = 0
+            self.condition.notify_all()
+
+    def on_rate_limited(self, retry_after=None):
+        with self.condition:
+            self.throttled += 1
+            self.limit = max(self.min_concurrency, self.limit // 2)
+            self.successes_since_change = 0
+            if retry_after:
+                self._pause(retry_after)
+            self.condition.notify_all()
+
+
+class RetryableError(Exception):
+    """Raised by a task to request a retry with backoff"""
+
+
+class ExtractionExecutor:
+    """Runs LLM calls with bounded, adaptive concurrency and jittered exponential backoff
+
+    `call(item)` must return `(result, headers, tokens_used)`; headers and
+    tokens_used may be None. Errors carrying a 429 status are retried after
+    the server's retry-after (or backoff); 5xx, timeouts and connection errors
+    are retried with backoff; anything else fails the item.
+    """
+
+    def __init__(self, call, max_concurrency=8, initial_concurrency=2, max_retries=5,
+                 base_delay=1.0, max_delay=60.0):
+        self.call = call
+        self.limiter = AdaptiveConcurrencyLimiter(max_concurrency, initial_concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+        self.stats_lock = threading.Lock()
+
+    def _backoff(self, attempt):
+        # Full jitter keeps concurrent workers from retrying in lockstep
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _classify(self, error):
+        """Return (retryable, is_rate_limit, retry_after) for an exception"""
+        if isinstance(error, RetryableError):
+            return True, False, None
+        status = getattr(error, 'status_code', None)
+        response = getattr(error, 'response', None)
+        headers = getattr(response, 'headers', None)
+        if status == 429:
+            return True, True, parse_duration(_header(headers, 'retry-after'))
+        if status is not None:
+            return status >= 500, False, None
+        # Timeouts and connection failures carry no status code
+        name = type(error).__name__.lower()
+        return ('timeout' in name or 'connection' in name), False, None
+
+    def execute(self, item):
+        """Run one item in the caller's thread, with the shared limiter and retries"""
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            try:
+                result, headers, tokens_used = self.call(item)
+            except Exception as e:
+                self.limiter.release()
+                retryable, is_rate_limit, retry_after = self._classify(e)
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                if is_rate_limit:
+                    self.limiter.on_rate_limited(retry_after)
+                with self.stats_lock:
+                    self.retries += 1
+                time.sleep(retry_after if retry_after else self._backoff(attempt))
+                attempt += 1
+                continue
+            self.limiter.release()
+            self.limiter.on_success(headers, tokens_used)
+            return result
+
+    def run(self, items):
+        """Yield (index, result, error) for each item as it completes"""
+        items = list(items)
+        if not items:
+            return
+        with ThreadPoolExecutor(max_workers=self.limiter.max_concurrency) as executor:
+            futures = {executor.submit(self.execute, item): i for i, item in enumerate(items)}
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result(), None
+                except Exception as e:
+                    yield futures[future], None, e
+
+    def stats(self):
+        return {
+            'retries': self.retries,
+            'throttled': self.limiter.throttled,
+            'concurrency': self.limiter.limit,
+            'peak_concurrency': self.limiter.peak_limit,
+        }
@@ -0,0 +1,97 @@
+import threading
+
+from keyword_matcher import get_matcher
+from relevance_prefilter import COMPANY_CUES
+
+# Groq's small model for the first tier; HEURISTIC_TIER uses no model at all
+TRIAGE_MODEL = "llama-3.1-8b-instant"
+HEURISTIC_TIER = "heuristic"
+
+# Tier names in the usage ledger
+TRIAGE_TIER = "triage"
+LARGE_TIER = "large"
+
+# Routes an article can take through the cascade
+SETTLED_BY_TRIAGE = "settled"
+ESCALATED = "escalated"
+SENT_TO_LARGE = "rich"
+
+
+class CascadePolicy:
+    """Routing thresholds of the two-tier extraction cascade
+
+    Rich articles (longer than `rich_chars`) go straight to the large model.
+    The rest are read by the triage tier first; its answer is kept when it
+    finds no company, or at most `max_simple_companies` companies all with a
+    confidence in `accept_confidence`. Anything else escalates to the large
+    model.
+
+    With the heuristic tier no model is called in the first tier: articles
+    without company cues and with a keyword score below `no_company_score`
+    are settled as naming no company, the rest escalate.
+    """
+
+    def __init__(self, triage_model=TRIAGE_MODEL, rich_chars=1500, max_simple_companies=2,
+                 accept_confidence=('high',), no_company_score=0.35):
+        self.triage_model = triage_model
+        self.rich_chars = rich_chars
+        self.max_simple_companies = max_simple_companies
+        self.accept_confidence = tuple(accept_confidence)
+        self.no_company_score = no_company_score
+
+    @property
+    def heuristic(self):
+        return self.triage_model in (None, HEURISTIC_TIER)
+
+    @property
+    def model_name(self):
+        """What the first tier records as the model of its answers"""
+        return HEURISTIC_TIER if self.heuristic else self.triage_model
+
+    def fingerprint(self):
+        """Identifies the thresholds, so cached cascade results do not outlive a change to them"""
+        return (f"{self.model_name}|{self.rich_chars}|{self.max_simple_companies}|"
+                f"{','.join(sorted(self.accept_confidence))}|{self.no_company_score}")
+
+    def is_rich(self, article):
+        return len(article.get('content') or '') > self.rich_chars
+
+    def accepts(self, companies):
+        """Whether a triage-tier answer is simple enough to keep"""
+        return len(companies) <= self.max_simple_companies and all(
+            str(company.get('confidence_score', '')).lower() in self.accept_confidence for company in companies
+        )
+
+    def heuristic_settles(self, texts, prefilter):
+        """Per text: True when it can be settled as naming no company without a model"""
+        if not texts:
+            return []
+        cues = get_matcher(COMPANY_CUES)
+        scores = prefilter.keyword_scores(texts)
+        return [not cues.contains(text) and score < self.no_company_score for text, score in zip(texts, scores)]
+
+
+class CascadeStats:
+    """How many articles took each route through the cascade
+
+    Tokens and latencies per tier are kept by prompt_budget.UsageLedger.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {SETTLED_BY_TRIAGE: 0, ESCALATED: 0, SENT_TO_LARGE: 0}
+
+    def record_routes(self, route, count):
+        with self.lock:
+            self.routes[route] += count
+
+    def metrics(self):
+        """Labelled headline numbers for a progress reporter"""
+        with self.lock:
+            routes = dict(self.routes)
+        if not any(routes.values()):
+            return {}
+        return {
+            "Settled by Triage": routes[SETTLED_BY_TRIAGE],
+            "Escalated": routes[ESCALATED] + routes[SENT_TO_LARGE],
+        }
@@ -0,0 +1,254 @@
+import re
+import threading
+import zlib
+
+import numpy as np
+
+# MinHash / LSH settings: 12 bands x 3 rows makes pairs above ~0.45 Jaccard
+# likely candidates, which are then verified against SIMILARITY_THRESHOLD
+NUM_PERM = 36
+NUM_BANDS = 12
+SHINGLE_SIZE = 3
+SIMILARITY_THRESHOLD = 0.6
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+_SHINGLE_MULTIPLIER = np.uint64(1000003)
+_BAND_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+_EMPTY_SIGNATURE = np.uint32(0xFFFFFFFF)
+
+
+def shingle_hashes(texts, size=SHINGLE_SIZE):
+    """Hash the word shingles of every text to 32-bit integers
+
+    Returns (hashes, counts): one flat array of shingle hashes for the whole
+    corpus and the number of shingles belonging to each text. Tokens are hashed
+    once per distinct word and shingles are combined with vectorized arithmetic.
+    """
+    all_tokens = []
+    lengths = []
+    for text in texts:
+        tokens = _TOKEN_RE.findall(text.lower())
+        all_tokens.extend(tokens)
+        lengths.append(len(tokens))
+    token_cache = {token: zlib.crc32(token.encode('utf-8')) for token in set(all_tokens)}
+    token_hashes = np.fromiter(map(token_cache.__getitem__, all_tokens), dtype=np.uint64, count=len(all_tokens))
+
+    lengths = np.array(lengths, dtype=np.int64)
+    # Pad every text with size - 1 zero tokens so windows never cross texts
+    padded_lengths = lengths + size - 1
+    padded_starts = np.cumsum(padded_lengths) - padded_lengths
+    token_starts = np.cumsum(lengths) - lengths
+    values = np.zeros(int(padded_lengths.sum()), dtype=np.uint64)
+    if len(token_hashes):
+        positions = np.arange(len(token_hashes)) - np.repeat(token_starts, lengths)
+        values[np.repeat(padded_starts, lengths) + positions] = token_hashes
+
+    # A text shorter than `size` still yields one (zero-padded) shingle
+    counts = np.where(lengths == 0, 0, np.maximum(lengths - size + 1, 1))
+    shingle_starts = np.cumsum(counts) - counts
+    windows = np.repeat(padded_starts, counts) + (np.arange(int(counts.sum())) - np.repeat(shingle_starts, counts))
+    hashes = np.zeros(len(windows), dtype=np.uint64)
+    for offset in range(size):
+        hashes = (hashes * _SHINGLE_MULTIPLIER + values[windows + offset]) & np.uint64(0xFFFFFFFF)
+
+    return hashes, counts
+
+
+class MinHasher:
+    """Computes MinHash signatures for many documents at once with numpy"""
+
+    def __init__(self, num_perm=NUM_PERM, seed=42):
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing: (a * x + b) mod 2^64, keeping the high 32 bits
+        self.a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self.b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+        self.num_perm = num_perm
+
+    def signatures(self, hashes, counts, chunk_size=4096):
+        """Return an (n_docs, num_perm) uint32 signature matrix; empty documents get all-max rows"""
+        signatures = np.full((len(counts), self.num_perm), _EMPTY_SIGNATURE, dtype=np.uint32)
+        if not len(hashes):
+            return signatures
+
+        doc_ids = np.flatnonzero(counts)
+        doc_ends = np.cumsum(counts[doc_ids])
+        doc_starts = doc_ends - counts[doc_ids]
+        # Permute about chunk_size shingles (whole documents) at a time, so the
+        # (shingles x num_perm) temporaries stay in cache and are reduced right away
+        first = 0
+        with np.errstate(over='ignore'):
+            while first < len(doc_ids):
+                last = max(first + 1, int(np.searchsorted(doc_ends, doc_starts[first] + chunk_size, side='right')))
+                start, end = doc_starts[first], doc_ends[last - 1]
+                permuted = ((hashes[start:end, None] * self.a + self.b) >> np.uint64(32)).astype(np.uint32)
+                signatures[doc_ids[first:last]] = np.minimum.reduceat(permuted, doc_starts[first:last] - start, axis=0)
+                first = last
+        return signatures
+
+
+def _band_keys(signatures, num_bands=NUM_BANDS):
+    """(n_docs, num_bands) uint64 LSH bucket keys
+
+    Each band's rows are folded into one 64-bit key; collisions only add
+    candidates, which are verified against the full signature anyway.
+    """
+    rows_per_band = signatures.shape[1] // num_bands
+    wide_signatures = signatures.astype(np.uint64)
+    keys = np.zeros((len(signatures), num_bands), dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for band in range(num_bands):
+            for column in range(band * rows_per_band, (band + 1) * rows_per_band):
+                keys[:, band] = (keys[:, band] ^ wide_signatures[:, column]) * _BAND_MULTIPLIER
+    return keys
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def cluster_signatures(signatures, valid, num_bands=NUM_BANDS, threshold=SIMILARITY_THRESHOLD):
+    """Group rows with LSH banding; returns a cluster label (lowest member index) per row"""
+    n = len(signatures)
+    parent = list(range(n))
+    valid_ids = np.flatnonzero(valid)
+    if len(valid_ids) < 2:
+        return parent
+
+    valid_signatures = signatures[valid_ids]
+    band_keys = _band_keys(valid_signatures, num_bands)
+    candidate_pairs = []
+    for band in range(num_bands):
+        keys = band_keys[:, band]
+        order = np.argsort(keys)
+        sorted_keys = keys[order]
+        same_as_prev = np.zeros(len(order), dtype=bool)
+        same_as_prev[1:] = sorted_keys[1:] == sorted_keys[:-1]
+        if not same_as_prev.any():
+            continue
+
+        # Rows sharing a bucket with an earlier row are paired with the
+        # bucket head and with their predecessor
+        positions = np.arange(len(order))
+        head_positions = np.maximum.accumulate(np.where(same_as_prev, 0, positions))
+        members = np.flatnonzero(same_as_prev)
+        candidate_pairs.append(np.stack([order[members], order[head_positions[members]]], axis=1))
+        candidate_pairs.append(np.stack([order[members], order[members - 1]], axis=1))
+
+    if not candidate_pairs:
+        return parent
+
+    pairs = np.sort(np.concatenate(candidate_pairs), axis=1)
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    # Deduplicate pairs through a single int64 code instead of a row-wise unique
+    pairs = np.unique(pairs[:, 0].astype(np.int64) * n + pairs[:, 1])
+    pairs = np.stack([pairs // n, pairs % n], axis=1)
+    for start in range(0, len(pairs), 65536):
+        chunk = pairs[start:start + 65536]
+        similarity = (valid_signatures[chunk[:, 0]] == valid_signatures[chunk[:, 1]]).mean(axis=1)
+        for doc, other in valid_ids[chunk[similarity >= threshold]].tolist():
+            root_doc, root_other = _find(parent, doc), _find(parent, other)
+            if root_doc != root_other:
+                parent[max(root_doc, root_other)] = min(root_doc, root_other)
+
+    return [_find(parent, i) for i in range(n)]
+
+
+def _alternate_source(article):
+    """The fields of a merged duplicate kept on its representative"""
+    return {
+        'title': article['title'],
+        'link': article['link'],
+        'direct_link': article.get('direct_link', article['link']),
+        'source': article['source'],
+        'date': article.get('date', '')
+    }
+
+
+def cluster_near_duplicates(articles, threshold=SIMILARITY_THRESHOLD, hasher=None):
+    """Collapse near-duplicate articles by content, keeping one representative per cluster
+
+    The representative is the member with the longest content; the other members
+    are attached to it under 'alternate_sources'.
+    """
+    if len(articles) < 2:
+        return list(articles)
+
+    hasher = hasher or MinHasher()
+    hashes, counts = shingle_hashes([article.get('content', '') for article in articles])
+    signatures = hasher.signatures(hashes, counts)
+    labels = cluster_signatures(signatures, counts > 0, threshold=threshold)
+
+    clusters = {}
+    for i, label in enumerate(labels):
+        clusters.setdefault(label, []).append(i)
+
+    unique_articles = []
+    # Clusters are keyed by their earliest member, so search order is preserved
+    for label in sorted(clusters):
+        members = clusters[label]
+        rep_index = max(members, key=lambda i: (len(articles[i].get('content', '')), -i))
+        representative = articles[rep_index]
+        alternates = [articles[i] for i in members if i != rep_index]
+        if alternates:
+            representative = dict(representative)
+            representative['alternate_sources'] = list(representative.get('alternate_sources', [])) + [
+                _alternate_source(alt) for alt in alternates
+            ]
+        unique_articles.append(representative)
+
+    return unique_articles
+
+
+class NearDuplicateIndex:
+    """Incremental LSH index for deduplicating articles as they stream in
+
+    Unlike cluster_near_duplicates, the first article of a story stays its
+    representative because it may already have been passed on; later copies
+    are attached to it under 'alternate_sources'.
+    """
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD, num_bands=NUM_BANDS, hasher=None):
+        self.threshold = threshold
+        self.num_bands = num_bands
+        self.hasher = hasher or MinHasher()
+        self.buckets = [{} for _ in range(num_bands)]
+        self.signatures = []
+        self.articles = []
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.articles)
+
+    def add_many(self, articles):
+        """Index a batch of articles; returns those that start a new story, in order"""
+        if not articles:
+            return []
+        hashes, counts = shingle_hashes([article.get('content', '') for article in articles])
+        signatures = self.hasher.signatures(hashes, counts)
+        band_keys = _band_keys(signatures, self.num_bands).tolist()
+
+        new_articles = []
+        with self.lock:
+            for article, signature, keys, count in zip(articles, signatures, band_keys, counts):
+                match = None
+                if count:
+                    candidates = {doc for band, key in enumerate(keys) for doc in self.buckets[band].get(key, ())}
+                    for doc in sorted(candidates):
+                        if (self.signatures[doc] == signature).mean() >= self.threshold:
+                            match = doc
+                            break
+                if match is not None:
+                    self.articles[match].setdefault('alternate_sources', []).append(_alternate_source(article))
+                    continue
+
+                doc = len(self.articles)
+                self.articles.append(article)
+                self.signatures.append(signature)
+                if count:
+                    for band, key in enumerate(keys):
+                        self.buckets[band].setdefault(key, []).append(doc)
+                new_articles.append(article)
+        return new_articles
@@ -0,0 +1,107 @@
+import logging
+import time
+
+
+class ProgressReporter:
+    """Receives status updates from long-running scout work; the base class ignores them"""
+
+    def info(self, message):
+        pass
+
+    def success(self, message):
+        pass
+
+    def warning(self, message):
+        pass
+
+    def error(self, message):
+        pass
+
+    def progress(self, fraction, message=None):
+        """Report overall completion in [0, 1] with an optional status line"""
+        pass
+
+    def metrics(self, values):
+        """Report a dict of labelled summary numbers"""
+        pass
+
+    def results(self, rows):
+        """Hand over partial results as soon as they are available"""
+        pass
+
+    def finish(self):
+        """Clear any transient progress display"""
+        pass
+
+
+class StreamlitProgressReporter(ProgressReporter):
+    """Renders updates inline in the current Streamlit script run (main thread only)"""
+
+    def __init__(self):
+        import streamlit as st
+        self.st = st
+        self.progress_bar = None
+        self.status_text = None
+
+    def info(self, message):
+        self.st.info(message)
+
+    def success(self, message):
+        self.st.success(message)
+
+    def warning(self, message):
+        self.st.warning(message)
+
+    def error(self, message):
+        self.st.error(message)
+
+    def progress(self, fraction, message=None):
+        if self.progress_bar is None:
+            self.progress_bar = self.st.progress(0)
+            self.status_text = self.st.empty()
+        self.progress_bar.progress(min(max(fraction, 0.0), 1.0))
+        if message:
+            self.status_text.text(message)
+
+    def metrics(self, values):
+        columns = self.st.columns(len(values))
+        for column, (label, value) in zip(columns, values.items()):
+            with column:
+                self.st.metric(label, value)
+
+    def finish(self):
+        if self.progress_bar is not None:
+            self.progress_bar.empty()
+            self.status_text.empty()
+            self.progress_bar = None
+            self.status_text = None
+
+
+class LoggingProgressReporter(ProgressReporter):
+    """Writes updates to a logger, for headless runs; progress lines are throttled"""
+
+    def __init__(self, logger=None, interval=5.0):
+        self.logger = logger or logging.getLogger("scout")
+        self.interval = interval
+        self.last_progress = 0.0
+
+    def info(self, message):
+        self.logger.info(message)
+
+    def success(self, message):
+        self.logger.info(message)
+
+    def warning(self, message):
+        self.logger.warning(message)
+
+    def error(self, message):
+        self.logger.error(message)
+
+    def progress(self, fraction, message=None):
+        now = time.monotonic()
+        if fraction >= 1.0 or now - self.last_progress >= self.interval:
+            self.last_progress = now
+            self.logger.info(f"[{fraction:4.0%}] {message or ''}".rstrip())
+
+    def metrics(self, values):
+        self.logger.info(", ".join(f"{label}: {value}" for label, value in values.items()))
@@ -0,0 +1,173 @@
+import html
+import math
+import re
+import statistics
+import threading
+
+from prompt_packing import CHARS_PER_TOKEN, estimate_tokens
+
+# Article text sent per article; about the 3000 characters that used to be cut off blindly
+ARTICLE_TOKEN_BUDGET = 750
+
+# Output budget: a fixed allowance, a share per article for its company
+# objects, and a share of the input since longer articles name more companies
+COMPLETION_BASE_TOKENS = 200
+COMPLETION_TOKENS_PER_ARTICLE = 250
+COMPLETION_TOKENS_PER_INPUT_TOKEN = 0.5
+MIN_COMPLETION_TOKENS = 400
+MAX_COMPLETION_TOKENS = 8000
+
+# Lines that carry page furniture rather than news
+_BOILERPLATE_RE = re.compile(
+    r'^\s*(advertisement|also read|read more|read also|subscribe|sign up|follow us|share this|click here|'
+    r'download the app|all rights reserved|copyright|©|trending now|recommended stories|'
+    r'we use cookies|this website uses cookies)\b',
+    re.IGNORECASE
+)
+_SPACE_RE = re.compile(r'[ \t\u00a0\u200b]+')
+_SENTENCE_END_RE = re.compile(r'[.!?]["\')\]]?\s')
+
+
+def _strip_title(line, title):
+    """`line` without leading copies of the title (search results repeat it)"""
+    while title and line.lower().startswith(title.lower()):
+        line = line[len(title):].lstrip(' .:-|')
+    return line
+
+
+def compact_text(text, title="", token_budget=ARTICLE_TOKEN_BUDGET):
+    """Article text with page boilerplate, repeated lines, repeats of the title
+    and extra whitespace removed, cut at a sentence end to fit `token_budget`"""
+    title = _SPACE_RE.sub(' ', title or "").strip().rstrip('.')
+    seen = set()
+    lines = []
+    for line in html.unescape(text or "").splitlines():
+        line = _SPACE_RE.sub(' ', line).strip()
+        if not lines:
+            line = _strip_title(line, title)
+        key = line.lower()
+        if not line or key in seen or _BOILERPLATE_RE.match(line):
+            continue
+        seen.add(key)
+        lines.append(line)
+    text = "\n".join(lines)
+
+    max_chars = token_budget * CHARS_PER_TOKEN
+    if len(text) > max_chars:
+        cut = text[:max_chars]
+        sentence_ends = [match.end() for match in _SENTENCE_END_RE.finditer(cut)]
+        # Keep whole sentences unless that would drop much of the budget
+        if sentence_ends and sentence_ends[-1] > max_chars * 0.6:
+            cut = cut[:sentence_ends[-1]]
+        text = cut.rstrip()
+    return text
+
+
+def completion_budget(prompt_tokens, articles=1):
+    """max_tokens for an extraction request whose article text is about `prompt_tokens` long"""
+    budget = (COMPLETION_BASE_TOKENS + COMPLETION_TOKENS_PER_ARTICLE * articles
+              + COMPLETION_TOKENS_PER_INPUT_TOKEN * prompt_tokens)
+    return int(min(max(budget, MIN_COMPLETION_TOKENS), MAX_COMPLETION_TOKENS))
+
+
+class UsageLedger:
+    """Tokens and seconds of every model call in a run, from the API's usage fields
+
+    Calls are grouped by tier (e.g. triage / large) for the run summary;
+    `server_seconds` is the time Groq reports spending on the request, so
+    the rest of the latency is queueing and network.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = []
+        self.raw_tokens = 0
+        self.compacted_tokens = 0
+
+    def record_call(self, tier, model, articles, usage, seconds, max_tokens, truncated=False):
+        call = {
+            'tier': tier,
+            'model': model,
+            'articles': articles,
+            'prompt_tokens': getattr(usage, 'prompt_tokens', None) or 0,
+            'completion_tokens': getattr(usage, 'completion_tokens', None) or 0,
+            'server_seconds': getattr(usage, 'total_time', None) or 0.0,
+            'seconds': seconds,
+            'max_tokens': max_tokens,
+            'truncated': truncated,
+        }
+        with self.lock:
+            self.calls.append(call)
+
+    def record_compaction(self, raw_text, compacted_text):
+        """Estimated article tokens before and after compaction"""
+        raw, compacted = estimate_tokens(raw_text), estimate_tokens(compacted_text)
+        with self.lock:
+            self.raw_tokens += raw
+            self.compacted_tokens += compacted
+
+    def merge(self, other):
+        """Add another ledger's calls, e.g. to total several batches"""
+        with other.lock:
+            calls, raw, compacted = list(other.calls), other.raw_tokens, other.compacted_tokens
+        with self.lock:
+            self.calls.extend(calls)
+            self.raw_tokens += raw
+            self.compacted_tokens += compacted
+
+    def summary(self):
+        """{tier: totals and latency percentiles} over the recorded calls"""
+        with self.lock:
+            calls = list(self.calls)
+        tiers = {}
+        for call in calls:
+            tiers.setdefault(call['tier'], []).append(call)
+        summary = {}
+        for tier, tier_calls in tiers.items():
+            latencies = sorted(call['seconds'] for call in tier_calls)
+            summary[tier] = {
+                'models': sorted({call['model'] for call in tier_calls}),
+                'calls': len(tier_calls),
+                'articles': sum(call['articles'] for call in tier_calls),
+                'prompt_tokens': sum(call['prompt_tokens'] for call in tier_calls),
+                'completion_tokens': sum(call['completion_tokens'] for call in tier_calls),
+                'max_tokens': sum(call['max_tokens'] for call in tier_calls),
+                'seconds': sum(latencies),
+                'server_seconds': sum(call['server_seconds'] for call in tier_calls),
+                'median_seconds': statistics.median(latencies),
+                'p90_seconds': latencies[math.ceil(0.9 * len(latencies)) - 1],
+                'truncated': sum(call['truncated'] for call in tier_calls),
+            }
+        return summary
+
+    def metrics(self):
+        """Labelled headline numbers for a progress reporter"""
+        summary = self.summary()
+        if not summary:
+            return {}
+        return {
+            "Prompt Tokens": sum(tier['prompt_tokens'] for tier in summary.values()),
+            "Completion Tokens": sum(tier['completion_tokens'] for tier in summary.values()),
+            "Model Seconds": f"{sum(tier['seconds'] for tier in summary.values()):.1f}s",
+            "Trimmed by Compaction": f"{self.compaction_ratio():.0%}",
+        }
+
+    def compaction_ratio(self):
+        with self.lock:
+            return 1.0 - self.compacted_tokens / self.raw_tokens if self.raw_tokens else 0.0
+
+    def describe(self):
+        """One line per tier saying where its tokens and seconds went"""
+        lines = []
+        for tier, stats in self.summary().items():
+            line = (
+                f"{tier} ({', '.join(stats['models'])}): {stats['calls']} calls for {stats['articles']} articles, "
+                f"{stats['prompt_tokens']} prompt + {stats['completion_tokens']} completion tokens "
+                f"(of {stats['max_tokens']} allowed), {stats['seconds']:.1f}s total "
+                f"({stats['server_seconds']:.1f}s on the server), median {stats['median_seconds']:.2f}s, "
+                f"p90 {stats['p90_seconds']:.2f}s"
+            )
+            if stats['truncated']:
+                line += f", {stats['truncated']} answers cut off at max_tokens"
+            lines.append(line)
+        return lines
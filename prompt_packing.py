@@ -0,0 +1,57 @@
+# Rough chars-per-token ratio for English news text with Llama tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    """Cheap local token estimate"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def article_id(position):
+    """ID used to tag the article at `position` inside a packed prompt"""
+    return f"A{position + 1}"
+
+
+def pack_articles(articles, render, token_budget=3000, max_articles=12):
+    """Greedily group article indices so each group's rendered prompt fits `token_budget`
+
+    `render(article)` returns the text that article contributes to the prompt.
+    Articles that exceed the budget on their own get a group to themselves.
+    """
+    packs = []
+    current, current_tokens = [], 0
+    for index, article in enumerate(articles):
+        tokens = estimate_tokens(render(article))
+        if current and (current_tokens + tokens > token_budget or len(current) >= max_articles):
+            packs.append(current)
+            current, current_tokens = [], 0
+        current.append(index)
+        current_tokens += tokens
+    if current:
+        packs.append(current)
+    return packs
+
+
+def assign_companies_to_articles(companies, articles):
+    """Map companies returned for a packed prompt back to their articles by `article_id`
+
+    Returns one list of companies per article. Companies without a usable ID
+    fall back to the article whose text mentions the company name; companies
+    that cannot be placed are dropped.
+    """
+    assigned = [[] for _ in articles]
+    ids = {article_id(i): i for i in range(len(articles))}
+    for company in companies:
+        position = ids.get(str(company.get('article_id', '')).strip().strip('[]').upper())
+        if position is None:
+            if len(articles) == 1:
+                position = 0
+            else:
+                name = str(company.get('company_name', '')).lower()
+                position = next(
+                    (i for i, article in enumerate(articles) if name and name in article['content'].lower()),
+                    None
+                )
+        if position is not None:
+            assigned[position].append(company)
+    return assigned
@@ -0,0 +1,122 @@
+import threading
+import time
+import urllib.parse
+
+from storage import SQLiteStore
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `capacity` in a burst"""
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self, tokens=1):
+        """Block until `tokens` are available, then take them"""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class HostRateLimiter:
+    """Keeps one token bucket per host so politeness is enforced per site, not per query"""
+
+    # (requests per second, burst) for hosts we hit repeatedly
+    DEFAULT_LIMITS = {
+        "news.google.com": (2.0, 4),
+        "html.duckduckgo.com": (1.0, 2),
+    }
+
+    def __init__(self, limits=None, default_rate=4.0, default_capacity=8):
+        self.limits = dict(self.DEFAULT_LIMITS)
+        if limits:
+            self.limits.update(limits)
+        self.default_rate = default_rate
+        self.default_capacity = default_capacity
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def bucket_for(self, url):
+        host = urllib.parse.urlsplit(url).hostname or ""
+        with self.lock:
+            if host not in self.buckets:
+                rate, capacity = self.limits.get(host, (self.default_rate, self.default_capacity))
+                self.buckets[host] = TokenBucket(rate, capacity)
+            return self.buckets[host]
+
+    def acquire(self, url):
+        """Wait for a request slot on the host of `url`"""
+        self.bucket_for(url).acquire()
+
+
+class SharedHostRateLimiter(SQLiteStore):
+    """HostRateLimiter whose buckets live in SQLite, shared by every process using the cache directory
+
+    Queue workers use it so that N worker processes together stay within
+    the per-host limits instead of N times them. Each acquire is one short
+    BEGIN IMMEDIATE transaction, so SQLite's file lock serialises the
+    bucket updates across processes.
+    """
+
+    FILENAME = "rate_limits.db"
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS buckets (
+        host TEXT PRIMARY KEY,
+        tokens REAL NOT NULL,
+        updated_at REAL NOT NULL
+    );
+    """
+
+    def __init__(self, limits=None, default_rate=4.0, default_capacity=8, path=None):
+        super().__init__(path)
+        self.limits = dict(HostRateLimiter.DEFAULT_LIMITS)
+        if limits:
+            self.limits.update(limits)
+        self.default_rate = default_rate
+        self.default_capacity = default_capacity
+
+    def _take(self, host):
+        """Take a token for `host` if one is free; returns 0, or the seconds until one will be"""
+        rate, capacity = self.limits.get(host, (self.default_rate, self.default_capacity))
+        now = time.time()
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.conn.execute("SELECT tokens, updated_at FROM buckets WHERE host = ?", (host,)).fetchone()
+                tokens = capacity if row is None else min(capacity, row[0] + max(0.0, now - row[1]) * rate)
+                wait = 0.0
+                if tokens >= 1:
+                    tokens -= 1
+                else:
+                    wait = (1 - tokens) / rate
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO buckets (host, tokens, updated_at) VALUES (?, ?, ?)", (host, tokens, now)
+                )
+                self.conn.commit()
+            except BaseException:
+                self.conn.rollback()
+                raise
+        return wait
+
+    def acquire(self, url):
+        """Wait for a request slot on the host of `url`"""
+        host = urllib.parse.urlsplit(url).hostname or ""
+        while True:
+            wait = self._take(host)
+            if not wait:
+                return
+            time.sleep(wait)
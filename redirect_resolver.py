@@ -0,0 +1,84 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from storage import SQLiteStore
+
+
+class RedirectResolver(SQLiteStore):
+    """Resolves news redirect links to their final article URL, concurrently and with a persistent cache"""
+
+    FILENAME = "redirects.db"
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS redirects (
+        link TEXT PRIMARY KEY,
+        resolved_url TEXT NOT NULL,
+        resolved_at REAL NOT NULL
+    );
+    """
+
+    def __init__(self, session, rate_limiter=None, path=None, timeout=10, max_workers=8):
+        super().__init__(path)
+        self.session = session
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.hits = 0
+        self.misses = 0
+
+    def get_cached(self, links):
+        """Return {link: resolved_url} for the links already in the cache"""
+        cached = {}
+        links = list(links)
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(links), 500):
+            chunk = links[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.query(f"SELECT link, resolved_url FROM redirects WHERE link IN ({placeholders})", chunk)
+            cached.update(rows)
+        return cached
+
+    def _fetch_final_url(self, link):
+        """Follow redirects without downloading the target page body"""
+        if self.rate_limiter:
+            self.rate_limiter.acquire(link)
+        response = self.session.head(link, timeout=self.timeout, allow_redirects=True)
+        response.close()
+        if response.status_code < 400:
+            return response.url
+        
+        # Some hosts reject HEAD; a streamed GET stops after the headers
+        if self.rate_limiter:
+            self.rate_limiter.acquire(link)
+        response = self.session.get(link, timeout=self.timeout, allow_redirects=True, stream=True)
+        response.close()
+        return response.url
+
+    def _resolve_uncached(self, link):
+        try:
+            return self._fetch_final_url(link)
+        except Exception:
+            return None
+
+    def resolve_many(self, links):
+        """Resolve links concurrently, returning {link: final_url}; failures map to the link itself"""
+        unique_links = list(dict.fromkeys(link for link in links if link))
+        resolved = self.get_cached(unique_links)
+        self.hits += len(resolved)
+        
+        pending = [link for link in unique_links if link not in resolved]
+        self.misses += len(pending)
+        if pending:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                final_urls = list(executor.map(self._resolve_uncached, pending))
+            
+            now = time.time()
+            new_rows = [(link, url, now) for link, url in zip(pending, final_urls) if url]
+            self.executemany("INSERT OR REPLACE INTO redirects (link, resolved_url, resolved_at) VALUES (?, ?, ?)", new_rows)
+            for link, url in zip(pending, final_urls):
+                resolved[link] = url or link
+        
+        return resolved
+
+    def resolve(self, link):
+        """Resolve a single link"""
+        return self.resolve_many([link]).get(link, link)
@@ -0,0 +1,254 @@
+import hashlib
+import re
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from keyword_matcher import get_matcher
+from storage import SQLiteStore
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+# Legal-form words are a cheap signal that an article names specific companies
+COMPANY_CUES = ['ltd', 'limited', 'pvt', 'private', 'llp', 'inc', 'technologies', 'solutions', 'industries']
+
+HASH_BITS = 18
+MIN_TRAINING_SAMPLES = 40
+# Outcomes kept for training; older ones are dropped first
+MAX_OUTCOMES = 5000
+# Retrain in the background after this many new outcomes, or after
+# RETRAIN_INTERVAL seconds if there are any
+RETRAIN_AFTER_OUTCOMES = 50
+RETRAIN_INTERVAL = 15 * 60
+
+
+class RelevancePrefilter(SQLiteStore):
+    """Local triage that scores articles before they are sent to the LLM
+
+    Scores combine keyword hits against the SME, technology and industry
+    vocabularies with a hashed TF-IDF logistic model trained on past
+    extraction outcomes (did the article yield any company?). Until enough
+    outcomes exist, the keyword score is used on its own.
+
+    The model is trained on first use and then retrained in a background
+    thread as outcomes accumulate; triage keeps using the previous model
+    meanwhile. Only the newest MAX_OUTCOMES outcomes are kept.
+    """
+
+    FILENAME = "triage.db"
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS outcomes (
+        content_hash TEXT PRIMARY KEY,
+        content TEXT NOT NULL,
+        label INTEGER NOT NULL,
+        recorded_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_outcomes_recorded ON outcomes (recorded_at);
+    """
+
+    # Weights of the keyword features in the heuristic score
+    KEYWORD_WEIGHTS = {'sme': 1.0, 'technology': 0.7, 'industry': 0.4, 'company': 0.5}
+
+    def __init__(self, sme_terms, technology_terms, industry_terms, path=None):
+        super().__init__(path)
+        self.matchers = {
+            'sme': get_matcher(sme_terms),
+            'technology': get_matcher(technology_terms),
+            'industry': get_matcher(industry_terms),
+            'company': get_matcher(COMPANY_CUES),
+        }
+        self.model_lock = threading.Lock()
+        self.weights = None
+        self.idf = None
+        self.bias = 0.0
+        self.trained_on = 0
+        # Newest outcome seen by the last fit, and when it ran
+        self.fitted_through = None
+        self.fitted_at = 0.0
+        self.training = False
+        # Scores of past company-bearing articles under the current model, for the recall estimate
+        self.positive_scores = None
+
+    # Features
+
+    def keyword_features(self, texts):
+        """(n_texts, 4) matrix of keyword hit counts: sme, technology, industry, company cues"""
+        features = np.zeros((len(texts), len(self.matchers)), dtype=np.float64)
+        for column, matcher in enumerate(self.matchers.values()):
+            features[:, column] = [len(matcher.findall(text)) for text in texts]
+        return features
+
+    def keyword_scores(self, texts, features=None):
+        """Heuristic relevance in [0, 1) from keyword hits"""
+        if features is None:
+            features = self.keyword_features(texts)
+        weights = np.array(list(self.KEYWORD_WEIGHTS.values()))
+        return 1.0 - np.exp(-(np.minimum(features, 3) @ weights) / 2.0)
+
+    def _hashed_terms(self, texts):
+        """Sparse hashed unigram+bigram counts as (indices, counts, row offsets)"""
+        indices, counts, offsets = [], [], [0]
+        mask = (1 << HASH_BITS) - 1
+        for text in texts:
+            tokens = _TOKEN_RE.findall(text.lower())
+            terms = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            row = {}
+            for term in terms:
+                bucket = zlib.crc32(term.encode('utf-8')) & mask
+                row[bucket] = row.get(bucket, 0) + 1
+            indices.extend(row.keys())
+            counts.extend(row.values())
+            offsets.append(len(indices))
+        return np.array(indices, dtype=np.int64), np.array(counts, dtype=np.float64), np.array(offsets, dtype=np.int64)
+
+    def _tfidf(self, texts, idf):
+        indices, counts, offsets = self._hashed_terms(texts)
+        values = np.log1p(counts) * idf[indices]
+        # L2-normalise each row
+        row_ids = np.repeat(np.arange(len(texts)), np.diff(offsets))
+        norms = np.sqrt(np.bincount(row_ids, weights=values ** 2, minlength=len(texts)))
+        values = values / np.maximum(norms[row_ids], 1e-12)
+        return indices, values, row_ids
+
+    # Model
+
+    def record_outcome(self, content, found_companies):
+        """Remember whether extracting `content` produced any company"""
+        content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        self.execute(
+            "INSERT OR REPLACE INTO outcomes (content_hash, content, label, recorded_at) VALUES (?, ?, ?, ?)",
+            (content_hash, content, int(bool(found_companies)), time.time())
+        )
+
+    def _load_outcomes(self):
+        with self.lock:
+            # Keep the table bounded; the newest outcomes reflect the current searches best
+            self.conn.execute(
+                "DELETE FROM outcomes WHERE content_hash IN "
+                "(SELECT content_hash FROM outcomes ORDER BY recorded_at DESC LIMIT -1 OFFSET ?)",
+                (MAX_OUTCOMES,)
+            )
+            self.conn.commit()
+            rows = self.conn.execute("SELECT content, label, recorded_at FROM outcomes").fetchall()
+        newest = max((row[2] for row in rows), default=None)
+        return [row[0] for row in rows], np.array([row[1] for row in rows], dtype=np.float64), newest
+
+    def fit(self, epochs=60, learning_rate=0.5, l2=1e-4):
+        """Train the logistic model on recorded outcomes; returns False if there is too little data
+
+        Also rescores the past company-bearing articles for estimated_recall_loss.
+        """
+        texts, labels, newest = self._load_outcomes()
+        try:
+            if len(texts) < MIN_TRAINING_SAMPLES or labels.min() == labels.max():
+                return False
+            self._train(texts, labels, epochs, learning_rate, l2)
+            return True
+        finally:
+            positives = [text for text, label in zip(texts, labels) if label == 1]
+            positive_scores = self.scores(positives) if positives else np.zeros(0)
+            with self.model_lock:
+                self.positive_scores = positive_scores
+                self.fitted_through, self.fitted_at = newest, time.monotonic()
+
+    def _train(self, texts, labels, epochs, learning_rate, l2):
+
+        indices, counts, offsets = self._hashed_terms(texts)
+        document_frequency = np.bincount(indices, minlength=1 << HASH_BITS)
+        idf = np.log((1 + len(texts)) / (1 + document_frequency)) + 1.0
+        indices, values, row_ids = self._tfidf(texts, idf)
+
+        # Class-balanced full-batch gradient descent on the sparse rows
+        positive_rate = labels.mean()
+        sample_weights = np.where(labels == 1, 0.5 / positive_rate, 0.5 / (1 - positive_rate))
+        weights = np.zeros(1 << HASH_BITS)
+        bias = 0.0
+        for _ in range(epochs):
+            margins = np.bincount(row_ids, weights=weights[indices] * values, minlength=len(texts)) + bias
+            errors = (1.0 / (1.0 + np.exp(-margins)) - labels) * sample_weights / len(texts)
+            gradient = np.bincount(indices, weights=values * errors[row_ids], minlength=1 << HASH_BITS)
+            weights -= learning_rate * (gradient + l2 * weights)
+            bias -= learning_rate * errors.sum()
+
+        with self.model_lock:
+            self.weights, self.idf, self.bias = weights, idf, bias
+            self.trained_on = len(texts)
+
+    def _fit_and_clear_flag(self):
+        try:
+            self.fit()
+        finally:
+            with self.model_lock:
+                self.training = False
+
+    def refresh(self):
+        """Train on first use, then retrain in the background once enough new outcomes are in"""
+        with self.model_lock:
+            if self.training:
+                return
+            fitted_through, fitted_at = self.fitted_through, self.fitted_at
+            if not fitted_at:
+                self.training = True
+        if not fitted_at:
+            # The first fit runs in the foreground so the model is used right away
+            self._fit_and_clear_flag()
+            return
+        new_outcomes = self.query(
+            "SELECT COUNT(*) FROM outcomes WHERE recorded_at > ?", (fitted_through or 0.0,)
+        )[0][0]
+        stale = new_outcomes and time.monotonic() - fitted_at > RETRAIN_INTERVAL
+        if new_outcomes < RETRAIN_AFTER_OUTCOMES and not stale:
+            return
+        with self.model_lock:
+            if self.training:
+                return
+            self.training = True
+        threading.Thread(target=self._fit_and_clear_flag, name="prefilter-fit", daemon=True).start()
+
+    def model_scores(self, texts):
+        """Model probability per text, or None when no model is trained"""
+        with self.model_lock:
+            weights, idf, bias = self.weights, self.idf, self.bias
+        if weights is None:
+            return None
+        indices, values, row_ids = self._tfidf(texts, idf)
+        margins = np.bincount(row_ids, weights=weights[indices] * values, minlength=len(texts)) + bias
+        return 1.0 / (1.0 + np.exp(-margins))
+
+    def scores(self, texts):
+        keyword_scores = self.keyword_scores(texts)
+        model_scores = self.model_scores(texts)
+        if model_scores is None:
+            return keyword_scores
+        return 0.5 * keyword_scores + 0.5 * model_scores
+
+    def estimated_recall_loss(self, threshold):
+        """Share of past articles that did yield companies but would now be filtered out
+
+        Uses the scores taken at the last fit, so it costs nothing per call.
+        """
+        with self.model_lock:
+            positive_scores = self.positive_scores
+        if positive_scores is None or len(positive_scores) < 10:
+            return None
+        return float(np.mean(positive_scores < threshold))
+
+    def triage(self, articles, threshold):
+        """Split articles into those worth an LLM call and those skipped
+
+        Returns a report dict with 'selected', 'skipped', 'scores' and the
+        estimated recall loss at this threshold (None without enough history).
+        """
+        self.refresh()
+
+        scores = self.scores([article['content'] for article in articles]) if articles else np.zeros(0)
+        selected = [article for article, score in zip(articles, scores) if score >= threshold]
+        skipped = [article for article, score in zip(articles, scores) if score < threshold]
+        return {
+            'selected': selected,
+            'skipped': skipped,
+            'scores': scores,
+            'model_trained': self.weights is not None,
+            'estimated_recall_loss': self.estimated_recall_loss(threshold) if skipped or threshold > 0 else 0.0,
+        }
@@ -0,0 +1,265 @@
+import json
+import re
+import time
+
+from entity_resolution import merge_company_records, normalize_company_name
+from seen_articles import canonical_url
+from storage import SQLiteStore
+
+_QUERY_TOKEN_RE = re.compile(r'\w+\*?')
+
+
+def fts_query(text):
+    """FTS5 MATCH expression requiring every word of free-form `text`
+
+    Words are quoted so punctuation and FTS operators in user input are
+    taken literally; a trailing * keeps its prefix-match meaning.
+    """
+    terms = []
+    for token in _QUERY_TOKEN_RE.findall(text or ""):
+        prefix = token.endswith("*")
+        terms.append(f'"{token.rstrip("*")}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def company_key(name):
+    """Primary key of a company across runs: its normalized name"""
+    return " ".join(normalize_company_name(name))
+
+
+def _article_key(article):
+    return canonical_url(article.get('direct_link') or article.get('link'))
+
+
+def _in_chunks(values, size=500):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class ResearchDatabase(SQLiteStore):
+    """Everything the scout has found, kept across sessions and searchable
+
+    Articles, the raw extraction returned for each article, and resolved
+    companies live in one SQLite file. Titles, descriptions, company names
+    and transformation details are indexed with FTS5, so queries over
+    months of results run without searching again.
+    """
+
+    FILENAME = "research.db"
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS articles (
+        id INTEGER PRIMARY KEY,
+        article_key TEXT NOT NULL UNIQUE,
+        title TEXT NOT NULL,
+        description TEXT NOT NULL DEFAULT '',
+        source TEXT NOT NULL DEFAULT '',
+        link TEXT NOT NULL DEFAULT '',
+        direct_link TEXT NOT NULL DEFAULT '',
+        published TEXT NOT NULL DEFAULT '',
+        content TEXT NOT NULL DEFAULT '',
+        first_seen REAL NOT NULL,
+        last_seen REAL NOT NULL
+    );
+    CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+        title, description, content='articles', content_rowid='id'
+    );
+    CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+    END;
+    CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+        INSERT INTO articles_fts (articles_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+    END;
+    CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE OF title, description ON articles BEGIN
+        INSERT INTO articles_fts (articles_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO articles_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+    END;
+
+    CREATE TABLE IF NOT EXISTS extractions (
+        article_key TEXT NOT NULL,
+        prompt_version TEXT NOT NULL,
+        model TEXT NOT NULL,
+        companies TEXT NOT NULL,
+        extracted_at REAL NOT NULL,
+        PRIMARY KEY (article_key, prompt_version, model)
+    );
+
+    CREATE TABLE IF NOT EXISTS companies (
+        id INTEGER PRIMARY KEY,
+        company_key TEXT NOT NULL UNIQUE,
+        company_name TEXT NOT NULL,
+        industry TEXT NOT NULL DEFAULT '',
+        revenue_range TEXT NOT NULL DEFAULT '',
+        company_size TEXT NOT NULL DEFAULT '',
+        confidence TEXT NOT NULL DEFAULT '',
+        transformation_details TEXT NOT NULL DEFAULT '',
+        relevance_score REAL NOT NULL DEFAULT 0,
+        mentions INTEGER NOT NULL DEFAULT 1,
+        record TEXT NOT NULL,
+        first_seen REAL NOT NULL,
+        updated_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_companies_score ON companies (relevance_score DESC);
+    CREATE VIRTUAL TABLE IF NOT EXISTS companies_fts USING fts5(
+        company_name, industry, transformation_details, content='companies', content_rowid='id'
+    );
+    CREATE TRIGGER IF NOT EXISTS companies_ai AFTER INSERT ON companies BEGIN
+        INSERT INTO companies_fts (rowid, company_name, industry, transformation_details)
+        VALUES (new.id, new.company_name, new.industry, new.transformation_details);
+    END;
+    CREATE TRIGGER IF NOT EXISTS companies_ad AFTER DELETE ON companies BEGIN
+        INSERT INTO companies_fts (companies_fts, rowid, company_name, industry, transformation_details)
+        VALUES ('delete', old.id, old.company_name, old.industry, old.transformation_details);
+    END;
+    CREATE TRIGGER IF NOT EXISTS companies_au AFTER UPDATE OF company_name, industry, transformation_details ON companies BEGIN
+        INSERT INTO companies_fts (companies_fts, rowid, company_name, industry, transformation_details)
+        VALUES ('delete', old.id, old.company_name, old.industry, old.transformation_details);
+        INSERT INTO companies_fts (rowid, company_name, industry, transformation_details)
+        VALUES (new.id, new.company_name, new.industry, new.transformation_details);
+    END;
+    """
+
+    # Writes
+
+    def save_articles(self, articles):
+        now = time.time()
+        rows = [
+            (_article_key(article), article.get('title', ''), article.get('description', ''), article.get('source', ''),
+             article.get('link', ''), article.get('direct_link', article.get('link', '')), article.get('date', ''),
+             article.get('content', ''), now, now)
+            for article in articles if _article_key(article)
+        ]
+        self.executemany(
+            "INSERT INTO articles (article_key, title, description, source, link, direct_link, published, content, first_seen, last_seen) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(article_key) DO UPDATE SET last_seen = excluded.last_seen",
+            rows
+        )
+
+    def save_extractions(self, articles, companies_per_article, prompt_version, model):
+        """Keep the raw extracted company JSON of each article"""
+        now = time.time()
+        self.executemany(
+            "INSERT OR REPLACE INTO extractions (article_key, prompt_version, model, companies, extracted_at) VALUES (?, ?, ?, ?, ?)",
+            [
+                (_article_key(article), prompt_version, model, json.dumps(companies), now)
+                for article, companies in zip(articles, companies_per_article) if _article_key(article)
+            ]
+        )
+
+    def save_companies(self, companies, score=None):
+        """Insert or merge company records by normalized name; returns the number of new companies
+
+        A company already in the database is merged with the new mention
+        (see merge_company_records) and, when `score` is given, re-scored
+        with score(merged_records).
+        """
+        pending = {}
+        for company in companies:
+            key = company_key(company.get('Company Name'))
+            if key:
+                pending[key] = merge_company_records(pending[key], company) if key in pending else dict(company)
+
+        existing = {}
+        for chunk in _in_chunks(pending):
+            placeholders = ",".join("?" * len(chunk))
+            existing.update(
+                (key, json.loads(record))
+                for key, record in self.query(f"SELECT company_key, record FROM companies WHERE company_key IN ({placeholders})", chunk)
+            )
+        merged = []
+        for key, record in pending.items():
+            if key in existing:
+                pending[key] = merge_company_records(existing[key], record)
+                merged.append(pending[key])
+        if score and merged:
+            score(merged)
+
+        now = time.time()
+        self.executemany(
+            "INSERT INTO companies (company_key, company_name, industry, revenue_range, company_size, confidence, "
+            "transformation_details, relevance_score, mentions, record, first_seen, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(company_key) DO UPDATE SET company_name = excluded.company_name, industry = excluded.industry, "
+            "revenue_range = excluded.revenue_range, company_size = excluded.company_size, confidence = excluded.confidence, "
+            "transformation_details = excluded.transformation_details, relevance_score = excluded.relevance_score, "
+            "mentions = excluded.mentions, record = excluded.record, updated_at = excluded.updated_at",
+            [
+                (key, record['Company Name'], str(record.get('Industry', '')), str(record.get('Revenue Range', '')),
+                 str(record.get('Company Size', '')), str(record.get('Confidence', '')),
+                 str(record.get('Transformation Details', '')), float(record.get('Relevance Score', 0) or 0),
+                 int(record.get('Mentions', 1) or 1), json.dumps(record, default=str), now, now)
+                for key, record in pending.items()
+            ]
+        )
+        return len(pending) - len(existing)
+
+    # Queries
+
+    def search_companies(self, text="", industries=(), confidence=(), min_score=0.0, limit=500):
+        """Company records best-first, matching every word of `text` and all the filters
+
+        `industries` match anywhere in the Industry field ("Logistics" finds
+        "Retail/Logistics"); `confidence` lists the accepted levels.
+        """
+        sql = "SELECT c.record FROM companies c"
+        clauses, params = [], []
+        match = fts_query(text)
+        if match:
+            sql += " JOIN companies_fts f ON f.rowid = c.id"
+            clauses.append("companies_fts MATCH ?")
+            params.append(match)
+        if industries:
+            clauses.append("(" + " OR ".join("c.industry LIKE ?" for _ in industries) + ")")
+            params.extend(f"%{industry}%" for industry in industries)
+        if confidence:
+            clauses.append(f"c.confidence IN ({','.join('?' * len(confidence))})")
+            params.extend(confidence)
+        if min_score:
+            clauses.append("c.relevance_score >= ?")
+            params.append(min_score)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY c.relevance_score DESC, c.id LIMIT ?"
+        params.append(limit)
+        return [json.loads(record) for (record,) in self.query(sql, params)]
+
+    def search_articles(self, text, limit=100):
+        """Articles matching every word of `text` in their title or description, best match first"""
+        match = fts_query(text)
+        if not match:
+            return []
+        rows = self.query(
+            "SELECT a.title, a.description, a.source, a.direct_link, a.published, "
+            "(SELECT COUNT(*) FROM extractions e WHERE e.article_key = a.article_key) "
+            "FROM articles_fts f JOIN articles a ON a.id = f.rowid "
+            "WHERE articles_fts MATCH ? ORDER BY bm25(articles_fts) LIMIT ?",
+            (match, limit)
+        )
+        return [
+            {'title': title, 'description': description, 'source': source, 'direct_link': link, 'date': published,
+             'extracted': bool(extracted)}
+            for title, description, source, link, published, extracted in rows
+        ]
+
+    def extractions_for(self, article):
+        """Raw extractions of one article, newest first"""
+        rows = self.query(
+            "SELECT prompt_version, model, companies, extracted_at FROM extractions WHERE article_key = ? ORDER BY extracted_at DESC",
+            (_article_key(article),)
+        )
+        return [
+            {'prompt_version': version, 'model': model, 'companies': json.loads(companies), 'extracted_at': extracted_at}
+            for version, model, companies, extracted_at in rows
+        ]
+
+    def counts(self):
+        return {
+            table: self.query(f"SELECT COUNT(*) FROM {table}")[0][0]
+            for table in ('articles', 'extractions', 'companies')
+        }
+
+    def clear(self):
+        with self.lock:
+            self.conn.executescript("DELETE FROM articles; DELETE FROM extractions; DELETE FROM companies;")
+            self.conn.commit()
@@ -0,0 +1,58 @@
+import httpx
+from groq import DefaultHttpxClient, Groq
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Connection pools kept open per session: one per host, up to
+# HTTP_POOL_MAXSIZE sockets each, sized for the concurrent search,
+# redirect-resolution and extraction workers of several sessions
+HTTP_POOL_CONNECTIONS = 32
+HTTP_POOL_MAXSIZE = 16
+# Transient failures retried by urllib3 before the caller sees them
+HTTP_RETRIES = 2
+HTTP_RETRY_BACKOFF = 0.5
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Search form posts are read-only queries, so retrying them is safe
+HTTP_RETRY_METHODS = ("GET", "HEAD", "POST")
+
+GROQ_MAX_CONNECTIONS = 32
+GROQ_KEEPALIVE_CONNECTIONS = 16
+GROQ_KEEPALIVE_EXPIRY = 120
+
+
+def mount_pooled_adapters(session, pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE,
+                          retries=HTTP_RETRIES):
+    """Give a requests session larger keep-alive pools and retries with backoff
+
+    urllib3 pools are thread-safe, so one session can serve every thread;
+    pool_block=False opens extra sockets under bursts instead of waiting.
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=HTTP_RETRY_BACKOFF,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        allowed_methods=frozenset(HTTP_RETRY_METHODS),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry, pool_block=False)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def create_groq_client(api_key, max_retries=0):
+    """Groq client with a pooled, keep-alive HTTP client shared by all its requests
+
+    Retries default to off because ExtractionExecutor retries with the
+    rate-limit headers in view.
+    """
+    http_client = DefaultHttpxClient(limits=httpx.Limits(
+        max_connections=GROQ_MAX_CONNECTIONS,
+        max_keepalive_connections=GROQ_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=GROQ_KEEPALIVE_EXPIRY,
+    ))
+    return Groq(api_key=api_key, max_retries=max_retries, http_client=http_client)
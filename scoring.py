@@ -0,0 +1,131 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from keyword_matcher import get_matcher
+
+# Relevance components and their default weights; the score is the weighted
+# sum of the component points, capped at MAX_RELEVANCE_SCORE
+DEFAULT_WEIGHTS = {'confidence': 1.0, 'size': 1.0, 'sme': 1.0, 'technology': 1.0, 'revenue': 1.0}
+COMPONENT_COLUMNS = {
+    'confidence': 'Confidence Points',
+    'size': 'Size Points',
+    'sme': 'SME Points',
+    'technology': 'Technology Points',
+    'revenue': 'Revenue Points',
+}
+MAX_RELEVANCE_SCORE = 10
+TECH_KEYWORDS = ['ERP', 'AI', 'DMS', 'RPA', 'analytics', 'cloud', 'automation']
+# Company Size labels that earn size points
+SMALL_SIZE_TERMS = ['SME', 'small', 'startup']
+GROWING_SIZE_TERMS = ['growing']
+# Revenue Range labels that earn revenue points (prefer smaller SMEs)
+SMALL_REVENUE_TERMS = ['1-10', 'under']
+MID_REVENUE_TERMS = ['10-50']
+
+_REVENUE_CRORE_RE = re.compile(r'(?:\d+\s*-\s*\d+\s*crore|₹?\s*\d+\s*crore)', re.IGNORECASE)
+_REVENUE_UNDER_RE = re.compile(r'under\s*\d+\s*crore|less than\s*\d+\s*crore', re.IGNORECASE)
+
+
+def _text(frame, column):
+    """Lowercased string column, empty where missing"""
+    if column not in frame:
+        return pd.Series('', index=frame.index, dtype=str)
+    return frame[column].fillna('').astype(str).str.lower()
+
+
+class ScoringEngine:
+    """Scores whole tables of companies at once with vectorized string operations
+
+    Scoring is split into features (string matching, done once per row) and
+    a weighted sum over the component columns, so re-scoring with new
+    weights is a single numpy expression.
+    """
+
+    def __init__(self, sme_indicators, tech_keywords=TECH_KEYWORDS):
+        self.sme_matcher = get_matcher(sme_indicators)
+        self.tech_matcher = get_matcher(tech_keywords)
+        self.small_size_matcher = get_matcher(SMALL_SIZE_TERMS)
+        self.growing_size_matcher = get_matcher(GROWING_SIZE_TERMS)
+        self.small_revenue_matcher = get_matcher(SMALL_REVENUE_TERMS)
+        self.mid_revenue_matcher = get_matcher(MID_REVENUE_TERMS)
+
+    def size_features(self, frame):
+        """SME Score and Company Size from indicator words and revenue mentions"""
+        content = _text(frame, 'Transformation Details')
+        name = _text(frame, 'Company Name')
+        revenue = _text(frame, 'Revenue')
+
+        # Distinct indicators across details and name, in one pass per row
+        indicator_hits = self.sme_matcher.distinct_counts(content + "\n" + name).to_numpy(dtype=np.int64)
+
+        crore_range = revenue.str.contains(_REVENUE_CRORE_RE).to_numpy()
+        under_crore = revenue.str.contains(_REVENUE_UNDER_RE).to_numpy()
+        sme_score = indicator_hits + 2 * (crore_range | under_crore)
+
+        return pd.DataFrame({
+            'SME Indicator Hits': indicator_hits,
+            'Detected Revenue Range': np.select([crore_range, under_crore], ["1-10 crore", "Under 1 crore"], "Not specified"),
+            'SME Score': sme_score,
+            'Company Size': np.select(
+                [sme_score >= 3, sme_score >= 1],
+                ["SME (Small to Medium Enterprise)", "Likely SME"],
+                "Size Unknown"
+            ),
+        }, index=frame.index)
+
+    def relevance_components(self, frame):
+        """Points per relevance component, one column each (see COMPONENT_COLUMNS)"""
+        confidence = _text(frame, 'Confidence')
+        size = _text(frame, 'Company Size')
+        details = _text(frame, 'Transformation Details')
+        revenue_range = _text(frame, 'Revenue Range')
+
+        tech_count = self.tech_matcher.distinct_counts(details).to_numpy(dtype=np.int64)
+        small = self.small_size_matcher.contains_series(size).to_numpy()
+        growing = self.growing_size_matcher.contains_series(size).to_numpy()
+        sme_score = frame['SME Score'].fillna(0).to_numpy() if 'SME Score' in frame else np.zeros(len(frame))
+
+        return pd.DataFrame({
+            COMPONENT_COLUMNS['confidence']: np.select([confidence == 'high', confidence == 'medium'], [3, 2], 1),
+            COMPONENT_COLUMNS['size']: np.select([small, growing], [3, 2], 0),
+            COMPONENT_COLUMNS['sme']: np.minimum(sme_score, 3),
+            COMPONENT_COLUMNS['technology']: np.minimum(tech_count, 3),
+            COMPONENT_COLUMNS['revenue']: np.select(
+                [self.small_revenue_matcher.contains_series(revenue_range).to_numpy(),
+                 self.mid_revenue_matcher.contains_series(revenue_range).to_numpy()],
+                [2, 1], 0
+            ),
+        }, index=frame.index)
+
+    def combine(self, components, weights=None):
+        """Relevance Score from component columns; cheap enough to call on every weight change"""
+        weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        total = np.zeros(len(components))
+        for component, column in COMPONENT_COLUMNS.items():
+            total += weights[component] * np.asarray(components[column], dtype=np.float64)
+        return np.minimum(total, MAX_RELEVANCE_SCORE)
+
+    def score_frame(self, frame, weights=None):
+        """Copy of `frame` with size analysis, relevance components and Relevance Score columns"""
+        scored = frame.copy()
+        size = self.size_features(scored)
+        scored['SME Score'] = size['SME Score']
+        scored['Company Size'] = size['Company Size']
+        components = self.relevance_components(scored)
+        for column in components:
+            scored[column] = components[column]
+        scored['Relevance Score'] = self.combine(components, weights)
+        return scored
+
+    def score_records(self, records, weights=None):
+        """Score a list of company dicts in place (one vectorized pass) and return it"""
+        if not records:
+            return records
+        scored = self.score_frame(pd.DataFrame(records), weights)
+        columns = ['SME Score', 'Company Size', *COMPONENT_COLUMNS.values(), 'Relevance Score']
+        values = scored[columns].to_dict('records')
+        for record, record_scores in zip(records, values):
+            record.update(record_scores)
+        return records
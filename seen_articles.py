@@ -0,0 +1,155 @@
+import hashlib
+import math
+import re
+import time
+import urllib.parse
+
+from storage import SQLiteStore
+
+# Query parameters that only track the click, not which article it is
+TRACKING_PARAMS = {'fbclid', 'gclid', 'ocid', 'cmpid', 'ref', 'ref_src', 'mc_cid', 'mc_eid', 'igshid'}
+TRACKING_PREFIXES = ('utm_',)
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def canonical_url(url):
+    """URL reduced to what identifies the page: no scheme case, www., fragment,
+    tracking parameters or trailing slash, and query parameters in sorted order"""
+    if not url:
+        return ""
+    parts = urllib.parse.urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value) for key, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urllib.parse.urlunsplit(("", host, path, urllib.parse.urlencode(query), "")).lstrip("/")
+
+
+def content_fingerprint(article):
+    """Hash of the article's normalized words, so re-crawled copies under another URL still match"""
+    tokens = _TOKEN_RE.findall(str(article.get('content') or article.get('title') or '').lower())
+    if not tokens:
+        return ""
+    return hashlib.sha1(" ".join(tokens).encode('utf-8')).hexdigest()
+
+
+def article_keys(article):
+    """Index keys of an article: its canonical links and content fingerprint"""
+    keys = {
+        f"u:{canonical_url(link)}"
+        for link in (article.get('link'), article.get('direct_link')) if link
+    }
+    fingerprint = content_fingerprint(article)
+    if fingerprint:
+        keys.add(f"f:{fingerprint}")
+    return keys
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings; `in` has no false negatives"""
+
+    def __init__(self, capacity=100000, error_rate=0.01):
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        # Double hashing: k positions from the two halves of one digest
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class SeenArticleIndex(SQLiteStore):
+    """Persistent record of the articles earlier searches returned
+
+    Articles are keyed by canonical URL and by content fingerprint, so a
+    story counts as seen if either its link or its text was returned
+    before. A Bloom filter loaded at startup answers most lookups for
+    new articles without touching the database.
+    """
+
+    FILENAME = "seen_articles.db"
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS seen_articles (
+        key TEXT PRIMARY KEY,
+        first_seen REAL NOT NULL,
+        last_seen REAL NOT NULL
+    );
+    """
+
+    def __init__(self, path=None, bloom_capacity=100000):
+        super().__init__(path)
+        self.bloom_capacity = bloom_capacity
+        self._load_bloom()
+
+    def _load_bloom(self):
+        with self.lock:
+            count = self.query("SELECT COUNT(*) FROM seen_articles")[0][0]
+            self.bloom_capacity = max(self.bloom_capacity, 2 * count)
+            self.bloom = BloomFilter(self.bloom_capacity)
+            for (key,) in self.conn.execute("SELECT key FROM seen_articles"):
+                self.bloom.add(key)
+
+    def _seen_keys(self, keys):
+        """The subset of `keys` already recorded"""
+        candidates = [key for key in keys if key in self.bloom]
+        seen = set()
+        for start in range(0, len(candidates), 500):
+            chunk = candidates[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            seen.update(key for (key,) in self.query(f"SELECT key FROM seen_articles WHERE key IN ({placeholders})", chunk))
+        return seen
+
+    def split_new(self, articles):
+        """(new, seen) articles, in order, against earlier runs only"""
+        keys_per_article = [article_keys(article) for article in articles]
+        seen_keys = self._seen_keys(list({key for keys in keys_per_article for key in keys}))
+        new, seen = [], []
+        for article, keys in zip(articles, keys_per_article):
+            (seen if keys & seen_keys else new).append(article)
+        return new, seen
+
+    def mark_seen(self, articles):
+        keys = list({key for article in articles for key in article_keys(article)})
+        if not keys:
+            return
+        now = time.time()
+        with self.lock:
+            self.executemany(
+                "INSERT INTO seen_articles (key, first_seen, last_seen) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET last_seen = excluded.last_seen",
+                [(key, now, now) for key in keys]
+            )
+            if self.bloom.count + len(keys) > self.bloom_capacity:
+                # Past its capacity the filter's error rate climbs; size it up
+                self.bloom_capacity *= 2
+                self._load_bloom()
+            else:
+                for key in keys:
+                    self.bloom.add(key)
+
+    def article_count(self):
+        """Number of distinct articles (by content) seen so far"""
+        return self.query("SELECT COUNT(*) FROM seen_articles WHERE key LIKE 'f:%'")[0][0]
+
+    def clear(self):
+        with self.lock:
+            self.execute("DELETE FROM seen_articles")
+            self.bloom = BloomFilter(self.bloom_capacity)
@@ -0,0 +1,71 @@
+import os
+import sqlite3
+import threading
+
+# Local state (caches, checkpoints) lives here unless SCOUT_CACHE_DIR says otherwise
+CACHE_DIR_ENV = "SCOUT_CACHE_DIR"
+DEFAULT_CACHE_DIR = ".scout_cache"
+
+
+def get_cache_dir():
+    """Return the local cache directory, creating it if needed"""
+    path = os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class SQLiteStore:
+    """Base class for small thread-safe SQLite stores kept in the cache directory"""
+
+    FILENAME = "scout.db"
+    SCHEMA = ""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(get_cache_dir(), self.FILENAME)
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.lock:
+            self.conn.executescript(self.SCHEMA)
+            self.conn.commit()
+
+    def execute(self, sql, params=()):
+        """Run one statement and commit"""
+        with self.lock:
+            cursor = self.conn.execute(sql, params)
+            self.conn.commit()
+            return cursor
+
+    def executemany(self, sql, rows):
+        with self.lock:
+            self.conn.executemany(sql, rows)
+            self.conn.commit()
+
+    def query(self, sql, params=()):
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class CacheCounter:
+    """Hits, misses and tokens saved by one run's cache lookups
+
+    The caches are shared by every session in the process, so per-run
+    figures are counted here instead of as differences of their totals.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.tokens_saved = 0
+
+    def record(self, hits=0, misses=0, tokens_saved=0):
+        with self.lock:
+            self.hits += hits
+            self.misses += misses
+            self.tokens_saved += tokens_saved
@@ -0,0 +1,180 @@
+import queue
+import threading
+import time
+
+# Marks the end of a stage's input; each worker consumes exactly one
+_END = object()
+
+
+class Stage:
+    """One step of a StreamingPipeline and its counters"""
+
+    def __init__(self, name, fn, workers=1, batch_size=None, linger=0.25):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.batch_size = batch_size
+        self.linger = linger
+        self.active = 0
+        self.processed = 0
+        self.emitted = 0
+        self.failed = 0
+
+
+class StreamingPipeline:
+    """Connects stages with bounded queues so items flow through as soon as they are ready
+
+    Each stage runs `workers` threads that take items from the stage's input
+    queue and call fn(item, emit), or fn(items, emit) with a list of up to
+    `batch_size` items collected within `linger` seconds when batching is
+    enabled. emit() passes a result to the next stage. Queues hold at most
+    `queue_size` items, so a slow stage blocks its producers (backpressure)
+    instead of letting work pile up in memory.
+    """
+
+    def __init__(self, queue_size=32, on_error=None, on_progress=None, progress_interval=1.0):
+        self.queue_size = queue_size
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        self.stages = []
+        self.queues = []
+        self.lock = threading.Lock()
+        self.cancelled = threading.Event()
+
+    def add_stage(self, name, fn, workers=1, batch_size=None, linger=0.25):
+        self.stages.append(Stage(name, fn, workers, batch_size, linger))
+        return self
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def stats(self):
+        """Per-stage counters and current input queue depth"""
+        with self.lock:
+            return {
+                stage.name: {
+                    'processed': stage.processed,
+                    'emitted': stage.emitted,
+                    'failed': stage.failed,
+                    'queued': self.queues[i].qsize() if self.queues else 0,
+                }
+                for i, stage in enumerate(self.stages)
+            }
+
+    def _put(self, target, item):
+        while not self.cancelled.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.cancelled.is_set():
+            wait = 0.1 if deadline is None else min(0.1, deadline - time.monotonic())
+            if wait <= 0:
+                raise queue.Empty
+            try:
+                return source.get(timeout=wait)
+            except queue.Empty:
+                continue
+        return _END
+
+    def _emit(self, stage, outbox, item):
+        if self._put(outbox, item):
+            with self.lock:
+                stage.emitted += 1
+
+    def _next_batch(self, stage, inbox, first):
+        """Collect up to batch_size items, waiting at most `linger` for stragglers"""
+        batch = [first]
+        deadline = time.monotonic() + stage.linger
+        while len(batch) < stage.batch_size:
+            try:
+                item = self._get(inbox, timeout=max(deadline - time.monotonic(), 0.001))
+            except queue.Empty:
+                break
+            if item is _END:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _work(self, index):
+        stage = self.stages[index]
+        inbox, outbox = self.queues[index], self.queues[index + 1]
+        emit = lambda item: self._emit(stage, outbox, item)
+        finished = False
+        while not finished:
+            item = self._get(inbox)
+            if item is _END:
+                break
+            if stage.batch_size:
+                payload, finished = self._next_batch(stage, inbox, item)
+                size = len(payload)
+            else:
+                payload, size = item, 1
+            try:
+                stage.fn(payload, emit)
+                with self.lock:
+                    stage.processed += size
+            except Exception as e:
+                with self.lock:
+                    stage.failed += size
+                if self.on_error:
+                    self.on_error(stage.name, payload, e)
+
+        # The last worker out tells every worker of the next stage to stop
+        with self.lock:
+            stage.active -= 1
+            last_out = stage.active == 0
+        if last_out:
+            downstream_workers = self.stages[index + 1].workers if index + 1 < len(self.stages) else 1
+            for _ in range(downstream_workers):
+                self._put(outbox, _END)
+
+    def _feed(self, items):
+        for item in items:
+            if not self._put(self.queues[0], item):
+                return
+        for _ in range(self.stages[0].workers):
+            self._put(self.queues[0], _END)
+
+    def run(self, items):
+        """Feed `items` into the first stage and yield what the last stage emits"""
+        if not self.stages:
+            return
+        self.queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        threads = [threading.Thread(target=self._feed, args=(items,), daemon=True, name="pipeline-feed")]
+        for index, stage in enumerate(self.stages):
+            stage.active = stage.workers
+            threads.extend(
+                threading.Thread(target=self._work, args=(index,), daemon=True, name=f"pipeline-{stage.name}-{n}")
+                for n in range(stage.workers)
+            )
+        for thread in threads:
+            thread.start()
+
+        output = self.queues[-1]
+        last_progress = 0.0
+        try:
+            while not self.cancelled.is_set():
+                if self.on_progress and time.monotonic() - last_progress >= self.progress_interval:
+                    last_progress = time.monotonic()
+                    self.on_progress(self.stats())
+                try:
+                    item = output.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if item is _END:
+                    break
+                yield item
+            if self.on_progress:
+                self.on_progress(self.stats())
+        finally:
+            # Stop the workers if the consumer gave up early
+            self.cancel()
+            for thread in threads:
+                thread.join(timeout=1.0)
@@ -0,0 +1,48 @@
+from entity_resolution import CompanyResolver, normalize_company_name, resolve_companies
+
+
+def test_india_dropped_only_from_subsidiary_names():
+    assert normalize_company_name("Coal India Ltd") == ('coal', 'india')
+    assert normalize_company_name("Coal India") == ('coal', 'india')
+    assert normalize_company_name("Bata India Limited") == ('bata', 'india')
+    assert normalize_company_name("Tega Industries India Pvt Ltd") == ('tega', 'industries')
+    assert normalize_company_name("Tega Industries (India) Pvt. Ltd.") == ('tega', 'industries')
+
+
+def test_coal_india_with_and_without_suffix():
+    resolver = CompanyResolver()
+    coal_india = resolver.resolve("Coal India")
+    assert resolver.resolve("Coal India Ltd") == coal_india
+    assert resolver.resolve("COAL INDIA LIMITED") == coal_india
+    assert resolver.resolve("Coal") != coal_india
+
+
+def test_fuzzy_matches():
+    resolver = CompanyResolver()
+    tega = resolver.resolve("Tega Industries Ltd")
+    assert resolver.find("Industries Tega") == tega
+    assert resolver.find("Tega Industris Pvt Ltd") == tega
+    assert resolver.find("Tega") is None
+    info_edge = resolver.resolve("Info Edge")
+    assert resolver.find("Infoedge Limited") == info_edge
+    abc = resolver.resolve("ABC Textiles")
+    assert resolver.resolve("ABD Textiles") != abc
+    unit = resolver.resolve("Precision Castings Unit 2")
+    assert resolver.resolve("Precision Castings Unit 3") != unit
+
+
+def test_common_words_do_not_merge_names():
+    resolver = CompanyResolver()
+    entities = {resolver.resolve(f"{name} Technologies Pvt Ltd") for name in ("Sharma", "Verma", "Kumar", "Arora")}
+    assert len(entities) == 4
+    assert resolver.find("Sharma Technologeis") in entities
+
+
+def test_resolve_companies_merges_evidence():
+    merged = resolve_companies([
+        {'Company Name': "Coal India Ltd", 'Source Link': "a", 'Industry': "Not specified"},
+        {'Company Name': "Coal India", 'Source Link': "b", 'Industry': "Mining"},
+    ])
+    assert len(merged) == 1
+    assert merged[0]['Source Links'] == ["a", "b"]
+    assert merged[0]['Industry'] == "Mining"
@@ -0,0 +1,285 @@
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+
+from storage import SQLiteStore
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+DEFAULT_LEASE_SECONDS = 120
+DEFAULT_MAX_ATTEMPTS = 3
+# Failed tasks wait RETRY_BACKOFF * 2**(attempt - 1) seconds before being retried
+RETRY_BACKOFF = 5.0
+
+
+class WorkTask:
+    """A claimed task; `attempts` includes the current one"""
+
+    def __init__(self, task_id, run_id, kind, payload, attempts, max_attempts):
+        self.task_id = task_id
+        self.run_id = run_id
+        self.kind = kind
+        self.payload = payload
+        self.attempts = attempts
+        self.max_attempts = max_attempts
+
+
+class WorkQueue:
+    """Interface of a shared task queue with leases; backends implement every method
+
+    A claimed task is leased to one worker until `lease_expires`. The worker
+    extends the lease while it works (heartbeat) and then completes or fails
+    the task. Tasks whose lease runs out are handed to the next claimant, so
+    a crashed worker only delays its tasks. Each claim counts as an attempt;
+    after `max_attempts` a task is marked failed for good.
+    """
+
+    def enqueue(self, run_id, kind, items, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        """Add (task_key, payload) items; keys already queued for this run and kind are ignored.
+        Returns the number of new tasks."""
+        raise NotImplementedError
+
+    def claim(self, worker_id, kind, limit=1, lease_seconds=DEFAULT_LEASE_SECONDS, run_id=None):
+        """Lease up to `limit` ready tasks of `kind` to `worker_id`; returns WorkTasks"""
+        raise NotImplementedError
+
+    def heartbeat(self, worker_id, task_ids, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """Extend the leases `worker_id` still holds; returns the IDs it no longer holds"""
+        raise NotImplementedError
+
+    def complete(self, worker_id, task_id, result=None):
+        """Record a result; returns False if the lease was lost to another worker"""
+        raise NotImplementedError
+
+    def fail(self, worker_id, task_id, error):
+        """Give a task back for a later retry, or fail it after its last attempt"""
+        raise NotImplementedError
+
+    def progress(self, run_id):
+        """{kind: {status: count}} for one run"""
+        raise NotImplementedError
+
+    def results(self, run_id, kind):
+        """Results of the completed tasks of one kind"""
+        raise NotImplementedError
+
+    def unfinished(self, run_id=None):
+        """Number of tasks still queued or running"""
+        raise NotImplementedError
+
+
+class SQLiteWorkQueue(SQLiteStore, WorkQueue):
+    """WorkQueue in one SQLite file, shared by processes on this machine or a shared disk
+
+    Claims run in BEGIN IMMEDIATE transactions, so SQLite's file lock makes
+    every lease exclusive across processes.
+    """
+
+    FILENAME = "work_queue.db"
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS tasks (
+        id INTEGER PRIMARY KEY,
+        run_id TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        task_key TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        status TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        max_attempts INTEGER NOT NULL,
+        available_at REAL NOT NULL,
+        worker_id TEXT,
+        lease_expires REAL,
+        result TEXT,
+        error TEXT,
+        created_at REAL NOT NULL,
+        updated_at REAL NOT NULL,
+        UNIQUE (run_id, kind, task_key)
+    );
+    CREATE INDEX IF NOT EXISTS idx_tasks_ready ON tasks (kind, status, available_at);
+    CREATE INDEX IF NOT EXISTS idx_tasks_run ON tasks (run_id, kind, status);
+    """
+
+    def enqueue(self, run_id, kind, items, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        now = time.time()
+        with self.lock:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO tasks (run_id, kind, task_key, payload, status, max_attempts, available_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, kind, key, json.dumps(payload), QUEUED, max_attempts, now, now, now) for key, payload in items]
+            )
+            self.conn.commit()
+            return self.conn.total_changes - before
+
+    def claim(self, worker_id, kind, limit=1, lease_seconds=DEFAULT_LEASE_SECONDS, run_id=None):
+        now = time.time()
+        run_clause = " AND run_id = ?" if run_id else ""
+        run_params = (run_id,) if run_id else ()
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Expired leases on their last attempt fail instead of running again
+                self.conn.execute(
+                    "UPDATE tasks SET status = ?, error = 'lease expired', worker_id = NULL, updated_at = ? "
+                    f"WHERE kind = ? AND status = ? AND lease_expires < ? AND attempts >= max_attempts{run_clause}",
+                    (FAILED, now, kind, RUNNING, now) + run_params
+                )
+                rows = self.conn.execute(
+                    "SELECT id, run_id, payload, attempts, max_attempts FROM tasks "
+                    f"WHERE kind = ? AND ((status = ? AND available_at <= ?) OR (status = ? AND lease_expires < ?)){run_clause} "
+                    "ORDER BY id LIMIT ?",
+                    (kind, QUEUED, now, RUNNING, now) + run_params + (limit,)
+                ).fetchall()
+                self.conn.executemany(
+                    "UPDATE tasks SET status = ?, worker_id = ?, lease_expires = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                    [(RUNNING, worker_id, now + lease_seconds, now, task_id) for task_id, *_ in rows]
+                )
+                self.conn.commit()
+            except BaseException:
+                self.conn.rollback()
+                raise
+        return [
+            WorkTask(task_id, task_run_id, kind, json.loads(payload), attempts + 1, max_attempts)
+            for task_id, task_run_id, payload, attempts, max_attempts in rows
+        ]
+
+    def heartbeat(self, worker_id, task_ids, lease_seconds=DEFAULT_LEASE_SECONDS):
+        if not task_ids:
+            return []
+        now = time.time()
+        placeholders = ",".join("?" * len(task_ids))
+        with self.lock:
+            self.conn.execute(
+                f"UPDATE tasks SET lease_expires = ?, updated_at = ? WHERE id IN ({placeholders}) AND worker_id = ? AND status = ?",
+                (now + lease_seconds, now, *task_ids, worker_id, RUNNING)
+            )
+            self.conn.commit()
+            held = {task_id for (task_id,) in self.conn.execute(
+                f"SELECT id FROM tasks WHERE id IN ({placeholders}) AND worker_id = ? AND status = ?",
+                (*task_ids, worker_id, RUNNING)
+            )}
+        return [task_id for task_id in task_ids if task_id not in held]
+
+    def complete(self, worker_id, task_id, result=None):
+        cursor = self.execute(
+            "UPDATE tasks SET status = ?, result = ?, error = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE id = ? AND worker_id = ? AND status = ?",
+            (COMPLETED, json.dumps(result, default=str), time.time(), task_id, worker_id, RUNNING)
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, worker_id, task_id, error):
+        now = time.time()
+        cursor = self.execute(
+            "UPDATE tasks SET status = CASE WHEN attempts >= max_attempts THEN ? ELSE ? END, "
+            "available_at = ? + ? * (1 << (attempts - 1)), worker_id = NULL, lease_expires = NULL, error = ?, updated_at = ? "
+            "WHERE id = ? AND worker_id = ? AND status = ?",
+            (FAILED, QUEUED, now, RETRY_BACKOFF, str(error), now, task_id, worker_id, RUNNING)
+        )
+        return cursor.rowcount == 1
+
+    def progress(self, run_id):
+        progress = {}
+        for kind, status, count in self.query(
+            "SELECT kind, status, COUNT(*) FROM tasks WHERE run_id = ? GROUP BY kind, status", (run_id,)
+        ):
+            progress.setdefault(kind, {})[status] = count
+        return progress
+
+    def results(self, run_id, kind):
+        for (result,) in self.query(
+            "SELECT result FROM tasks WHERE run_id = ? AND kind = ? AND status = ? ORDER BY id", (run_id, kind, COMPLETED)
+        ):
+            yield json.loads(result)
+
+    def unfinished(self, run_id=None):
+        sql = "SELECT COUNT(*) FROM tasks WHERE status IN (?, ?)"
+        params = (QUEUED, RUNNING)
+        if run_id:
+            sql += " AND run_id = ?"
+            params += (run_id,)
+        return self.query(sql, params)[0][0]
+
+    def clear(self, run_id=None):
+        if run_id:
+            self.execute("DELETE FROM tasks WHERE run_id = ?", (run_id,))
+        else:
+            self.execute("DELETE FROM tasks")
+
+
+class QueueWorker:
+    """Claims tasks from a WorkQueue and runs them with one handler per kind
+
+    `handlers` maps a kind to (handler, batch size). A handler receives a
+    list of WorkTasks and returns one outcome per task: its result, or an
+    Exception to fail (and later retry) just that task. If the handler
+    raises, every task in the batch fails. Kinds are tried in the order
+    given, so list downstream work first to keep the pipeline draining.
+    """
+
+    def __init__(self, queue, handlers, worker_id=None, lease_seconds=DEFAULT_LEASE_SECONDS, logger=None):
+        self.queue = queue
+        self.handlers = handlers
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.lease_seconds = lease_seconds
+        self.logger = logger or logging.getLogger("scout.queue")
+        self.processed = {kind: 0 for kind in handlers}
+        self.failed = {kind: 0 for kind in handlers}
+
+    def _keep_leases(self, task_ids, stop):
+        # Heartbeat at a third of the lease so one missed beat does not lose it
+        while not stop.wait(self.lease_seconds / 3):
+            lost = self.queue.heartbeat(self.worker_id, task_ids, self.lease_seconds)
+            if lost:
+                self.logger.warning("Lost the lease on tasks %s; another worker will redo them", lost)
+
+    def run_once(self, run_id=None):
+        """Claim and run one batch of the first kind with ready tasks; returns the number of tasks run"""
+        for kind, (handler, batch_size) in self.handlers.items():
+            tasks = self.queue.claim(self.worker_id, kind, batch_size, self.lease_seconds, run_id=run_id)
+            if not tasks:
+                continue
+            stop = threading.Event()
+            heartbeat = threading.Thread(
+                target=self._keep_leases, args=([task.task_id for task in tasks], stop), daemon=True
+            )
+            heartbeat.start()
+            try:
+                outcomes = handler(tasks)
+            except Exception as e:
+                outcomes = [e] * len(tasks)
+            finally:
+                stop.set()
+                heartbeat.join()
+            for task, outcome in zip(tasks, outcomes):
+                if isinstance(outcome, Exception):
+                    self.failed[kind] += 1
+                    self.queue.fail(self.worker_id, task.task_id, f"{type(outcome).__name__}: {outcome}")
+                    self.logger.warning("%s task %s failed (attempt %d of %d): %s",
+                                        kind, task.task_id, task.attempts, task.max_attempts, outcome)
+                else:
+                    self.processed[kind] += 1
+                    self.queue.complete(self.worker_id, task.task_id, outcome)
+            return len(tasks)
+        return 0
+
+    def run(self, run_id=None, poll_interval=1.0, stop_when_drained=True, should_stop=None):
+        """Work until nothing is left unfinished (or `should_stop()` returns True)
+
+        While other workers hold the last tasks, this one keeps polling:
+        their tasks may fan out into new work, or come back if they crash.
+        """
+        while not (should_stop and should_stop()):
+            if self.run_once(run_id):
+                continue
+            if stop_when_drained and not self.queue.unfinished(run_id):
+                break
+            time.sleep(poll_interval)
+        return {'processed': dict(self.processed), 'failed': dict(self.failed)}